@@ -0,0 +1,51 @@
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import catalogue_io
+import video_library as lib
+
+# Benchmark for catalogue_io: writes a generated catalogue, imports it and exports it again.
+# Usage: python bench_catalogue_io.py [rows]   (default 1,000,000 rows)
+
+
+def write_sample(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.write("key,name,director,rating,play_count\n")
+        for i in range(rows):
+            f.write(f"v{i:07d},Video {i},Director {i % 997},{i % 6},{i % 50}\n")
+
+
+def timed(label, func, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<14} {elapsed:8.2f}s   peak memory {peak / 1_000_000:8.1f} MB")
+    return result, elapsed
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "catalogue.csv")
+        jsonl_path = os.path.join(tmp, "catalogue.jsonl")
+        write_sample(csv_path, rows)
+        print(f">>> Benchmarking {rows} rows")
+
+        (imported, errors), elapsed = timed("import csv", catalogue_io.import_catalogue, csv_path)
+        print(f"{'':<14} {imported / elapsed:8.0f} rows/s, {len(errors)} rejected")
+        timed("export jsonl", catalogue_io.export_catalogue, jsonl_path)
+
+        lib.clear()
+        (imported, errors), elapsed = timed("import jsonl", catalogue_io.import_catalogue, jsonl_path)
+        print(f"{'':<14} {imported / elapsed:8.0f} rows/s, {len(errors)} rejected")
+        timed("export csv", catalogue_io.export_catalogue, csv_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import csv
+import json
+import os
+import sys
+
+import video_library as lib
+
+FIELDS = ["key", "name", "director", "rating", "play_count"]
+MIN_RATING = 0
+MAX_RATING = 5
+
+
+def file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".json", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Unsupported catalogue format: {path}")
+
+
+def read_rows(path):
+    # Yield (line_number, row dict) one at a time so large files are never fully loaded
+    fmt = file_format(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_num, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield line_num, json.loads(line)
+                except ValueError:
+                    yield line_num, None
+
+
+def whole_number(value, field):
+    # int() would silently truncate 3.9 to 3, so fractional values are rejected
+    if isinstance(value, int):
+        return value
+    try:
+        return int(str(value).strip())  # exact, even for counts too large for a float
+    except ValueError:
+        pass
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a number, got {value!r}")
+    if not number.is_integer():
+        raise ValueError(f"{field} must be a whole number, got {value!r}")
+    return int(number)
+
+
+def validate_row(row):
+    # Return (key, name, director, rating, play_count) or raise ValueError with the reason
+    if not isinstance(row, dict):
+        raise ValueError("not a valid record")
+    key = str(row.get("key") or "").strip()
+    name = str(row.get("name") or "").strip()
+    director = str(row.get("director") or "").strip()
+    if not key:
+        raise ValueError("missing key")
+    if not name:
+        raise ValueError("missing name")
+    rating = whole_number(row.get("rating", 0) or 0, "rating")
+    if rating < MIN_RATING or rating > MAX_RATING:
+        raise ValueError(f"rating must be between {MIN_RATING} and {MAX_RATING}, got {rating}")
+    play_count = row.get("play_count")
+    if play_count in (None, ""):
+        play_count = None
+    else:
+        play_count = whole_number(play_count, "play_count")
+        if play_count < 0:
+            raise ValueError("play_count cannot be negative")
+    return key, name, director, rating, play_count
+
+
+def import_catalogue(path, chunk_size=5000, progress=None):
+    # Parse the file in chunks and upsert each valid chunk into the library.
+    # progress(rows_imported, errors) is called after every chunk.
+    # Returns (rows_imported, errors) where errors is a list of (line_number, reason).
+    imported = 0
+    errors = []
+    chunk = []
+    for line_num, row in read_rows(path):
+        try:
+            chunk.append(validate_row(row))
+        except ValueError as e:
+            errors.append((line_num, str(e)))
+        if len(chunk) >= chunk_size:
+            imported += lib.upsert_many(chunk)
+            chunk = []
+            if progress is not None:
+                progress(imported, errors)
+    if chunk:
+        imported += lib.upsert_many(chunk)
+    if progress is not None:
+        progress(imported, errors)
+    return imported, errors
+
+
+def export_catalogue(path):
+    # Write the library one record at a time, returns the number of rows written
+    fmt = file_format(path)
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for record in lib.iter_items():
+                writer.writerow(record)
+                count += 1
+        else:
+            for record in lib.iter_items():
+                f.write(json.dumps(dict(zip(FIELDS, record))) + "\n")
+                count += 1
+    return count
+
+
+def print_progress(imported, errors):
+    print(f"\r>>> Imported {imported} rows ({len(errors)} rejected)", end="", flush=True)
+
+
+if __name__ == "__main__":  # validate a catalogue file and optionally convert it to another format
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python catalogue_io.py <input.csv|input.jsonl> [output.csv|output.jsonl]")
+        sys.exit(1)
+    imported, errors = import_catalogue(sys.argv[1], progress=print_progress)
+    print()
+    for line_num, reason in errors[:20]:
+        print(f"Line {line_num}: {reason}")
+    if len(sys.argv) == 3:
+        print(f">>> Exported {export_catalogue(sys.argv[2])} rows to '{sys.argv[2]}'")
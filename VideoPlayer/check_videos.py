@@ -3,6 +3,7 @@ import tkinter.scrolledtext as tkst
 
 import font_manager as fonts
 import video_library as lib
+from library_watcher import LibraryWatcher
 
 
 def set_text(text_area, content):
@@ -36,10 +37,17 @@ class CheckVideos():
         self.status_lbl = tk.Label(window, text="", font=("Helvetica", 10))
         self.status_lbl.grid(row=2, column=0, columnspan=4, sticky="W", padx=10, pady=10)
 
+        self.rows = {}  # video key -> line number in list_txt
+        self.shown_key = None  # video currently shown in video_txt
         self.list_videos_clicked()
+        LibraryWatcher(window, self.videos_changed)
 
     def check_video_clicked(self):
         key = self.input_txt.get()
+        self.show_video(key)
+        self.status_lbl.configure(text="Check Video button was clicked!")
+
+    def show_video(self, key):
         name = lib.get_name(key)
         if name is not None:
             director = lib.get_director(key)
@@ -47,15 +55,34 @@ class CheckVideos():
             play_count = lib.get_play_count(key)
             video_details = f"{name}\n{director}\nrating: {rating}\nplays: {play_count}"
             set_text(self.video_txt, video_details)
+            self.shown_key = key
         else:
             set_text(self.video_txt, f"Video {key} not found")
-        self.status_lbl.configure(text="Check Video button was clicked!")
+            self.shown_key = None
 
     def list_videos_clicked(self):
         video_list = lib.list_all()
         set_text(self.list_txt, video_list)
+        self.rows = {line.split(" ", 1)[0]: n for n, line in enumerate(video_list.splitlines(), start=1)}
         self.status_lbl.configure(text="List Videos button was clicked!")
 
+    def videos_changed(self, keys):
+        # patch only the rows of the videos that changed instead of rebuilding the list
+        for key in keys:
+            info = lib.get_info(key)
+            if info is None:
+                continue
+            row = self.rows.get(key)
+            if row is None:
+                row = len(self.rows) + 1
+                self.rows[key] = row
+                self.list_txt.insert(f"{row}.0", info + "\n")
+            else:
+                self.list_txt.delete(f"{row}.0", f"{row}.end")
+                self.list_txt.insert(f"{row}.0", info)
+        if self.shown_key in keys:
+            self.show_video(self.shown_key)
+
 
 if __name__ == "__main__":  # only runs when this file is run as a standalone
     window = tk.Tk()  # create a TK object
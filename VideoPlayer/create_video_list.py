@@ -0,0 +1,111 @@
+import tkinter as tk
+import tkinter.scrolledtext as tkst
+
+import font_manager as fonts
+import video_library as lib
+from playlist import Playlist, PlaylistPlayer
+
+POLL_MS = 50
+
+
+class CreateVideoList():
+    def __init__(self, window):
+        window.geometry("750x350")
+        window.title("Create Video List")
+        self.window = window
+        self.playlist = Playlist()
+        self.player = None
+
+        enter_lbl = tk.Label(window, text="Enter Video Number")
+        enter_lbl.grid(row=0, column=0, padx=10, pady=10)
+
+        self.input_txt = tk.Entry(window, width=5)
+        self.input_txt.grid(row=0, column=1, padx=10, pady=10)
+
+        add_video_btn = tk.Button(window, text="Add Video", command=self.add_video_clicked)
+        add_video_btn.grid(row=0, column=2, padx=10, pady=10)
+
+        self.play_btn = tk.Button(window, text="Play Playlist", command=self.play_playlist_clicked)
+        self.play_btn.grid(row=0, column=3, padx=10, pady=10)
+
+        reset_btn = tk.Button(window, text="Reset Playlist", command=self.reset_playlist_clicked)
+        reset_btn.grid(row=0, column=4, padx=10, pady=10)
+
+        self.list_txt = tkst.ScrolledText(window, width=60, height=12, wrap="none")
+        self.list_txt.grid(row=1, column=0, columnspan=5, sticky="W", padx=10, pady=10)
+
+        self.status_lbl = tk.Label(window, text="", font=("Helvetica", 10))
+        self.status_lbl.grid(row=2, column=0, columnspan=5, sticky="W", padx=10, pady=10)
+
+        # playback must not outlive its window
+        window.bind("<Destroy>", self.window_destroyed, add="+")
+
+    def add_video_clicked(self):
+        key = self.input_txt.get().strip()
+        name = lib.get_name(key)
+        if name is None:
+            self.status_lbl.configure(text=f"Video {key} not found")
+            return
+        if not self.playlist.add(key):
+            self.status_lbl.configure(text=f"{name} is already in the playlist")
+            return
+        # append one line instead of redrawing the whole playlist
+        self.list_txt.insert(tk.END, f"{key} {name}\n")
+        self.input_txt.delete(0, tk.END)
+        self.status_lbl.configure(text=f"{name} added to the playlist")
+
+    def play_playlist_clicked(self):
+        if len(self.playlist) == 0:
+            self.status_lbl.configure(text="The playlist is empty")
+            return
+        if self.player is not None and self.player.is_running():
+            return
+        self.player = PlaylistPlayer(self.playlist.keys())
+        self.player.start()
+        self.play_btn.configure(state="disabled")
+        self.status_lbl.configure(text="Playing playlist...")
+        self.window.after(POLL_MS, self.poll_player, self.player)
+
+    def poll_player(self, player):
+        if player is not self.player:  # playback was reset or restarted
+            return
+        event = player.poll()
+        if event is not None:
+            state, played, total = event
+            if state == "progress":
+                self.status_lbl.configure(text=f"Playing {played}/{total}...")
+            elif state == "done":
+                self.finish_playback(f"Playlist played - play counts updated for {played} videos")
+                return
+            else:
+                self.finish_playback(f"Playback stopped after {played}/{total} videos")
+                return
+        self.window.after(POLL_MS, self.poll_player, player)
+
+    def finish_playback(self, message):
+        self.player = None
+        self.play_btn.configure(state="normal")
+        self.status_lbl.configure(text=message)
+
+    def window_destroyed(self, event):
+        if event.widget is not self.window:  # child widgets report <Destroy> too
+            return
+        if self.player is not None:
+            self.player.stop()
+            self.player = None  # also ends the poll_player loop
+
+    def reset_playlist_clicked(self):
+        if self.player is not None:
+            self.player.stop()
+            self.player = None
+            self.play_btn.configure(state="normal")
+        self.playlist.clear()
+        self.list_txt.delete("1.0", tk.END)
+        self.status_lbl.configure(text="Playlist has been reset")
+
+
+if __name__ == "__main__":  # only runs when this file is run as a standalone
+    window = tk.Tk()  # create a TK object
+    fonts.configure()  # configure the fonts
+    CreateVideoList(window)  # open the CreateVideoList GUI
+    window.mainloop()  # run the window main loop, reacting to button presses, etc
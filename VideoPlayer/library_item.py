@@ -1,9 +1,13 @@
+import threading
+
+
 class LibraryItem:
     def __init__(self, name, director, rating=0):
         self.name = name
         self.director = director
         self.rating = rating
         self.play_count = 0
+        self.lock = threading.Lock()  # guards rating and play_count updates
 
     def info(self):
         return f"{self.name} - {self.director} {self.stars()} - {self.play_count}"
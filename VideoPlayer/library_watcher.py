@@ -0,0 +1,38 @@
+import threading
+
+import video_library as lib
+
+FRAME_MS = 16
+
+
+# Subscribes a Tk window to library changes. Keys reported by video_library.publish
+# (from any thread) are collected in a set, and once per frame the main loop hands the
+# keys changed since the last frame to on_changes, so a video changed many times
+# between frames is only redrawn once. Unsubscribes when the window is destroyed.
+class LibraryWatcher:
+    def __init__(self, window, on_changes):
+        self.window = window
+        self.on_changes = on_changes
+        self.changed = set()
+        self.lock = threading.Lock()
+        self.unsubscribe = lib.subscribe(self.item_changed)
+        self.poll_id = window.after(FRAME_MS, self.poll)
+        window.bind("<Destroy>", self.window_destroyed, add="+")
+
+    def item_changed(self, key):
+        with self.lock:
+            self.changed.add(key)
+
+    def poll(self):
+        with self.lock:
+            changed = self.changed
+            self.changed = set()
+        if changed:
+            self.on_changes(changed)
+        self.poll_id = self.window.after(FRAME_MS, self.poll)
+
+    def window_destroyed(self, event):
+        if event.widget is not self.window:  # child widgets report <Destroy> too
+            return
+        self.unsubscribe()
+        self.window.after_cancel(self.poll_id)
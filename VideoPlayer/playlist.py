@@ -0,0 +1,74 @@
+import queue
+import threading
+
+import video_library as lib
+
+
+# Ordered playlist of video keys. Backed by a dict (which keeps insertion order)
+# so adding a video and checking whether it is already there are both O(1).
+class Playlist:
+    def __init__(self):
+        self.items = {}
+
+    def add(self, key):
+        if key in self.items:
+            return False
+        self.items[key] = None
+        return True
+
+    def clear(self):
+        self.items.clear()
+
+    def keys(self):
+        return list(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+
+# Plays a list of video keys on a background thread so the Tk main loop never blocks.
+# The worker only touches the library; progress is handed to the UI through a queue
+# that the window drains with after(), because Tk widgets must only be used from the main thread.
+class PlaylistPlayer:
+    def __init__(self, keys, delay=0.0):
+        self.keys = keys
+        self.delay = delay  # simulated seconds per video
+        self.events = queue.Queue()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def is_running(self):
+        return self.thread.is_alive()
+
+    def run(self):
+        total = len(self.keys)
+        played = 0
+        for key in self.keys:
+            if self.delay:
+                self.stop_event.wait(self.delay)
+            if self.stop_event.is_set():
+                self.events.put(("stopped", played, total))
+                return
+            lib.increment_play_count(key)
+            played += 1
+            self.events.put(("progress", played, total))
+        self.events.put(("done", played, total))
+
+    def poll(self):
+        # Return the newest event, or None. Intermediate progress events are dropped
+        # so the UI updates once per poll however fast the worker is.
+        latest = None
+        while True:
+            try:
+                latest = self.events.get_nowait()
+            except queue.Empty:
+                return latest
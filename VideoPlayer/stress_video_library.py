@@ -0,0 +1,88 @@
+import random
+import sys
+import threading
+import time
+
+import video_library as lib
+
+# Stress check for the thread-safe library operations: many threads increment play
+# counts and race on compare_and_set_rating while others take snapshots.
+# Usage: python stress_video_library.py [threads] [increments_per_thread]
+
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    keys = list(lib.library)
+    lib.flush()
+    persisted = {key: 0 for key in keys}
+
+    def save_changes(batch):
+        for key, changes in batch.items():
+            persisted[key] += changes.get("plays", 0)
+
+    lib.save_changes = save_changes  # count what the write-behind buffer hands to the backend
+    start_counts = {key: lib.get_play_count(key) for key in keys}
+    expected = {key: 0 for key in keys}
+    cas_wins = [0] * threads
+    plans = []
+    for _ in range(threads):
+        plan = [random.choice(keys) for _ in range(per_thread)]
+        for key in plan:
+            expected[key] += 1
+        plans.append(plan)
+    start_barrier = threading.Barrier(threads + 1)
+    stop = threading.Event()
+
+    def play(index):
+        start_barrier.wait()
+        for n, key in enumerate(plans[index]):
+            lib.increment_play_count(key)
+            if n % 100 == 0:
+                # bump the rating of "01" by one, retrying until our update wins
+                while True:
+                    current = lib.get_rating("01")
+                    if lib.compare_and_set_rating("01", current, current + 1):
+                        cas_wins[index] += 1
+                        break
+
+    def read():
+        while not stop.is_set():
+            lib.snapshot()
+
+    workers = [threading.Thread(target=play, args=(i,)) for i in range(threads)]
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    rating_before = lib.get_rating("01")
+    for t in workers + readers:
+        t.start()
+    started = time.perf_counter()
+    start_barrier.wait()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+    stop.set()
+    for t in readers:
+        t.join()
+
+    ok = True
+    for key in keys:
+        actual = lib.get_play_count(key) - start_counts[key]
+        if actual != expected[key]:
+            print(f"FAIL {key}: expected {expected[key]} plays, got {actual}")
+            ok = False
+    lib.flush()
+    if persisted != expected:
+        print("FAIL write-behind: buffered play counts do not match the increments")
+        ok = False
+    rating_gain = lib.get_rating("01") - rating_before
+    if rating_gain != sum(cas_wins):
+        print(f"FAIL rating: {sum(cas_wins)} successful updates, rating moved by {rating_gain}")
+        ok = False
+    total = threads * per_thread
+    print(f">>> {total} increments from {threads} threads in {elapsed:.2f}s ({total / elapsed:.0f}/s)")
+    print(">>> All counts exact" if ok else ">>> Lost updates detected")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import tkinter as tk
 
 import font_manager as fonts
 import video_library as lib
+from library_watcher import LibraryWatcher
 
 
 class UpdateVideos():
@@ -39,12 +40,17 @@ class UpdateVideos():
         self.status_lbl = tk.Label(window, text="", font=("Helvetica", 10))
         self.status_lbl.grid(row=5, column=0, columnspan=3, padx=10, pady=10)
 
+        # Keep the confirmation up to date when the video changes in another window
+        self.shown_key = None
+        LibraryWatcher(window, self.videos_changed)
+
     def update_rating_clicked(self):
         video_key = self.video_input_txt.get().strip()
         rating_text = self.rating_input_txt.get().strip()
 
         # Clear previous result
         self.result_txt.delete("1.0", tk.END)
+        self.shown_key = None
 
         # Validate inputs
         if not video_key:
@@ -75,22 +81,33 @@ class UpdateVideos():
         # Update the rating
         lib.set_rating(video_key, new_rating)
         
-        # Get updated information for confirmation
-        play_count = lib.get_play_count(video_key)
-        
         # Display confirmation message
-        confirmation_message = f"Successfully updated!\n\n"
-        confirmation_message += f"Video: {video_name}\n"
-        confirmation_message += f"New Rating: {new_rating}\n"
-        confirmation_message += f"Play Count: {play_count}"
-        
-        self.result_txt.insert("1.0", confirmation_message)
+        self.shown_key = video_key
+        self.show_confirmation()
         self.status_lbl.configure(text="Rating updated successfully!")
 
         # Clear input fields
         self.video_input_txt.delete(0, tk.END)
         self.rating_input_txt.delete(0, tk.END)
 
+    def show_confirmation(self):
+        # Get current information for the last updated video
+        video_name = lib.get_name(self.shown_key)
+        rating = lib.get_rating(self.shown_key)
+        play_count = lib.get_play_count(self.shown_key)
+
+        confirmation_message = f"Successfully updated!\n\n"
+        confirmation_message += f"Video: {video_name}\n"
+        confirmation_message += f"New Rating: {rating}\n"
+        confirmation_message += f"Play Count: {play_count}"
+
+        self.result_txt.delete("1.0", tk.END)
+        self.result_txt.insert("1.0", confirmation_message)
+
+    def videos_changed(self, keys):
+        if self.shown_key in keys:
+            self.show_confirmation()
+
 
 if __name__ == "__main__":  # only runs when this file is run as a standalone
     window = tk.Tk()  # create a TK object
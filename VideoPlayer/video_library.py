@@ -1,5 +1,12 @@
+import threading
+
 from library_item import LibraryItem
+from write_behind import WriteBehindBuffer
 
+# Locking: library_lock guards the dict itself (adding or removing videos, copying its keys),
+# each LibraryItem.lock guards that video's fields. Play count and rating updates
+# only take the item lock, so updates to different videos never wait on each other.
+library_lock = threading.Lock()
 library = {}
 library["01"] = LibraryItem("Tom and Jerry", "Fred Quimby", 4)
 library["02"] = LibraryItem("Breakfast at Tiffany's", "Blake Edwards", 5)
@@ -8,12 +15,108 @@ library["04"] = LibraryItem("The Sound of Music", "Robert Wise", 1)
 library["05"] = LibraryItem("Gone with the Wind", "Victor Fleming", 3)
 
 
+# Hook for a persistent backend: receives one batch of coalesced changes
+# ({key: {"plays": n, "rating": r}}, imported videos also carry "name", "director"
+# and an absolute "play_count") per transaction. The in-memory library
+# above is always up to date, so there is nothing to do until a store exists.
+# It can run while an item lock is held, so it must not call back into this module.
+def save_changes(batch):
+    pass
+
+
+writes = WriteBehindBuffer(lambda batch: save_changes(batch))
+
+# Change notifications: every callback is called with the key of each video that was
+# added or changed. Callbacks run on the thread that made the change, so GUI code
+# must hand the key over to the Tk main loop instead of touching widgets directly.
+subscribers = []
+subscribers_lock = threading.Lock()
+
+
+def subscribe(callback):
+    global subscribers
+    with subscribers_lock:
+        subscribers = subscribers + [callback]  # copy on write, publish never needs the lock
+
+    def unsubscribe():
+        global subscribers
+        with subscribers_lock:
+            subscribers = [s for s in subscribers if s is not callback]
+
+    return unsubscribe
+
+
+def publish(key):
+    for callback in subscribers:
+        callback(key)
+
+
 def list_all():
-    output = ""
-    for key in library:
-        item = library[key]
-        output += f"{key} {item.info()}\n"
-    return output
+    lines = []
+    for key, name, director, rating, play_count in snapshot():
+        item = LibraryItem(name, director, rating)
+        item.play_count = play_count
+        lines.append(f"{key} {item.info()}\n")
+    return "".join(lines)
+
+
+# Copy of every video as (key, name, director, rating, play_count) tuples, each read
+# under its video's lock, safe to use while other threads keep updating the library
+def snapshot():
+    return list(iter_items())
+
+
+# Insert or update many videos at once, records are (key, name, director, rating, play_count)
+# tuples and a play_count of None keeps the current count. Returns the number of records.
+# Like every other change, imports are queued for save_changes through the write-behind buffer.
+def upsert_many(records):
+    with library_lock:
+        for key, name, director, rating, play_count in records:
+            item = library.get(key)
+            if item is None:
+                item = library[key] = LibraryItem(name, director, rating)
+            with item.lock:
+                item.name = name
+                item.director = director
+                item.rating = rating
+                if play_count is not None:
+                    item.play_count = play_count
+                writes.set_record(key, name, director, rating, play_count)
+    if subscribers:
+        for record in records:
+            publish(record[0])
+    return len(records)
+
+
+# Remove every video, e.g. before a benchmark imports the same catalogue again.
+# Changes still in the write-behind buffer are kept and saved on the next flush.
+def clear():
+    with library_lock:
+        library.clear()
+
+
+# Yield (key, name, director, rating, play_count) for every video without copying the items.
+# Only the list of keys is copied, so videos can be added while this runs;
+# videos removed in the meantime are skipped.
+def iter_items():
+    with library_lock:
+        keys = list(library)
+    for key in keys:
+        item = library.get(key)
+        if item is None:
+            continue
+        with item.lock:
+            record = (key, item.name, item.director, item.rating, item.play_count)
+        yield record
+
+
+# One line of the list_all() output for a single video, or None if it does not exist
+def get_info(key):
+    item = library.get(key)
+    if item is None:
+        return None
+    with item.lock:
+        return f"{key} {item.info()}"
 
 
 def get_name(key):
@@ -41,11 +144,29 @@ def get_rating(key):
 
 
 def set_rating(key, rating):
-    try:
-        item = library[key]
-        item.rating = rating
-    except KeyError:
+    item = library.get(key)
+    if item is None:
         return
+    with item.lock:
+        item.rating = rating
+        # recorded under the item lock so the buffer sees ratings in the order they were applied
+        writes.set_rating(key, rating)
+    publish(key)
+
+
+# Set the rating only if it is still `expected`. Returns True if the rating was changed,
+# False if another update got there first or the video does not exist.
+def compare_and_set_rating(key, expected, rating):
+    item = library.get(key)
+    if item is None:
+        return False
+    with item.lock:
+        if item.rating != expected:
+            return False
+        item.rating = rating
+        writes.set_rating(key, rating)
+    publish(key)
+    return True
 
 
 def get_play_count(key):
@@ -56,9 +177,23 @@ def get_play_count(key):
         return -1
 
 
+# Atomically add one play, returns the new play count or -1 if the video does not exist
 def increment_play_count(key):
-    try:
-        item = library[key]
+    item = library.get(key)
+    if item is None:
+        return -1
+    with item.lock:
         item.play_count += 1
-    except KeyError:
-        return
+        play_count = item.play_count
+    writes.add_plays(key)
+    publish(key)
+    return play_count
+
+
+# Write all buffered changes to the backend now, returns the number of videos written
+def flush():
+    return writes.flush()
+
+
+def pending_writes():
+    return writes.pending_count()
@@ -2,6 +2,7 @@ import tkinter as tk
 
 import font_manager as fonts
 from check_videos import CheckVideos
+from create_video_list import CreateVideoList
 from update_videos import UpdateVideos
 
 
@@ -10,6 +11,11 @@ def check_videos_clicked():
     CheckVideos(tk.Toplevel(window))
 
 
+def create_video_list_clicked():
+    status_lbl.configure(text="Create Video List button was clicked!")
+    CreateVideoList(tk.Toplevel(window))
+
+
 def update_videos_clicked():
     status_lbl.configure(text="Update Videos button was clicked!")
     UpdateVideos(tk.Toplevel(window))
@@ -27,7 +33,7 @@ header_lbl.grid(row=0, column=0, columnspan=3, padx=10, pady=10)
 check_videos_btn = tk.Button(window, text="Check Videos", command=check_videos_clicked)
 check_videos_btn.grid(row=1, column=0, padx=10, pady=10)
 
-create_video_list_btn = tk.Button(window, text="Create Video List")
+create_video_list_btn = tk.Button(window, text="Create Video List", command=create_video_list_clicked)
 create_video_list_btn.grid(row=1, column=1, padx=10, pady=10)
 
 update_videos_btn = tk.Button(window, text="Update Videos", command=update_videos_clicked)
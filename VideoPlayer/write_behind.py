@@ -0,0 +1,97 @@
+import atexit
+import threading
+
+
+# Collects library changes in memory and writes them to the backend in batches.
+# Changes are coalesced per video key: play counts are summed, the latest rating wins.
+# An imported record replaces name, director and rating, and its play_count (an absolute
+# count, applied before any "plays" queued after it) replaces the plays queued before it.
+# A batch is flushed when the timer fires, when max_pending keys are dirty,
+# when flush() is called, or when the program exits.
+class WriteBehindBuffer:
+    def __init__(self, flush_batch, max_pending=500, flush_interval=1.0):
+        self.flush_batch = flush_batch  # called with {key: {"plays": n, "rating": r, ...}}
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self.pending = {}
+        self.flush_count = 0
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()  # keeps batches in order
+        self.timer = None
+        atexit.register(self.flush)
+
+    def add_plays(self, key, count=1):
+        with self.lock:
+            changes = self.pending.setdefault(key, {})
+            changes["plays"] = changes.get("plays", 0) + count
+            full = len(self.pending) >= self.max_pending
+            self.start_timer()
+        if full:
+            self.flush()
+
+    def set_rating(self, key, rating):
+        with self.lock:
+            changes = self.pending.setdefault(key, {})
+            changes["rating"] = rating
+            full = len(self.pending) >= self.max_pending
+            self.start_timer()
+        if full:
+            self.flush()
+
+    def set_record(self, key, name, director, rating, play_count=None):
+        with self.lock:
+            changes = self.pending.setdefault(key, {})
+            changes.update(name=name, director=director, rating=rating)
+            if play_count is not None:
+                changes["play_count"] = play_count
+                changes.pop("plays", None)
+            full = len(self.pending) >= self.max_pending
+            self.start_timer()
+        if full:
+            self.flush()
+
+    def pending_count(self):
+        with self.lock:
+            return len(self.pending)
+
+    def flush(self):
+        with self.flush_lock:
+            with self.lock:
+                batch = self.pending
+                self.pending = {}
+                if self.timer is not None:
+                    self.timer.cancel()
+                    self.timer = None
+            if not batch:
+                return 0
+            try:
+                self.flush_batch(batch)
+            except Exception:
+                # Put the batch back so a failed write is retried by the next flush
+                with self.lock:
+                    for key, changes in batch.items():
+                        self.merge(key, changes)
+                    self.start_timer()
+                raise
+            self.flush_count += 1
+            return len(batch)
+
+    def start_timer(self):
+        # must be called while holding self.lock
+        if self.timer is None and self.flush_interval is not None:
+            self.timer = threading.Timer(self.flush_interval, self.flush)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def merge(self, key, changes):
+        # must be called while holding self.lock
+        # `changes` are older than the pending ones, so they only fill in what is missing
+        current = self.pending.setdefault(key, {})
+        if "play_count" not in current:
+            if "play_count" in changes:
+                current["play_count"] = changes["play_count"]
+            if "plays" in changes:
+                current["plays"] = current.get("plays", 0) + changes["plays"]
+        for field in ("name", "director", "rating"):
+            if field in changes and field not in current:
+                current[field] = changes[field]
@@ -0,0 +1,174 @@
+# Tracing and profiling for the homework tutoring agents
+# Plugs into the tracing hooks of the agents library: every agent run, model
+# response, handoff and guardrail becomes a span with start/end time, token counts
+# and outcome. Spans are written as a Chrome trace (open it in chrome://tracing or
+# https://ui.perfetto.dev) and summarized as per-stage latency percentiles.
+import json
+import math
+import threading
+from datetime import datetime
+
+from agents import add_trace_processor
+from agents.tracing import TracingProcessor
+
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values (list): Values in ascending order
+        fraction (float): Percentile between 0 and 1 (0.5 for the median)
+
+    Returns:
+        float: The percentile value
+    """
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def stage_name(span_data):
+    """
+    Name a span by pipeline stage, e.g. "agent: Math Tutor" or "handoff: Triage Agent -> Math Tutor".
+    """
+    kind = span_data.type
+    if kind == "agent":
+        return f"agent: {span_data.name}"
+    if kind == "handoff":
+        return f"handoff: {span_data.from_agent} -> {span_data.to_agent}"
+    if kind in ("guardrail", "custom", "function"):
+        return f"{kind}: {span_data.name}"
+    return kind  # response, generation, ...
+
+
+def token_usage(span_data):
+    """
+    Input/output tokens of a model call span, or None for other spans.
+    """
+    usage = None
+    response = getattr(span_data, "response", None)
+    if response is not None:
+        usage = getattr(response, "usage", None)
+    if usage is None:
+        usage = getattr(span_data, "usage", None)
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        return {"input_tokens": usage.get("input_tokens", 0), "output_tokens": usage.get("output_tokens", 0)}
+    return {"input_tokens": getattr(usage, "input_tokens", 0), "output_tokens": getattr(usage, "output_tokens", 0)}
+
+
+class ChromeTraceProcessor(TracingProcessor):
+    """
+    Collects finished spans as Chrome trace events and keeps per-stage durations
+    for the latency report.
+    """
+
+    def __init__(self, path="agent_trace.json"):
+        """
+        Args:
+            path (str): Where the Chrome trace JSON is written
+        """
+        self.path = path
+        self.events = []
+        self.durations = {}  # stage name -> list of seconds
+        self.errors = {}  # stage name -> count of failed spans
+        self.lanes = {}  # trace id -> row in the trace viewer
+        self.lock = threading.Lock()  # spans can end on other threads
+
+    def on_trace_start(self, trace):
+        with self.lock:
+            self.lanes.setdefault(trace.trace_id, len(self.lanes) + 1)
+
+    def on_trace_end(self, trace):
+        pass
+
+    def on_span_start(self, span):
+        pass
+
+    def on_span_end(self, span):
+        if span.started_at is None or span.ended_at is None:
+            return
+        start = datetime.fromisoformat(span.started_at)
+        end = datetime.fromisoformat(span.ended_at)
+        seconds = (end - start).total_seconds()
+        name = stage_name(span.span_data)
+
+        args = {"span_id": span.span_id, "parent_id": span.parent_id}
+        if span.error:
+            args["outcome"] = "error"
+            args["error"] = span.error
+        elif getattr(span.span_data, "triggered", False):
+            args["outcome"] = "tripwire triggered"
+        else:
+            args["outcome"] = "ok"
+        usage = token_usage(span.span_data)
+        if usage is not None:
+            args.update(usage)
+        if span.span_data.type == "custom":
+            args.update(span.span_data.data or {})
+
+        with self.lock:
+            lane = self.lanes.setdefault(span.trace_id, len(self.lanes) + 1)
+            self.events.append({
+                "name": name,
+                "cat": span.span_data.type,
+                "ph": "X",  # complete event with a duration
+                "ts": start.timestamp() * 1_000_000,
+                "dur": seconds * 1_000_000,
+                "pid": 1,
+                "tid": lane,
+                "args": args,
+            })
+            self.durations.setdefault(name, []).append(seconds)
+            if span.error:
+                self.errors[name] = self.errors.get(name, 0) + 1
+
+    def write(self):
+        """Write the collected spans to the trace file."""
+        with self.lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+    def shutdown(self):
+        self.write()
+
+    def force_flush(self):
+        self.write()
+
+    def report(self):
+        """
+        Per-stage latency summary.
+
+        Returns:
+            str: Table with count, errors and p50/p90/p99/max latency of each stage
+        """
+        with self.lock:
+            stages = {name: sorted(values) for name, values in self.durations.items()}
+            errors = dict(self.errors)
+        if not stages:
+            return "Trace: no spans recorded."
+        lines = [f"Trace written to {self.path}",
+                 f"{'stage':<45} {'count':>6} {'errors':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"]
+        for name in sorted(stages, key=lambda stage: -sum(stages[stage])):
+            values = stages[name]
+            lines.append(f"{name[:45]:<45} {len(values):>6} {errors.get(name, 0):>6} "
+                         f"{percentile(values, 0.5):>7.2f}s {percentile(values, 0.9):>7.2f}s "
+                         f"{percentile(values, 0.99):>7.2f}s {values[-1]:>7.2f}s")
+        return "\n".join(lines)
+
+
+def enable_tracing(path="agent_trace.json"):
+    """
+    Register a ChromeTraceProcessor with the agents library.
+
+    Args:
+        path (str): Where the Chrome trace JSON is written
+
+    Returns:
+        ChromeTraceProcessor: The registered processor (call report() and write() on it)
+    """
+    processor = ChromeTraceProcessor(path)
+    add_trace_processor(processor)
+    return processor
@@ -0,0 +1,167 @@
+# Answer cache for the homework tutoring system
+# Rephrasings of the same question ("what is the derivative of x^2" / "Find the
+# derivative of x^2?") are answered from the cache instead of running the guardrail,
+# triage and tutor agents again.
+#   - Questions are keyed by their content words, in order, and their numbers:
+#     case, punctuation, stopwords and request phrasing ("find", "please", "what is")
+#     may differ, anything else may not
+#   - So "x^2" never answers "x^3", and "second president" or "first vice president"
+#     never answers "first president", however similar the questions look
+#   - Entries expire after a TTL, the least recently used entry is evicted when full,
+#     and the cache is saved to a JSON file after every change
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+
+from homework_classifier import normalize
+
+# Words that may differ between two questions that still ask the same thing
+STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "s", "of", "to", "in", "on", "for",
+    "and", "do", "does", "did", "please", "can", "could", "you", "me", "i", "my",
+    "what", "find", "tell", "give", "show",
+}
+
+
+def canonical(text):
+    """Normalized question with operators joined to their operands ("2x + 5" -> "2x+5")."""
+    return re.sub(r"\s*([-+*/^=])\s*", r"\1", normalize(text))
+
+
+def content_words(text):
+    """The words of a question that carry its meaning, in order."""
+    return [word for word in canonical(text).split() if word not in STOPWORDS]
+
+
+def numbers(text):
+    """The numbers in a question ("2.5" stays one number, unlike in the words)."""
+    return sorted(re.findall(r"\d+(?:\.\d+)?", text))
+
+
+def cache_key(question):
+    """Key shared by every phrasing of the same question."""
+    return " ".join(content_words(question)) + "|" + " ".join(numbers(question))
+
+
+class AnswerCache:
+    """
+    Cache of answered (and rejected) questions with LRU/TTL eviction and on-disk persistence.
+    """
+
+    def __init__(self, path="answer_cache.json", max_entries=1000, ttl_seconds=7 * 24 * 3600):
+        """
+        Args:
+            path (str): JSON file the cache is loaded from and saved to (None to keep it in memory)
+            max_entries (int): Entries kept before the least recently used one is evicted
+            ttl_seconds (float): Age after which an entry is no longer used
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()  # cache key -> entry, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                saved = json.load(f)
+        except ValueError:
+            return  # damaged file - start with an empty cache
+        for entry in saved:
+            if not self.expired(entry):
+                self.add(entry)
+
+    def save(self):
+        if self.path is None:
+            return
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(list(self.entries.values()), f)
+        os.replace(temporary_path, self.path)  # never leave a half-written cache behind
+
+    def expired(self, entry):
+        return time.time() - entry["created"] > self.ttl_seconds
+
+    def add(self, entry):
+        key = cache_key(entry["question"])
+        self.entries.pop(key, None)
+        self.entries[key] = entry
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def lookup(self, question):
+        """
+        Find a cached entry for the same question, however it is phrased.
+
+        Args:
+            question (str): The user's question
+
+        Returns:
+            dict or None: Entry with 'answer', 'agent', 'is_homework', 'reasoning'
+            and 'question' (the cached phrasing) keys, or None on a miss
+        """
+        key = cache_key(question)
+        entry = self.entries.get(key)
+        if entry is not None and self.expired(entry):
+            del self.entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)  # most recently used
+        return {"answer": entry["answer"], "agent": entry["agent"], "is_homework": entry["is_homework"],
+                "reasoning": entry["reasoning"], "question": entry["question"]}
+
+    def put(self, question, answer, agent, is_homework, reasoning):
+        """
+        Store the outcome of a question and save the cache.
+
+        Args:
+            question (str): The user's question
+            answer (str or None): The final answer (None when the guardrail blocked it)
+            agent (str or None): Name of the agent that produced the answer
+            is_homework (bool): The guardrail verdict
+            reasoning (str): The guardrail's reasoning
+        """
+        self.add({"question": question, "answer": answer, "agent": agent,
+                  "is_homework": is_homework, "reasoning": reasoning, "created": time.time()})
+        self.save()
+
+    def report(self):
+        """
+        Summarize cache usage.
+
+        Returns:
+            str: Hit rate and number of entries
+        """
+        total = self.hits + self.misses
+        if total == 0:
+            return "Answer cache: no lookups."
+        return (f"Answer cache: {self.hits}/{total} questions ({self.hits / total:.0%}) answered from cache, "
+                f"{len(self.entries)} entries stored")
+
+
+if __name__ == "__main__":
+    # Self-check: rephrasings hit, questions that only look similar do not
+    cache = AnswerCache(path=None)
+    cache.put("Who was the first president of the United States?", "George Washington",
+              "History Tutor", True, "History question")
+    cache.put("What is the derivative of x^2?", "2x", "Math Tutor", True, "Math question")
+    same = ["who was the first president of the united states", "Who was the first president of United States?",
+            "What's the derivative of x ^ 2", "Derivative of x^2?", "Find the derivative of x^2"]
+    different = ["Who was the second president of the United States?",
+                 "Who was the first vice president of the United States?",
+                 "Who was the first president of the Confederate States?",
+                 "What is the derivative of x^3?", "What is the integral of x^2?"]
+    for question in same:
+        assert cache.lookup(question) is not None, f"should hit: {question}"
+    for question in different:
+        assert cache.lookup(question) is None, f"should miss: {question}"
+    print(f"{len(same)} rephrasings answered from cache, {len(different)} near misses not answered")
@@ -0,0 +1,250 @@
+# Batch (non-interactive) mode for the homework tutoring system
+# Reads queued questions from a JSONL file, runs each one through the homework
+# guardrail and the triage/tutor agents with bounded concurrency, rate limiting and
+# retries, and appends one result per line to an output JSONL file.
+# The output file doubles as the checkpoint: restarting with the same output file
+# skips every question that already has an answered or rejected result.
+#
+# Usage: python3 batch_runner.py questions.jsonl results.jsonl [--concurrency 8] [--rpm 120]
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from agents import OpenAIProvider, Runner, custom_span, trace
+from agents.models.interface import Model
+import repo_path
+
+repo_path.add_repository_root()  # the shared llm_client package lives in the repository root
+from llm_client import RateLimiter, backoff_delay, is_retryable
+import demo_agent  # Agent definitions and the guardrail/routing pipeline
+from homework_classifier import TieredGuardrail
+from question_router import QuestionRouter
+from agent_tracing import enable_tracing
+
+
+def read_questions(path):
+    """
+    Yield (id, question) pairs from a JSONL file one line at a time.
+    Lines without an "id" field use their line number as the id.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield str(record.get("id", line_number)), record["question"]
+
+
+def read_checkpoint(path):
+    """
+    Collect the ids that already have a final result in the output file.
+
+    Returns:
+        set: ids whose status is "answered" or "rejected" (failed ones are retried)
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut short by a crash
+            if record.get("status") in ("answered", "rejected"):
+                done.add(record["id"])
+    return done
+
+
+class RateLimitedModel(Model):
+    """
+    Wraps a model so that every call to it waits for the shared rate limiter.
+    One question makes several model calls (guardrail, triage, handoff to the tutor),
+    so limiting at the model is what keeps the calls per minute under the limit.
+    """
+
+    def __init__(self, model, limiter):
+        """
+        Args:
+            model (Model): The model the agents run on, e.g. OpenAIProvider().get_model(None)
+            limiter (RateLimiter): Limiter shared by all workers
+        """
+        self.model = model
+        self.limiter = limiter
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema,
+                           handoffs, tracing, **kwargs):
+        await self.limiter.acquire()
+        return await self.model.get_response(system_instructions, input, model_settings, tools,
+                                             output_schema, handoffs, tracing, **kwargs)
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema,
+                              handoffs, tracing, **kwargs):
+        await self.limiter.acquire()
+        async for event in self.model.stream_response(system_instructions, input, model_settings, tools,
+                                                      output_schema, handoffs, tracing, **kwargs):
+            yield event
+
+
+class BatchRunner:
+    """
+    Runs questions through the guardrail -> triage -> tutor pipeline with a fixed
+    number of workers, a shared rate limiter and retry with exponential backoff.
+    """
+
+    def __init__(self, output_path, concurrency=8, requests_per_minute=120, max_attempts=5,
+                 base_delay=1.0, model=None):
+        """
+        Args:
+            output_path (str): JSONL file results are appended to
+            concurrency (int): Number of questions processed at the same time
+            requests_per_minute (float): Maximum model calls per minute across all workers
+            max_attempts (int): Attempts per pipeline stage before the question is marked failed
+            base_delay (float): First retry delay in seconds, doubled on every retry
+            model (Model): Model every agent runs on, behind the rate limiter
+                (defaults to the OpenAI model)
+        """
+        self.output_path = output_path
+        self.concurrency = concurrency
+        self.limiter = RateLimiter(requests_per_minute, burst=concurrency)
+        demo_agent.use_model(RateLimitedModel(model or OpenAIProvider().get_model(None), self.limiter))
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.counts = {"answered": 0, "rejected": 0, "failed": 0, "skipped": 0}
+
+    async def call(self, make_call, attempts):
+        """
+        Run one pipeline stage with retries (each model call in it waits for the rate limiter).
+
+        Args:
+            make_call: Function returning a new coroutine for each attempt
+            attempts (list): One-element list counting attempts for the question
+
+        Returns:
+            The call's result
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            attempts[0] += 1
+            try:
+                return await make_call()
+            except Exception as e:
+                # Only rate limits, server errors and network failures are worth another attempt
+                if attempt == self.max_attempts or not is_retryable(e):
+                    raise
+                await asyncio.sleep(backoff_delay(attempt, self.base_delay, error=e))
+
+    async def process(self, question_id, question):
+        """
+        Run one question through the pipeline.
+
+        Returns:
+            dict: Result record with status, answer and per-stage timings
+        """
+        record = {"id": question_id, "question": question}
+        timings = {}
+        attempts = [0]
+        start = time.perf_counter()
+        try:
+            stage_start = time.perf_counter()
+            verdict = await self.call(lambda: demo_agent.classify_homework(question), attempts)
+            timings["guardrail"] = time.perf_counter() - stage_start
+            record["reasoning"] = verdict.reasoning
+            if not verdict.is_homework:
+                record["status"] = "rejected"
+            else:
+                stage_start = time.perf_counter()
+                _agent, unguarded_agent, route = demo_agent.choose_agent(question)
+                timings["routing"] = time.perf_counter() - stage_start
+
+                stage_start = time.perf_counter()
+                result = await self.call(lambda: Runner.run(unguarded_agent, question), attempts)
+                timings["answer"] = time.perf_counter() - stage_start
+                if route is None:
+                    demo_agent.learn_route(question, result)
+                record["status"] = "answered"
+                record["agent"] = result.last_agent.name
+                record["answer"] = str(result.final_output)
+        except Exception as e:
+            demo_agent.record_error(e)
+            record["status"] = "failed"
+            record["error"] = f"{type(e).__name__}: {e}"
+        timings["total"] = time.perf_counter() - start
+        record["attempts"] = attempts[0]
+        record["timings"] = {stage: round(seconds, 4) for stage, seconds in timings.items()}
+        return record
+
+    async def run(self, input_path):
+        """
+        Process every question in the input file that has no final result yet.
+
+        Args:
+            input_path (str): JSONL file of questions
+        """
+        done = read_checkpoint(self.output_path)
+        queue = asyncio.Queue(maxsize=self.concurrency * 2)
+
+        async def produce():
+            for question_id, question in read_questions(input_path):
+                if question_id in done:
+                    self.counts["skipped"] += 1
+                    continue
+                await queue.put((question_id, question))
+            for _ in range(self.concurrency):
+                await queue.put(None)  # one stop signal per worker
+
+        with open(self.output_path, "a", encoding="utf-8") as output:
+            async def work():
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    with trace("Batch question"), custom_span("question", data={"id": item[0]}):
+                        record = await self.process(*item)
+                    # Written and flushed right away so a restart never redoes finished questions
+                    output.write(json.dumps(record) + "\n")
+                    output.flush()
+                    self.counts[record["status"]] += 1
+                    self.print_progress()
+
+            workers = [asyncio.create_task(work()) for _ in range(self.concurrency)]
+            await asyncio.gather(produce(), *workers)
+        self.print_progress()
+        print()
+
+    def print_progress(self):
+        print(f"\r>>> answered {self.counts['answered']}, rejected {self.counts['rejected']}, "
+              f"failed {self.counts['failed']}, skipped {self.counts['skipped']}", end="", flush=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Answer queued homework questions from a JSONL file")
+    parser.add_argument("input", help="JSONL file with a 'question' field (and optional 'id') per line")
+    parser.add_argument("output", help="JSONL file results are appended to, also used to resume")
+    parser.add_argument("--concurrency", type=int, default=8, help="questions processed at the same time")
+    parser.add_argument("--rpm", type=float, default=120, help="maximum model calls per minute")
+    parser.add_argument("--max-attempts", type=int, default=5, help="attempts per pipeline stage")
+    parser.add_argument("--fast-guardrail", action="store_true",
+                        help="answer the guardrail from a verdict cache or local classifier when confident")
+    parser.add_argument("--router", action="store_true",
+                        help="skip the triage agent when the question router is confident")
+    parser.add_argument("--trace", metavar="FILE", nargs="?", const="agent_trace.json",
+                        help="write a Chrome trace of every agent run (default agent_trace.json) "
+                             "and print per-stage latency percentiles at the end")
+    args = parser.parse_args()
+
+    demo_agent.load_api_key()
+    if args.trace is not None:
+        demo_agent.trace_processor = enable_tracing(args.trace)
+    if args.fast_guardrail:
+        demo_agent.fast_guardrail = TieredGuardrail(demo_agent.classify_homework_llm, demo_agent.HomeworkOutput)
+    if args.router:
+        demo_agent.question_router = QuestionRouter(demo_agent.direct_agents)
+
+    runner = BatchRunner(args.output, concurrency=args.concurrency,
+                         requests_per_minute=args.rpm, max_attempts=args.max_attempts)
+    asyncio.run(runner.run(args.input))
+    if demo_agent.trace_processor is not None:
+        demo_agent.trace_processor.write()
+    demo_agent.print_session_reports()
@@ -0,0 +1,157 @@
+# Benchmark of the agent orchestration overhead, without network access or keys.txt
+# Runs the guardrail, triage (with its handoff) and full pipeline on a local stand-in
+# model at several concurrency levels. The stand-in's simulated latency is subtracted
+# from every run, so what is left is the time spent in the agents library and our code.
+# With --replay the model answers from responses recorded with demo_agent.py --record.
+#
+# Usage: python3 bench_agents.py [--concurrency 1,4,16,64] [--questions 64] [--latency 0.0]
+#                                [--replay recorded_responses.jsonl] [--json bench_agents.json]
+import argparse
+import asyncio
+import json
+import time
+
+from agents import Runner, set_trace_processors
+from agents.exceptions import InputGuardrailTripwireTriggered
+import demo_agent  # Agent definitions
+from agent_tracing import percentile
+from evaluate_router import load_questions
+from local_model import LocalModel, ReplayModel
+
+# Questions the guardrail should reject, mixed in with the labelled homework questions
+OFF_TOPIC_QUESTIONS = [
+    "What's the meaning of life?",
+    "Tell me a joke about cats",
+    "What will the weather be like tomorrow?",
+    "Can you recommend a good movie for tonight?",
+]
+
+
+async def run_stage(run_one, questions, concurrency, model):
+    """
+    Run one pipeline stage over all questions with at most `concurrency` at a time.
+
+    Args:
+        run_one: async function (question, expected agent name) doing one run
+        questions (list): (question, expected agent name) pairs
+        concurrency (int): Runs in flight at the same time
+        model: The LocalModel or ReplayModel the agents use
+
+    Returns:
+        dict: Throughput, latency percentiles, model time and overhead per run
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+    calls_before, model_seconds_before = model.calls, model.simulated_seconds
+
+    async def timed(question, expected):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await run_one(question, expected)
+            except InputGuardrailTripwireTriggered:
+                pass  # a blocked question is a normal outcome
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(question, expected) for question, expected in questions))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    runs = len(latencies)
+    model_seconds = (model.simulated_seconds - model_seconds_before) / runs
+    mean = sum(latencies) / runs
+    return {
+        "runs": runs,
+        "errors": errors,
+        "runs_per_second": runs / wall,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "model_calls_per_run": (model.calls - calls_before) / runs,
+        "model_ms_per_run": model_seconds * 1000,
+        "overhead_ms_per_run": (mean - model_seconds) * 1000,
+    }
+
+
+async def guardrail(question, _expected):
+    await demo_agent.classify_homework_llm(question)
+
+
+async def triage(question, _expected):
+    await Runner.run(demo_agent.unguarded_triage_agent, question)
+
+
+async def direct(question, expected):
+    await Runner.run(demo_agent.direct_agents[expected][1], question)
+
+
+async def full_pipeline(question, _expected):
+    await Runner.run(demo_agent.triage_agent, question)
+
+
+async def benchmark(model, questions, levels):
+    homework = [(question, expected) for question, expected in questions if expected is not None]
+    stages = [
+        ("guardrail", guardrail, questions),
+        ("triage + handoff", triage, homework),
+        ("specialist only", direct, homework),
+        ("full pipeline", full_pipeline, questions),
+    ]
+    results = []
+    for concurrency in levels:
+        for name, run_one, stage_questions in stages:
+            row = await run_stage(run_one, stage_questions, concurrency, model)
+            row.update(stage=name, concurrency=concurrency)
+            results.append(row)
+    return results
+
+
+def print_table(results):
+    print(f"{'stage':<18} {'conc':>5} {'runs/s':>9} {'p50':>9} {'p95':>9} {'calls':>6} "
+          f"{'model':>9} {'overhead':>9} {'errors':>6}")
+    for row in results:
+        print(f"{row['stage']:<18} {row['concurrency']:>5} {row['runs_per_second']:>9.1f} "
+              f"{row['p50_ms']:>7.2f}ms {row['p95_ms']:>7.2f}ms {row['model_calls_per_run']:>6.1f} "
+              f"{row['model_ms_per_run']:>7.2f}ms {row['overhead_ms_per_run']:>7.2f}ms {row['errors']:>6}")
+    # The handoff costs the difference between going through triage and going straight to the specialist
+    by_key = {(row["stage"], row["concurrency"]): row for row in results}
+    print()
+    for (stage, concurrency), row in by_key.items():
+        if stage == "triage + handoff":
+            handoff = row["overhead_ms_per_run"] - by_key[("specialist only", concurrency)]["overhead_ms_per_run"]
+            print(f"Triage/handoff overhead at concurrency {concurrency}: {handoff:.2f} ms per question")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark agent orchestration overhead offline")
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma separated concurrency levels")
+    parser.add_argument("--questions", type=int, default=64, help="questions per stage and level")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated model latency per call in seconds")
+    parser.add_argument("--seconds-per-token", type=float, default=0.0,
+                        help="simulated model time per output token in seconds")
+    parser.add_argument("--replay", metavar="FILE",
+                        help="answer from responses recorded with demo_agent.py --record instead")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="multiplier for recorded latencies with --replay (0 replays instantly)")
+    parser.add_argument("--json", metavar="FILE", help="also write the results to a JSON file")
+    args = parser.parse_args()
+
+    set_trace_processors([])  # spans are still created, but nothing is uploaded
+    if args.replay is not None:
+        model = ReplayModel(args.replay, time_scale=args.time_scale)
+    else:
+        model = LocalModel(latency=args.latency, seconds_per_token=args.seconds_per_token)
+    demo_agent.use_model(model)
+
+    pool = load_questions("router_eval_questions.jsonl") + [(question, None) for question in OFF_TOPIC_QUESTIONS]
+    questions = [pool[i % len(pool)] for i in range(args.questions)]
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    results = asyncio.run(benchmark(model, questions, levels))
+    print_table(results)
+    if args.json is not None:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
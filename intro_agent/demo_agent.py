@@ -1,29 +1,47 @@
 # Import necessary libraries for creating AI agents
-from agents import Agent, InputGuardrail, GuardrailFunctionOutput, Runner
+from agents import Agent, InputGuardrail, InputGuardrailResult, GuardrailFunctionOutput, Runner
+from agents import trace, custom_span  # Spans for tracing and profiling
+from agents import OpenAIProvider, set_trace_processors
+from agents.tracing import get_current_span
 from agents.exceptions import InputGuardrailTripwireTriggered
+from openai.types.responses import ResponseTextDeltaEvent  # Streamed text tokens
 from pydantic import BaseModel  # For data validation and type hints
 import os  # For environment variables
 import asyncio  # For async/await functionality
+import argparse  # For command line options
+import time  # For measuring latency
+import traceback  # For recording failures in the trace
+from homework_classifier import TieredGuardrail  # Local fast path for the guardrail
+from question_router import QuestionRouter  # Local fast path for triage
+from answer_cache import AnswerCache  # Cache of previous answers by their content words
+from session_memory import SessionMemory  # Bounded conversation history
+from agent_tracing import enable_tracing  # Chrome trace and latency report
+from local_model import LocalModel, RecordingModel, ReplayModel  # Offline and record/replay models
+import repo_path  # For finding the shared llm_client package
+
+# The shared llm_client package lives in the repository root
+repo_path.add_repository_root()
+import llm_client  # Reads keys.txt once for every tutorial
 
 # Function to load OpenAI API key from external file
 # This keeps sensitive information out of the source code
 def get_key():
     """
-    Reads the API key from keys.txt file.
-    Expected format: some_label:actual_api_key
+    Reads the OpenAI API key through the shared llm_client package.
+    Expected format of keys.txt: some_label:actual_api_key (one line per provider)
     Returns just the key part after the colon.
     """
     try:
-        with open('keys.txt') as f:
-            key = f.readline().strip().split(':')[-1]
-        return key
+        return llm_client.get_key("openai")
     except FileNotFoundError:
         print("Error: keys.txt file not found")
         exit(1)
 
 # Set the OpenAI API key as environment variable
 # The agents library will automatically use this for API calls
-os.environ['OPENAI_API_KEY'] = get_key()
+# Called before the first live run rather than on import, so offline runs need no keys.txt
+def load_api_key():
+    os.environ['OPENAI_API_KEY'] = get_key()
 
 # Define the output structure for the homework guardrail
 # Pydantic BaseModel provides automatic validation and type checking
@@ -44,6 +62,45 @@ guardrail_agent = Agent(
     output_type=HomeworkOutput,  # Forces structured output
 )
 
+# Run the guardrail agent on its own and return its HomeworkOutput decision
+async def classify_homework_llm(input_data, context=None):
+    """
+    Ask the guardrail agent whether the input is homework-related.
+    
+    Args:
+        input_data: The user's input text
+        context: Optional context object passed through to the runner
+    
+    Returns:
+        HomeworkOutput: The guardrail agent's decision and reasoning
+    """
+    result = await Runner.run(guardrail_agent, input_data, context=context)
+    return result.final_output_as(HomeworkOutput)
+
+# Optional tiered guardrail (verdict caches and a local classifier in front of the LLM)
+# Set by main() when the --fast-guardrail option is used
+fast_guardrail = None
+
+# Classify input with the fast guardrail when enabled, otherwise with the LLM
+# Shared by the input guardrail below and by the speculative mode
+async def classify_homework(input_data, context=None):
+    """
+    Decide whether the input is homework-related.
+    
+    Args:
+        input_data: The user's input text
+        context: Optional context object passed through to the runner
+    
+    Returns:
+        HomeworkOutput: The decision and reasoning
+    """
+    if fast_guardrail is not None:
+        with custom_span("fast_guardrail", data={}) as span:
+            verdict, tier = await fast_guardrail.classify(input_data, context)
+            span.span_data.data["tier"] = tier
+        return verdict
+    return await classify_homework_llm(input_data, context)
+
 # Async guardrail function
 # This function determines if input should be allowed through to the main agents
 async def homework_guardrail(ctx, _agent, input_data):
@@ -60,11 +117,8 @@ async def homework_guardrail(ctx, _agent, input_data):
         - output_info: The guardrail agent's decision
         - tripwire_triggered: True if input should be blocked (not homework)
     """
-    # Run the guardrail agent to analyze the input
-    result = await Runner.run(guardrail_agent, input_data, context=ctx.context)
-    
-    # Extract the structured output from the guardrail agent
-    final_output = result.final_output_as(HomeworkOutput)
+    # Run the guardrail agent to analyze the input and extract its structured output
+    final_output = await classify_homework(input_data, context=ctx.context)
     
     # Return guardrail result
     # tripwire_triggered=True means block the request
@@ -88,6 +142,9 @@ history_tutor_agent = Agent(
     instructions="You provide assistance with historical queries. Explain important events and context clearly.",
 )
 
+# The homework guardrail wrapped for use as an agent input guardrail
+homework_input_guardrail = InputGuardrail(guardrail_function=homework_guardrail)
+
 # Create the main triage agent that routes questions to appropriate specialists
 # This agent has access to both specialist agents and the homework guardrail
 triage_agent = Agent(
@@ -95,10 +152,320 @@ triage_agent = Agent(
     instructions="You determine which agent to use based on the user's homework question",
     handoffs=[history_tutor_agent, math_tutor_agent],  # Available specialist agents
     input_guardrails=[
-        InputGuardrail(guardrail_function=homework_guardrail),  # Security filter
+        homework_input_guardrail,  # Security filter
     ],
 )
 
+# Same triage agent without the built-in guardrail
+# Used by the speculative mode, which runs the guardrail itself alongside the answer
+unguarded_triage_agent = triage_agent.clone(input_guardrails=[])
+
+# Specialists the router can dispatch to directly: name -> (guarded agent, unguarded agent)
+# Input guardrails only run on the first agent of a run, so the guarded copies carry
+# the homework guardrail themselves when triage is skipped
+direct_agents = {
+    agent.name: (agent.clone(input_guardrails=[homework_input_guardrail]), agent)
+    for agent in (math_tutor_agent, history_tutor_agent)
+}
+
+# Optional direct-dispatch router, set by main() when the --router option is used
+question_router = None
+
+def choose_agent(question):
+    """
+    Pick the agent to start a question with.
+    
+    Uses the router to go straight to a specialist when it is confident,
+    otherwise starts with the triage agent.
+    
+    Args:
+        question (str): The homework question from the user
+        
+    Returns:
+        tuple: (guarded agent, unguarded agent, description of the route or None for triage)
+    """
+    if question_router is not None:
+        with custom_span("router", data={}) as span:
+            name, confidence, tier = question_router.route(question)
+            span.span_data.data.update({"route": name or "triage", "tier": tier})
+        if name in direct_agents:
+            guarded, unguarded = direct_agents[name]
+            return guarded, unguarded, f"{name} ({tier}, {confidence:.0%} confident)"
+    return triage_agent, unguarded_triage_agent, None
+
+def learn_route(question, result):
+    """
+    Teach the router which specialist the triage agent handed a question to,
+    or that it answered the question itself.
+    
+    Args:
+        question (str): The homework question from the user
+        result: RunResult of a run that started with the triage agent
+    """
+    if question_router is not None:
+        question_router.learn(question, result.last_agent.name)
+
+def guardrail_tripped(verdict):
+    """
+    Build the exception the built-in guardrail raises, for guardrail checks run by hand.
+    
+    Args:
+        verdict (HomeworkOutput): The blocking guardrail decision
+        
+    Returns:
+        InputGuardrailTripwireTriggered: Exception to raise
+    """
+    return InputGuardrailTripwireTriggered(InputGuardrailResult(
+        guardrail=homework_input_guardrail,
+        output=GuardrailFunctionOutput(output_info=verdict, tripwire_triggered=True),
+    ))
+
+async def run_speculative(question, agent=unguarded_triage_agent):
+    """
+    Run the guardrail and the triage/tutor generation at the same time.
+    
+    The answer is only returned once the guardrail has passed. If the guardrail
+    trips, the in-flight generation is cancelled and the usual
+    InputGuardrailTripwireTriggered exception is raised.
+    
+    Args:
+        question (str): The homework question from the user
+        agent: Agent without input guardrails to generate the answer with
+        
+    Returns:
+        tuple: (RunResult of the agent, dict of timings in seconds with
+        'guardrail', 'answer' and 'total' keys)
+    """
+    timings = {}
+    start = time.perf_counter()
+
+    async def timed(stage, coro):
+        # Record how long each stage takes on its own
+        stage_start = time.perf_counter()
+        try:
+            return await coro
+        finally:
+            timings[stage] = time.perf_counter() - stage_start
+
+    guardrail_task = asyncio.create_task(timed("guardrail", classify_homework(question)))
+    answer_task = asyncio.create_task(timed("answer", Runner.run(agent, question)))
+    try:
+        verdict = await guardrail_task
+        if not verdict.is_homework:
+            # Blocked - throw away the speculative answer
+            raise guardrail_tripped(verdict)
+        result = await answer_task
+    finally:
+        if not answer_task.done():
+            answer_task.cancel()
+            await asyncio.gather(answer_task, return_exceptions=True)
+    timings["total"] = time.perf_counter() - start
+    return result, timings
+
+async def run_streaming(question, agent=unguarded_triage_agent, speculative=False):
+    """
+    Print the answer token by token as it is generated.
+    
+    Nothing is printed until the homework guardrail has passed, so a blocked question
+    never shows any part of an answer. By default the guardrail runs first and the
+    stream starts once it passes. In speculative mode the guardrail runs alongside the
+    stream: output is held back until it passes, and the stream is cancelled if it trips.
+    Announces each agent as it takes over the question (triage, then the specialist
+    it hands off to).
+    
+    Args:
+        question (str): The homework question from the user
+        agent: Agent without input guardrails to generate the answer with
+        speculative (bool): Run the guardrail in parallel with the stream
+        
+    Returns:
+        tuple: (RunResultStreaming, dict of timings in seconds with 'guardrail',
+        'first_token', 'total' and, in speculative mode, 'answer' keys)
+        
+    Raises:
+        InputGuardrailTripwireTriggered: If the guardrail blocks the question
+    """
+    timings = {}
+    start = time.perf_counter()
+    guardrail_task = None
+    if not speculative:
+        # Check the question before generating anything
+        verdict = await classify_homework(question)
+        timings["guardrail"] = time.perf_counter() - start
+        if not verdict.is_homework:
+            raise guardrail_tripped(verdict)
+    result = Runner.run_streamed(agent, question)
+    if speculative:
+        async def guardrail():
+            verdict = await classify_homework(question)
+            timings["guardrail"] = time.perf_counter() - start
+            if not verdict.is_homework:
+                result.cancel()  # stop generating an answer that will not be shown
+            return verdict
+        guardrail_task = asyncio.create_task(guardrail())
+
+    held_back = []  # output produced before the guardrail passed
+    started = False  # whether the answer header has been printed
+
+    def show(text, token=False):
+        nonlocal started
+        if guardrail_task is not None:
+            if not guardrail_task.done():
+                held_back.append((text, token))
+                return
+            if guardrail_task.exception() is not None or not guardrail_task.result().is_homework:
+                return  # blocked - the error is raised once the stream stops
+        if not started:
+            # The guardrail has passed - the answer can be shown
+            print("Here's your answer:")
+            print("-" * 50)
+            started = True
+        for earlier_text, earlier_token in held_back + [(text, token)]:
+            # Time-to-first-token is when the user first sees answer text
+            if earlier_token and earlier_text and "first_token" not in timings:
+                timings["first_token"] = time.perf_counter() - start
+            print(earlier_text, end="", flush=True)
+        held_back.clear()
+
+    try:
+        async for event in result.stream_events():
+            if event.type == "agent_updated_stream_event":
+                show(f"[{event.new_agent.name} is handling your question]\n")
+            elif event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                show(event.data.delta, token=True)
+        if guardrail_task is not None:
+            timings["answer"] = time.perf_counter() - start
+            verdict = await guardrail_task
+            if not verdict.is_homework:
+                raise guardrail_tripped(verdict)
+        show("")  # release anything still held back (and the header of an empty answer)
+    finally:
+        if guardrail_task is not None and not guardrail_task.done():
+            guardrail_task.cancel()
+            await asyncio.gather(guardrail_task, return_exceptions=True)
+    print()
+    timings["total"] = time.perf_counter() - start
+    return result, timings
+
+def print_timings(timings):
+    """
+    Show the latency of each stage of a question.
+    
+    When the guardrail ran in parallel with the answer, also shows how much
+    that saved compared with running them one after the other.
+    
+    Args:
+        timings (dict): Timings in seconds as returned by run_speculative or run_streaming
+    """
+    labels = [("guardrail", "Guardrail"), ("answer", "Answer"),
+              ("first_token", "First token"), ("total", "Total")]
+    parts = [f"{label}: {timings[key]:.2f}s" for key, label in labels if key in timings]
+    if "guardrail" in timings and "answer" in timings:
+        saved = timings["guardrail"] + timings["answer"] - timings["total"]
+        parts.append(f"Saved vs sequential: {saved:.2f}s")
+    print(" | ".join(parts))
+
+# Optional answer cache, set by main() when the --cache option is used
+answer_cache = None
+
+def cache_answer(question, result):
+    """
+    Store a successful answer in the answer cache, if it is enabled.
+    
+    Args:
+        question (str): The homework question from the user
+        result: RunResult (or RunResultStreaming) that answered it
+    """
+    if answer_cache is None:
+        return
+    reasoning = "Passed the homework guardrail."
+    for guardrail_result in result.input_guardrail_results:
+        reasoning = guardrail_result.output.output_info.reasoning
+    answer_cache.put(question, str(result.final_output), result.last_agent.name, True, reasoning)
+
+# Agent that folds older turns of the conversation into a short summary
+summary_agent = Agent(
+    name="Conversation Summarizer",
+    instructions="Summarize the tutoring conversation you are given in under 120 words. "
+                 "Keep the questions asked, the key results and any steps a follow-up question may refer to.",
+)
+
+async def summarize_turns(previous_summary, turns):
+    """
+    Fold finished turns into the running conversation summary.
+    
+    Args:
+        previous_summary (str): The summary so far (may be empty)
+        turns (list): (question, answer) pairs to add to it
+        
+    Returns:
+        str: The new summary
+    """
+    text = f"Summary so far: {previous_summary or '(none)'}\n\n"
+    for question, answer in turns:
+        text += f"Student: {question}\nTutor: {answer}\n\n"
+    result = await Runner.run(summary_agent, text)
+    return str(result.final_output)
+
+# Optional conversation memory, set by main() when the --memory option is used
+session_memory = None
+
+def use_model(model):
+    """
+    Run every agent of the tutoring system on the given model instead of the default OpenAI model.
+    
+    Args:
+        model: A Model instance, e.g. LocalModel(), ReplayModel(path) or RecordingModel(...)
+    """
+    agents = [guardrail_agent, math_tutor_agent, history_tutor_agent, triage_agent,
+              unguarded_triage_agent, summary_agent]
+    agents += [guarded for guarded, _agent in direct_agents.values()]
+    for agent in agents:
+        agent.model = model
+
+def select_model(offline=False, record_path=None, replay_path=None):
+    """
+    Choose between the OpenAI API, a local stand-in model and recorded responses.
+    
+    Args:
+        offline (bool): Use the deterministic local stand-in model (no network, no keys.txt)
+        record_path (str): Save every live response with its latency to this JSONL file
+        replay_path (str): Answer from responses recorded earlier (no network, no keys.txt)
+    """
+    if offline or replay_path is not None:
+        use_model(LocalModel() if offline else ReplayModel(replay_path))
+        set_trace_processors([])  # nothing to upload traces to
+        return
+    load_api_key()
+    if record_path is not None:
+        use_model(RecordingModel(OpenAIProvider().get_model(None), record_path))
+
+def model_input_tokens(result):
+    """
+    Total input tokens the model reported for all calls of a run.
+    
+    Args:
+        result: RunResult or RunResultStreaming
+        
+    Returns:
+        int: Sum of input tokens over the run's model responses
+    """
+    return sum(response.usage.input_tokens for response in result.raw_responses)
+
+def remember_turn(question, result):
+    """
+    Add a finished question to the conversation memory and report the prompt size.
+    
+    Args:
+        question (str): The homework question from the user
+        result: RunResult (or RunResultStreaming) that answered it
+    """
+    if session_memory is None:
+        return
+    print(f"Prompt tokens this turn: ~{session_memory.last_prompt_tokens} sent, "
+          f"{model_input_tokens(result)} model input tokens in total")
+    session_memory.add_turn(question, str(result.final_output))
+
 def print_welcome_message():
     """
     Display welcome message and instructions for the interactive session.
@@ -131,31 +498,89 @@ def is_exit_command(user_input):
     exit_commands = ['quit', 'exit', 'bye', 'goodbye', 'stop']
     return user_input.lower().strip() in exit_commands
 
-async def handle_homework_question(question):
+async def handle_homework_question(question, speculative=False, stream=False):
     """
     Process a homework question through the triage agent system.
     
     Args:
         question (str): The homework question from the user
+        speculative (bool): Run the guardrail in parallel with the answer and show timings
+        stream (bool): Print the answer as it is generated and show time-to-first-token
         
     Returns:
         bool: True if processing was successful, False if there was an error
     """
+    cached = None
+    run_input = question
     try:
         # Attempt to process the question through the triage agent
         print("Processing your question...")
+        # Answer repeated questions from the answer cache without calling any agent.
+        # The bare question is looked up, so this also works for every turn with --memory
+        if answer_cache is not None:
+            start = time.perf_counter()
+            with custom_span("answer_cache", data={}) as span:
+                cached = answer_cache.lookup(question)
+                span.span_data.data["hit"] = cached is not None
+            if cached is not None:
+                if not cached["is_homework"]:
+                    raise guardrail_tripped(HomeworkOutput(is_homework=False, reasoning=cached["reasoning"]))
+                print(f"Here's your answer (cached from {cached['agent']} for \"{cached['question']}\"):")
+                print("-" * 50)
+                print(cached["answer"])
+                print("-" * 50)
+                print(f"Total: {(time.perf_counter() - start) * 1000:.1f}ms")
+                if session_memory is not None:
+                    session_memory.add_turn(question, cached["answer"])
+                return True
+        # Send recent turns and a summary of older ones along with the question.
+        # Answers that depended on them are not cached, since a follow-up
+        # ("now explain step 2") means something else in another conversation
+        if session_memory is not None:
+            run_input = session_memory.build_input(question)
+        # Skip triage when the router is confident about the specialist
+        agent, unguarded_agent, route = choose_agent(question)
+        if route is not None:
+            print(f"Routed directly to {route}")
+        if stream:
+            # Display the answer while it is being generated, once the guardrail has passed
+            result, timings = await run_streaming(run_input, unguarded_agent, speculative)
+            print("-" * 50)
+            if route is None:
+                learn_route(question, result)
+            if run_input is question:
+                cache_answer(question, result)
+            print_timings(timings)
+            remember_turn(question, result)
+            return True
+
         # Use await for the async Runner.run call
-        result = await Runner.run(triage_agent, question)
+        timings = None
+        if speculative:
+            result, timings = await run_speculative(run_input, unguarded_agent)
+        else:
+            result = await Runner.run(agent, run_input)
+        if route is None:
+            learn_route(question, result)
+        if run_input is question:
+            cache_answer(question, result)
         
         # Successfully processed - display the result
         print("Here's your answer:")
         print("-" * 50)
         print(result.final_output)
         print("-" * 50)
+        if timings is not None:
+            print_timings(timings)
+        remember_turn(question, result)
         return True
         
     except InputGuardrailTripwireTriggered as e:
         # Guardrail blocked the question (not homework-related)
+        if answer_cache is not None and cached is None and run_input is question:
+            # Remember the rejection so the same question is refused straight away next time
+            verdict = e.guardrail_result.output.output_info
+            answer_cache.put(question, None, None, False, verdict.reasoning)
         print("I can't help with that question.")
         print("Reason: This doesn't appear to be a homework question.")
         print("Please ask me about your school assignments, math problems,")
@@ -164,19 +589,70 @@ async def handle_homework_question(question):
         
     except Exception as e:
         # Catch any other unexpected errors
+        record_error(e)
         print("An unexpected error occurred:")
         print(f"Error type: {type(e).__name__}")
         print(f"Error message: {str(e)}")
+        if trace_processor is not None:
+            print(f"Full details were recorded in {trace_processor.path}")
         print("Please try rephrasing your question or try again later.")
         return False
 
+# Optional Chrome trace processor, set by main() when the --trace option is used
+trace_processor = None
+
+def record_error(error):
+    """
+    Attach an exception, with its traceback, to the current tracing span.
+    
+    Args:
+        error (Exception): The exception being handled
+    """
+    span = get_current_span()
+    if span is not None:
+        span.set_error({
+            "message": str(error),
+            "data": {"type": type(error).__name__, "traceback": traceback.format_exc()},
+        })
+
+def print_session_reports():
+    """
+    Print the statistics of the optional fast paths that were enabled for this session.
+    """
+    for component in (fast_guardrail, question_router, answer_cache, trace_processor):
+        if component is not None:
+            print()
+            print(component.report())
+
 # Interactive main function for Q&A session (now async)
-async def main():
+async def main(speculative=False, fast=False, router=False, stream=False, cache=False, memory=False,
+               trace_path=None):
     """
     Interactive homework tutoring session.
     Continuously prompts user for questions until they choose to exit.
     Includes comprehensive error handling for various scenarios.
+    
+    Args:
+        speculative (bool): Run the guardrail in parallel with the answer for every question
+        fast (bool): Resolve the guardrail from caches or a local classifier when confident
+        router (bool): Dispatch straight to a specialist when the router is confident
+        stream (bool): Print answers as they are generated
+        cache (bool): Answer rephrased questions from the answer cache
+        memory (bool): Keep follow-up questions in context with bounded history
+        trace_path (str): Write a Chrome trace of every agent run to this file and
+            print per-stage latency percentiles at the end
     """
+    global fast_guardrail, question_router, answer_cache, session_memory, trace_processor
+    if fast:
+        fast_guardrail = TieredGuardrail(classify_homework_llm, HomeworkOutput)
+    if router:
+        question_router = QuestionRouter(direct_agents)
+    if cache:
+        answer_cache = AnswerCache()
+    if memory:
+        session_memory = SessionMemory(summarize_turns)
+    if trace_path is not None:
+        trace_processor = enable_tracing(trace_path)
     
     # Display welcome message and instructions
     print_welcome_message()
@@ -198,12 +674,19 @@ async def main():
             if is_exit_command(user_question):
                 print("\nThank you for using the Homework Tutoring System!")
                 print("Happy studying!")
+                print_session_reports()
+                if session_memory is not None:
+                    await session_memory.close()
+                if trace_processor is not None:
+                    trace_processor.write()
                 break
             
             print()  
             
             # Process the homework question (now with await)
-            await handle_homework_question(user_question)
+            # Group all agent runs for the question into one trace
+            with trace("Homework question"), custom_span("question", data={"question": user_question}):
+                await handle_homework_question(user_question, speculative=speculative, stream=stream)
             
             print()  
             
@@ -215,5 +698,32 @@ async def main():
 
 # Entry point - run the async interactive session when script is executed directly
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Interactive homework tutoring system")
+    parser.add_argument("--speculative", action="store_true",
+                        help="run the homework guardrail in parallel with the answer and show timings")
+    parser.add_argument("--fast-guardrail", action="store_true",
+                        help="answer the guardrail from a verdict cache or local classifier when confident")
+    parser.add_argument("--router", action="store_true",
+                        help="skip the triage agent when the question router is confident")
+    parser.add_argument("--stream", action="store_true",
+                        help="print answers token by token and show time-to-first-token")
+    parser.add_argument("--cache", action="store_true",
+                        help="answer repeated or rephrased questions from the answer cache")
+    parser.add_argument("--memory", action="store_true",
+                        help="remember the conversation so follow-up questions keep their context")
+    parser.add_argument("--trace", metavar="FILE", nargs="?", const="agent_trace.json",
+                        help="write a Chrome trace of every agent run (default agent_trace.json) "
+                             "and print per-stage latency percentiles on exit")
+    models = parser.add_mutually_exclusive_group()
+    models.add_argument("--offline", action="store_true",
+                        help="answer with a deterministic local stand-in model (no network or keys.txt)")
+    models.add_argument("--record", metavar="FILE",
+                        help="save every model response with its latency to a JSONL file for replay")
+    models.add_argument("--replay", metavar="FILE",
+                        help="answer from responses saved with --record, with their recorded latencies")
+    args = parser.parse_args()
+    select_model(offline=args.offline, record_path=args.record, replay_path=args.replay)
+
     # Start the interactive homework tutoring session using asyncio.run
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main(speculative=args.speculative, fast=args.fast_guardrail, router=args.router,
+                     stream=args.stream, cache=args.cache, memory=args.memory, trace_path=args.trace))
\ No newline at end of file
@@ -0,0 +1,102 @@
+# Evaluation harness for the question router
+# Replays a labelled question set through QuestionRouter, learning from each label
+# after it is routed (the same way the router learns from LLM triage in demo_agent.py),
+# and reports routing accuracy and coverage. Questions labelled with a null agent are
+# ones triage answers itself (not math or history); they should never be dispatched.
+# With --live it also runs every routed question both through LLM triage and directly
+# on the chosen specialist to measure the latency saved (needs keys.txt).
+#
+# Usage: python3 evaluate_router.py [questions.jsonl] [--live] [--min-confidence 0.85]
+import argparse
+import asyncio
+import json
+import time
+
+from question_router import QuestionRouter
+
+AGENT_NAMES = ["Math Tutor", "History Tutor"]
+
+
+def load_questions(path):
+    """
+    Read labelled questions from a JSONL file.
+
+    Returns:
+        list: (question, agent name or None for no specialist) tuples
+    """
+    questions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                questions.append((record["question"], record["agent"]))
+    return questions
+
+
+async def time_run(agent, question):
+    """Run one question on an agent and return (RunResult, seconds)."""
+    from agents import Runner
+
+    start = time.perf_counter()
+    result = await Runner.run(agent, question)
+    return result, time.perf_counter() - start
+
+
+async def evaluate(questions, min_confidence, live):
+    router = QuestionRouter(AGENT_NAMES, log_path=None, min_confidence=min_confidence)
+    if live:
+        import demo_agent  # only needed (and only needs keys.txt) for live runs
+        demo_agent.load_api_key()
+
+    routed = correct_routed = correct_any = off_topic = off_topic_routed = 0
+    route_seconds = 0.0
+    triage_seconds = direct_seconds = 0.0
+    for question, expected in questions:
+        start = time.perf_counter()
+        name, confidence, tier = router.route(question)
+        route_seconds += time.perf_counter() - start
+        guess = name if name is not None else router.predict(question)[0]
+        correct_any += guess == expected
+        off_topic += expected is None
+        if name is not None:
+            routed += 1
+            correct_routed += name == expected
+            off_topic_routed += expected is None
+        status = "OK " if guess == expected else "BAD"
+        print(f"{status} {tier:<12} {confidence:4.0%}  {guess or 'triage':<14} {question}")
+
+        if live and name is not None:
+            _, triage_time = await time_run(demo_agent.unguarded_triage_agent, question)
+            _, direct_time = await time_run(demo_agent.direct_agents[name][1], question)
+            triage_seconds += triage_time
+            direct_seconds += direct_time
+            print(f"    triage path {triage_time:.2f}s, direct {direct_time:.2f}s")
+        router.learn(question, expected, log=False)
+
+    total = len(questions)
+    print()
+    print(f"Questions:            {total}")
+    print(f"Dispatched directly:  {routed} ({routed / total:.0%})")
+    if routed:
+        print(f"Direct accuracy:      {correct_routed}/{routed} ({correct_routed / routed:.0%})")
+    print(f"Best-guess accuracy:  {correct_any}/{total} ({correct_any / total:.0%})")
+    if off_topic:
+        print(f"Off-topic dispatched: {off_topic_routed}/{off_topic} (should be 0)")
+    print(f"Avg routing latency:  {route_seconds / total * 1000:.3f} ms")
+    if live and routed:
+        saved = triage_seconds - direct_seconds
+        print(f"Avg triage path:      {triage_seconds / routed:.2f}s")
+        print(f"Avg direct dispatch:  {direct_seconds / routed:.2f}s")
+        print(f"Latency saved:        {saved:.2f}s total, {saved / routed:.2f}s per routed question")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the direct-dispatch question router")
+    parser.add_argument("questions", nargs="?", default="router_eval_questions.jsonl",
+                        help="JSONL file with 'question' and 'agent' fields")
+    parser.add_argument("--live", action="store_true",
+                        help="also measure triage vs direct latency with real model calls")
+    parser.add_argument("--min-confidence", type=float, default=0.85,
+                        help="routes below this confidence fall back to LLM triage")
+    args = parser.parse_args()
+    asyncio.run(evaluate(load_questions(args.questions), args.min_confidence, args.live))
@@ -0,0 +1,218 @@
+# Tiered homework guardrail
+# Answers "is this homework?" locally whenever possible and only asks the LLM
+# guardrail agent when the local tiers are not confident:
+#   1. exact_cache      - the same question was classified before
+#   2. normalized_cache - the same question up to case, punctuation and spacing
+#   3. local_model      - a Naive Bayes model trained on logged verdicts
+#   4. llm              - the guardrail agent (its verdict is logged and learned from)
+import json
+import math
+import os
+import re
+import time
+
+# Words that strongly suggest an academic question
+ACADEMIC_KEYWORDS = {
+    "solve", "equation", "calculate", "derivative", "integral", "algebra", "geometry",
+    "theorem", "proof", "fraction", "percentage", "probability", "formula", "simplify",
+    "factor", "graph", "function", "matrix", "homework", "assignment", "exam", "essay",
+    "history", "historical", "war", "revolution", "empire", "century", "president",
+    "dynasty", "treaty", "civilization", "ancient", "colonial", "independence",
+}
+# Simple arithmetic or algebra such as "2x + 5 = 15"
+MATH_PATTERN = re.compile(r"\d\s*[a-z]?\s*[-+*/^=]\s*\d|[a-z]\s*\^\s*\d")
+
+
+def normalize(text):
+    """
+    Normalize a question for cache lookups: lowercase, drop punctuation, collapse spaces.
+
+    Args:
+        text (str): The user's question
+
+    Returns:
+        str: The normalized question
+    """
+    text = re.sub(r"[^\w\s^+\-*/=]", " ", text.lower())
+    return " ".join(text.split())
+
+
+def tokenize(text):
+    return re.findall(r"[a-z]+|\d+", text.lower())
+
+
+class LocalClassifier:
+    """
+    Multinomial Naive Bayes over words, trained incrementally from logged LLM verdicts.
+    Falls back to keyword rules until it has seen enough examples of both classes.
+    Keyword rules are too easy to fool ("write my resume 1+1") to decide on their own:
+    their confidence stays below the guardrail threshold, so those questions go to the LLM.
+    """
+
+    def __init__(self, min_examples=200):
+        self.min_examples = min_examples
+        self.word_counts = {True: {}, False: {}}
+        self.total_words = {True: 0, False: 0}
+        self.documents = {True: 0, False: 0}
+        self.vocabulary = set()
+
+    def learn(self, question, is_homework):
+        """Add one labelled question to the model."""
+        counts = self.word_counts[is_homework]
+        for word in tokenize(question):
+            counts[word] = counts.get(word, 0) + 1
+            self.total_words[is_homework] += 1
+            self.vocabulary.add(word)
+        self.documents[is_homework] += 1
+
+    def is_trained(self):
+        return min(self.documents.values()) >= self.min_examples
+
+    def predict(self, question):
+        """
+        Classify a question locally.
+
+        Returns:
+            tuple: (is_homework, confidence between 0 and 1, reasoning)
+        """
+        if self.is_trained():
+            return self.predict_bayes(question)
+        return self.predict_keywords(question)
+
+    def predict_keywords(self, question):
+        words = set(tokenize(question))
+        hits = words & ACADEMIC_KEYWORDS
+        if MATH_PATTERN.search(question.lower()):
+            return True, 0.8, "Looks like a math problem."
+        if len(hits) >= 2:
+            return True, 0.75, f"Mentions academic topics: {', '.join(sorted(hits))}."
+        return True, 0.5, "No strong academic signal."
+
+    def predict_bayes(self, question):
+        total_documents = sum(self.documents.values())
+        vocabulary_size = len(self.vocabulary) + 1
+        scores = {}
+        for label in (True, False):
+            score = math.log(self.documents[label] / total_documents)
+            counts = self.word_counts[label]
+            denominator = self.total_words[label] + vocabulary_size
+            for word in tokenize(question):
+                score += math.log((counts.get(word, 0) + 1) / denominator)
+            scores[label] = score
+        # Convert the two log scores into a probability for the homework class
+        difference = max(min(scores[False] - scores[True], 700), -700)
+        probability = 1 / (1 + math.exp(difference))
+        is_homework = probability >= 0.5
+        confidence = probability if is_homework else 1 - probability
+        return is_homework, confidence, f"Local model ({confidence:.0%} confident)."
+
+
+class TieredGuardrail:
+    """
+    Homework guardrail that tries the verdict caches and the local classifier before the LLM.
+    Every LLM verdict is appended to a JSONL log, which seeds the caches and trains the
+    local classifier the next time the guardrail is created.
+    """
+
+    TIERS = ["exact_cache", "normalized_cache", "local_model", "llm"]
+
+    def __init__(self, llm_classify, output_type, log_path="guardrail_verdicts.jsonl",
+                 min_confidence=0.99):
+        """
+        Args:
+            llm_classify: async function (question, context) returning an object with
+                is_homework and reasoning attributes
+            output_type: Class used to build verdicts from the local tiers (HomeworkOutput)
+            log_path (str): JSONL file of past LLM verdicts
+            min_confidence (float): Local predictions below this confidence go to the LLM.
+                Naive Bayes is overconfident, so this is kept strict
+        """
+        self.llm_classify = llm_classify
+        self.output_type = output_type
+        self.log_path = log_path
+        self.min_confidence = min_confidence
+        self.exact = {}
+        self.normalized = {}
+        self.model = LocalClassifier()
+        self.stats = {tier: [0, 0.0] for tier in self.TIERS}  # tier -> [count, seconds]
+        self.load_log()
+
+    def load_log(self):
+        if not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    self.remember(record["question"], record["is_homework"], record["reasoning"])
+                except (ValueError, KeyError):
+                    continue  # skip damaged lines
+
+    def remember(self, question, is_homework, reasoning):
+        verdict = (is_homework, reasoning)
+        self.exact[question] = verdict
+        self.normalized[normalize(question)] = verdict
+        self.model.learn(question, is_homework)
+
+    def record(self, tier, start):
+        self.stats[tier][0] += 1
+        self.stats[tier][1] += time.perf_counter() - start
+
+    async def classify(self, question, context=None):
+        """
+        Decide whether a question is homework, using the cheapest tier that is confident.
+
+        Args:
+            question: The user's input (non-text input always goes to the LLM)
+            context: Optional context passed through to the LLM classifier
+
+        Returns:
+            tuple: (verdict of output_type, name of the tier that decided)
+        """
+        start = time.perf_counter()
+        if isinstance(question, str):
+            verdict = self.exact.get(question)
+            if verdict is not None:
+                self.record("exact_cache", start)
+                return self.output_type(is_homework=verdict[0], reasoning=verdict[1]), "exact_cache"
+
+            verdict = self.normalized.get(normalize(question))
+            if verdict is not None:
+                self.record("normalized_cache", start)
+                return self.output_type(is_homework=verdict[0], reasoning=verdict[1]), "normalized_cache"
+
+            is_homework, confidence, reasoning = self.model.predict(question)
+            if confidence >= self.min_confidence:
+                self.record("local_model", start)
+                return self.output_type(is_homework=is_homework, reasoning=reasoning), "local_model"
+
+        verdict = await self.llm_classify(question, context)
+        self.record("llm", start)
+        if isinstance(question, str):
+            self.remember(question, verdict.is_homework, verdict.reasoning)
+            self.append_log(question, verdict)
+        return verdict, "llm"
+
+    def append_log(self, question, verdict):
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            record = {"question": question, "is_homework": verdict.is_homework, "reasoning": verdict.reasoning}
+            f.write(json.dumps(record) + "\n")
+
+    def report(self):
+        """
+        Summarize how questions were resolved.
+
+        Returns:
+            str: Multi-line report with the share of questions resolved locally
+            and the count and average latency of each tier
+        """
+        total = sum(count for count, _ in self.stats.values())
+        if total == 0:
+            return "Guardrail: no questions classified."
+        local = total - self.stats["llm"][0]
+        lines = [f"Guardrail: {local}/{total} questions ({local / total:.0%}) resolved without the LLM"]
+        for tier in self.TIERS:
+            count, seconds = self.stats[tier]
+            average = seconds / count * 1000 if count else 0.0
+            lines.append(f"  {tier:<17} {count:>5} questions, avg {average:8.2f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,335 @@
+# Local stand-in models for running the homework agents without network access
+#   - LocalModel     - deterministic rule-based model: answers the guardrail with keyword
+#                      rules, hands triage off by subject keywords and writes a canned answer.
+#                      Latency is simulated, so orchestration overhead can be measured on its own.
+#   - RecordingModel - wraps a real model and saves every response (with its latency) to a JSONL file
+#   - ReplayModel    - plays recorded responses back with their recorded latencies
+# All three implement the Model interface of the agents library, so they can be set as
+# `agent.model` and used with Runner.run and Runner.run_streamed like the OpenAI models.
+import asyncio
+import hashlib
+import json
+import os
+import time
+
+from agents.items import ModelResponse
+from agents.models.interface import Model
+from agents.usage import Usage
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseCreatedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputItem,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+    ResponseUsage,
+)
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+from pydantic import TypeAdapter
+
+from homework_classifier import ACADEMIC_KEYWORDS, MATH_PATTERN, tokenize
+from question_router import SUBJECT_KEYWORDS
+from session_memory import estimate_tokens
+
+# Parses recorded output items back into the openai response types
+OUTPUT_ITEM = TypeAdapter(ResponseOutputItem)
+
+
+def last_user_text(input_data):
+    """
+    The text of the latest user message in a model input.
+
+    Args:
+        input_data: A string or a list of input items
+
+    Returns:
+        str: The user's text ("" if there is none)
+    """
+    if isinstance(input_data, str):
+        return input_data
+    for item in reversed(input_data):
+        if isinstance(item, dict) and item.get("role") == "user":
+            content = item.get("content")
+            if isinstance(content, str):
+                return content
+            return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def is_homework(question):
+    """Keyword rule for the stand-in guardrail: math expressions or academic words are homework."""
+    words = set(tokenize(question))
+    subject_words = set().union(*SUBJECT_KEYWORDS.values())
+    return bool(MATH_PATTERN.search(question.lower()) or words & (ACADEMIC_KEYWORDS | subject_words))
+
+
+def fill_schema(schema, question):
+    """
+    Build a JSON object for a structured output schema: booleans get the homework
+    verdict, strings get a short reasoning and numbers get 0.
+    """
+    verdict = is_homework(question)
+    values = {"boolean": verdict, "string": "Homework keywords found." if verdict else "No homework keywords.",
+              "integer": 0, "number": 0}
+    properties = schema.get("properties", {})
+    return {name: values.get(spec.get("type")) for name, spec in properties.items()}
+
+
+def pick_handoff(handoffs, question):
+    """Pick the handoff whose agent's subject keywords best match the question."""
+    words = set(tokenize(question))
+
+    def score(handoff):
+        hits = len(words & SUBJECT_KEYWORDS.get(handoff.agent_name, set()))
+        if handoff.agent_name == "Math Tutor" and MATH_PATTERN.search(question.lower()):
+            hits += 2
+        return hits
+
+    return max(handoffs, key=score)
+
+
+def text_message(text, item_id):
+    return ResponseOutputMessage(
+        id=item_id, type="message", role="assistant", status="completed",
+        content=[ResponseOutputText(type="output_text", text=text, annotations=[])],
+    )
+
+
+def message_text(item):
+    """The text of an output message item, or None for other items (e.g. handoff calls)."""
+    if getattr(item, "type", None) != "message":
+        return None
+    return "".join(getattr(part, "text", "") for part in item.content)
+
+
+async def stream_output(output, usage, response_id, chunk_delay=0.0):
+    """
+    Yield the stream events of a finished response: created, one text delta per word,
+    then completed (which the runner turns into the final ModelResponse).
+    """
+    base = dict(id=response_id, created_at=time.time(), model="local", object="response",
+                tool_choice="auto", tools=[], top_p=None, parallel_tool_calls=False)
+    sequence = 0
+    yield ResponseCreatedEvent(type="response.created", sequence_number=sequence,
+                               response=Response(output=[], **base))
+    for index, item in enumerate(output):
+        text = message_text(item)
+        if text is None:
+            continue
+        words = text.split(" ")
+        for position, word in enumerate(words):
+            if chunk_delay:
+                await asyncio.sleep(chunk_delay)
+            sequence += 1
+            delta = word if position == len(words) - 1 else word + " "
+            yield ResponseTextDeltaEvent(type="response.output_text.delta", item_id=item.id,
+                                         output_index=index, content_index=0, delta=delta,
+                                         logprobs=[], sequence_number=sequence)
+    sequence += 1
+    # Built without validation because the required detail fields differ between openai versions
+    response_usage = ResponseUsage.model_construct(
+        input_tokens=usage.input_tokens, output_tokens=usage.output_tokens, total_tokens=usage.total_tokens,
+        input_tokens_details=InputTokensDetails.model_construct(cached_tokens=0, cache_write_tokens=0),
+        output_tokens_details=OutputTokensDetails.model_construct(reasoning_tokens=0),
+    )
+    yield ResponseCompletedEvent(type="response.completed", sequence_number=sequence,
+                                 response=Response(output=output, usage=response_usage, **base))
+
+
+class LocalModel(Model):
+    """
+    Deterministic stand-in for an OpenAI model. The same input always gives the same output.
+    """
+
+    def __init__(self, latency=0.0, seconds_per_token=0.0, answer_words=60):
+        """
+        Args:
+            latency (float): Simulated seconds before the first token of every call
+            seconds_per_token (float): Simulated seconds per output token
+            answer_words (int): Length of the canned tutor answers
+        """
+        self.latency = latency
+        self.seconds_per_token = seconds_per_token
+        self.answer_words = answer_words
+        self.calls = 0
+        self.simulated_seconds = 0.0  # total simulated model time, to separate it from overhead
+
+    def respond(self, system_instructions, input_data, output_schema, handoffs):
+        question = last_user_text(input_data)
+        digest = hashlib.sha1(f"{system_instructions}|{question}".encode("utf-8")).hexdigest()[:12]
+        if output_schema is not None and not output_schema.is_plain_text():
+            output = [text_message(json.dumps(fill_schema(output_schema.json_schema(), question)), f"msg_{digest}")]
+        elif handoffs:
+            handoff = pick_handoff(handoffs, question)
+            output = [ResponseFunctionToolCall(id=f"fc_{digest}", call_id=f"call_{digest}", type="function_call",
+                                               name=handoff.tool_name, arguments="{}")]
+        else:
+            filler = ("First restate what is asked, then work through it one step at a time "
+                      "and check the result at the end.").split()
+            words = [filler[i % len(filler)] for i in range(self.answer_words)]
+            output = [text_message(f"Answer to '{question}': " + " ".join(words), f"msg_{digest}")]
+        input_tokens = estimate_tokens((system_instructions or "") + json.dumps(input_data, default=str))
+        output_tokens = sum(estimate_tokens(message_text(item) or item.arguments) for item in output)
+        usage = Usage(requests=1, input_tokens=input_tokens, output_tokens=output_tokens,
+                      total_tokens=input_tokens + output_tokens)
+        return output, usage, f"resp_{digest}"
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema,
+                           handoffs, tracing, **kwargs):
+        output, usage, response_id = self.respond(system_instructions, input, output_schema, handoffs)
+        delay = self.latency + usage.output_tokens * self.seconds_per_token
+        self.calls += 1
+        self.simulated_seconds += delay
+        if delay:
+            await asyncio.sleep(delay)
+        return ModelResponse(output=output, usage=usage, response_id=response_id)
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema,
+                              handoffs, tracing, **kwargs):
+        output, usage, response_id = self.respond(system_instructions, input, output_schema, handoffs)
+        self.calls += 1
+        self.simulated_seconds += self.latency + usage.output_tokens * self.seconds_per_token
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        # Spread the token time over the streamed words
+        words = sum(len((message_text(item) or "").split(" ")) for item in output) or 1
+        chunk_delay = usage.output_tokens * self.seconds_per_token / words
+        async for event in stream_output(output, usage, response_id, chunk_delay):
+            yield event
+
+
+def without_nones(value):
+    """Drop None fields, which differ between live items and items parsed back from a recording."""
+    if isinstance(value, dict):
+        return {key: without_nones(item) for key, item in value.items() if item is not None}
+    if isinstance(value, list):
+        return [without_nones(item) for item in value]
+    return value
+
+
+def request_key(system_instructions, input_data, output_schema, handoffs):
+    """Hash identifying a model request, used to match recorded responses."""
+    request = [system_instructions, without_nones(input_data),
+               None if output_schema is None else output_schema.name(),
+               sorted(handoff.tool_name for handoff in handoffs)]
+    return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class RecordingModel(Model):
+    """
+    Passes every call to a real model and appends the response and its latency to a JSONL file.
+    """
+
+    def __init__(self, model, path="recorded_responses.jsonl"):
+        """
+        Args:
+            model (Model): The real model, e.g. OpenAIProvider().get_model(None)
+            path (str): JSONL file responses are appended to
+        """
+        self.model = model
+        self.path = path
+
+    def save(self, key, output, usage, latency):
+        record = {"key": key, "latency": round(latency, 4),
+                  "output": [item.model_dump(mode="json", exclude_none=True) for item in output],
+                  "usage": {"input_tokens": usage.input_tokens, "output_tokens": usage.output_tokens}}
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema,
+                           handoffs, tracing, **kwargs):
+        start = time.perf_counter()
+        response = await self.model.get_response(system_instructions, input, model_settings, tools,
+                                                 output_schema, handoffs, tracing, **kwargs)
+        self.save(request_key(system_instructions, input, output_schema, handoffs),
+                  response.output, response.usage, time.perf_counter() - start)
+        return response
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema,
+                              handoffs, tracing, **kwargs):
+        start = time.perf_counter()
+        async for event in self.model.stream_response(system_instructions, input, model_settings, tools,
+                                                      output_schema, handoffs, tracing, **kwargs):
+            if isinstance(event, ResponseCompletedEvent):
+                self.save(request_key(system_instructions, input, output_schema, handoffs),
+                          event.response.output, event.response.usage, time.perf_counter() - start)
+            yield event
+
+
+class ReplayModel(Model):
+    """
+    Answers calls from a file written by RecordingModel, waiting the recorded latency.
+    A request that was recorded several times is answered with each recording in turn.
+    """
+
+    def __init__(self, path="recorded_responses.jsonl", time_scale=1.0, fallback=None):
+        """
+        Args:
+            path (str): JSONL file written by RecordingModel
+            time_scale (float): Multiplier for the recorded latencies (0 replays instantly)
+            fallback (Model): Model for requests that were never recorded (None raises LookupError)
+        """
+        self.time_scale = time_scale
+        self.fallback = fallback
+        self.recordings = {}  # request key -> list of records
+        self.next_index = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # a line cut short while recording
+                    self.recordings.setdefault(record["key"], []).append(record)
+        self.calls = 0
+        self.simulated_seconds = 0.0
+
+    def lookup(self, system_instructions, input_data, output_schema, handoffs):
+        key = request_key(system_instructions, input_data, output_schema, handoffs)
+        records = self.recordings.get(key)
+        if not records:
+            return None
+        index = self.next_index.get(key, 0)
+        self.next_index[key] = (index + 1) % len(records)
+        record = records[index]
+        output = [OUTPUT_ITEM.validate_python(item) for item in record["output"]]
+        usage = Usage(requests=1, input_tokens=record["usage"]["input_tokens"],
+                      output_tokens=record["usage"]["output_tokens"],
+                      total_tokens=record["usage"]["input_tokens"] + record["usage"]["output_tokens"])
+        self.calls += 1
+        self.simulated_seconds += record["latency"] * self.time_scale
+        return output, usage, record["latency"] * self.time_scale, f"resp_{key[:12]}"
+
+    def missing(self):
+        return LookupError("No recorded response for this request; record it first with RecordingModel")
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema,
+                           handoffs, tracing, **kwargs):
+        found = self.lookup(system_instructions, input, output_schema, handoffs)
+        if found is None:
+            if self.fallback is None:
+                raise self.missing()
+            return await self.fallback.get_response(system_instructions, input, model_settings, tools,
+                                                    output_schema, handoffs, tracing, **kwargs)
+        output, usage, delay, response_id = found
+        if delay:
+            await asyncio.sleep(delay)
+        return ModelResponse(output=output, usage=usage, response_id=response_id)
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema,
+                              handoffs, tracing, **kwargs):
+        found = self.lookup(system_instructions, input, output_schema, handoffs)
+        if found is None:
+            if self.fallback is None:
+                raise self.missing()
+            async for event in self.fallback.stream_response(system_instructions, input, model_settings, tools,
+                                                             output_schema, handoffs, tracing, **kwargs):
+                yield event
+            return
+        output, usage, delay, response_id = found
+        # Recordings keep only the total latency, so it is spread evenly over the words
+        words = sum(len((message_text(item) or "").split(" ")) for item in output) or 1
+        async for event in stream_output(output, usage, response_id, delay / words):
+            yield event
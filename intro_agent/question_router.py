@@ -0,0 +1,186 @@
+# Direct-dispatch router for the triage agent
+# Picks the specialist tutor for a question locally so the triage agent's LLM turn
+# can be skipped. Uses, in order:
+#   1. memory      - the same (normalized) question was routed before
+#   2. local_model - Naive Bayes over words, trained on past question -> specialist outcomes,
+#                    with an "other" class for questions triage kept for itself
+#   3. keywords    - subject keywords, used until the model has enough examples
+# When none of them is confident the caller falls back to LLM triage and teaches
+# the router the specialist the triage agent picked (or that it picked none).
+# The model only dispatches questions made mostly of words it has seen for that
+# specialist, so an off-topic question is never sent to whichever subject is the
+# less unlikely of the two.
+import json
+import math
+import os
+
+from homework_classifier import MATH_PATTERN, normalize, tokenize
+
+SUBJECT_KEYWORDS = {
+    "Math Tutor": {
+        "solve", "equation", "calculate", "derivative", "integral", "algebra", "geometry",
+        "theorem", "proof", "fraction", "percentage", "probability", "formula", "simplify",
+        "factor", "graph", "matrix", "sum", "product", "square", "root", "angle", "triangle",
+        "area", "volume", "multiply", "divide", "prime", "math", "maths", "mathematics",
+    },
+    "History Tutor": {
+        "history", "historical", "war", "revolution", "empire", "century", "president",
+        "dynasty", "treaty", "civilization", "ancient", "colonial", "independence", "king",
+        "queen", "emperor", "battle", "kingdom", "medieval", "founded", "reign", "invasion",
+    },
+}
+
+# Class of the questions the triage agent answered without handing off
+OTHER = "other"
+
+
+class QuestionRouter:
+    """
+    Routes questions straight to a specialist when confident, learning from LLM triage outcomes.
+    Past outcomes are appended to a JSONL log and replayed when the router is created.
+    """
+
+    def __init__(self, agent_names, log_path="routing_memory.jsonl", min_confidence=0.85,
+                 min_examples=5, min_known=0.75):
+        """
+        Args:
+            agent_names (list): Names of the specialist agents that can be dispatched to
+            log_path (str): JSONL file of past question -> specialist outcomes (None to disable)
+            min_confidence (float): Routes below this confidence fall back to LLM triage
+            min_examples (int): Examples needed per specialist before the model replaces keywords
+            min_known (float): Share of a question's words the model must have seen for the
+                chosen specialist; the confidence is capped at this share
+        """
+        self.agent_names = list(agent_names)
+        self.log_path = log_path
+        self.min_confidence = min_confidence
+        self.min_examples = min_examples
+        self.min_known = min_known
+        self.memory = {}
+        classes = self.agent_names + [OTHER]
+        self.word_counts = {name: {} for name in classes}
+        self.total_words = {name: 0 for name in classes}
+        self.documents = {name: 0 for name in classes}
+        self.vocabulary = set()
+        self.stats = {"memory": 0, "local_model": 0, "keywords": 0, "triage": 0}
+        self.load_log()
+
+    def load_log(self):
+        if self.log_path is None or not os.path.exists(self.log_path):
+            return
+        with open(self.log_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    self.learn(record["question"], record["agent"], log=False)
+                except (ValueError, KeyError):
+                    continue  # skip damaged lines
+
+    def learn(self, question, agent_name, log=True):
+        """
+        Remember which specialist handled a question.
+
+        Args:
+            question (str): The user's question
+            agent_name (str): Name of the specialist that answered it, or of any other
+                agent (or None) when triage did not hand the question off
+            log (bool): Also append the outcome to the log file
+        """
+        label = agent_name if agent_name in self.agent_names else OTHER
+        self.memory[normalize(question)] = label
+        counts = self.word_counts[label]
+        for word in tokenize(question):
+            counts[word] = counts.get(word, 0) + 1
+            self.total_words[label] += 1
+            self.vocabulary.add(word)
+        self.documents[label] += 1
+        if log and self.log_path is not None:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"question": question, "agent": agent_name}) + "\n")
+
+    def predict(self, question):
+        """
+        Best local guess for a question, whether or not it is confident.
+
+        Returns:
+            tuple: (agent name or None, confidence between 0 and 1, tier name)
+        """
+        remembered = self.memory.get(normalize(question))
+        if remembered is not None:
+            return (None if remembered == OTHER else remembered), 1.0, "memory"
+        if min(self.documents[name] for name in self.agent_names) >= self.min_examples:
+            return self.predict_bayes(question) + ("local_model",)
+        return self.predict_keywords(question) + ("keywords",)
+
+    def route(self, question):
+        """
+        Pick a specialist for a question, or None to use LLM triage.
+
+        Returns:
+            tuple: (agent name or None, confidence, tier name or "triage")
+        """
+        if not isinstance(question, str):
+            self.stats["triage"] += 1
+            return None, 0.0, "triage"
+        name, confidence, tier = self.predict(question)
+        if name is None or confidence < self.min_confidence:
+            self.stats["triage"] += 1
+            return None, confidence, "triage"
+        self.stats[tier] += 1
+        return name, confidence, tier
+
+    def predict_keywords(self, question):
+        words = set(tokenize(question))
+        hits = {name: len(words & keywords) for name, keywords in SUBJECT_KEYWORDS.items()
+                if name in self.agent_names}
+        if "Math Tutor" in hits and MATH_PATTERN.search(question.lower()):
+            hits["Math Tutor"] += 2
+        ranked = sorted(hits.items(), key=lambda item: item[1], reverse=True)
+        if not ranked or ranked[0][1] == 0:
+            return None, 0.0
+        if len(ranked) > 1 and ranked[1][1] > 0:
+            return ranked[0][0], 0.6  # keywords from more than one subject
+        return ranked[0][0], 0.9 if ranked[0][1] >= 2 else 0.85
+
+    def predict_bayes(self, question):
+        total_documents = sum(self.documents.values())
+        vocabulary_size = len(self.vocabulary) + 1
+        words = tokenize(question)
+        scores = {}
+        for name, documents in self.documents.items():
+            if documents == 0:
+                continue  # no questions of this kind yet (usually "other")
+            score = math.log(documents / total_documents)
+            counts = self.word_counts[name]
+            denominator = self.total_words[name] + vocabulary_size
+            for word in words:
+                score += math.log((counts.get(word, 0) + 1) / denominator)
+            scores[name] = score
+        # Softmax over the log scores to get the probability of the best class
+        best = max(scores, key=scores.get)
+        total = sum(math.exp(score - scores[best]) for score in scores.values())
+        confidence = 1 / total
+        if best == OTHER:
+            return None, confidence
+        # With only a few classes one of them always looks likely; a question made
+        # of words never seen for that specialist is not confidently theirs
+        known = sum(word in self.word_counts[best] for word in words) / len(words) if words else 0.0
+        if known < self.min_known:
+            confidence = min(confidence, known)
+        return best, confidence
+
+    def report(self):
+        """
+        Summarize how questions were routed.
+
+        Returns:
+            str: Share of questions dispatched directly and the count per tier
+        """
+        total = sum(self.stats.values())
+        if total == 0:
+            return "Router: no questions routed."
+        direct = total - self.stats["triage"]
+        lines = [f"Router: {direct}/{total} questions ({direct / total:.0%}) dispatched without LLM triage"]
+        for tier, count in self.stats.items():
+            lines.append(f"  {tier:<12} {count:>5} questions")
+        return "\n".join(lines)
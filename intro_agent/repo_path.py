@@ -0,0 +1,13 @@
+# Makes the shared packages in the repository root (llm_client) importable
+# Scripts in this folder are run directly (python3 demo_agent.py), so the repository
+# root is not on sys.path. Call add_repository_root() before importing llm_client.
+import os
+import sys
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def add_repository_root():
+    """Put the repository root on sys.path (once)."""
+    if REPOSITORY_ROOT not in sys.path:
+        sys.path.insert(0, REPOSITORY_ROOT)
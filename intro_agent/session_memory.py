@@ -0,0 +1,145 @@
+# Conversation memory for the homework tutoring session
+# Keeps follow-up questions ("now explain step 2") in context without resending the
+# whole session: the prompt for each turn is
+#   [summary of older turns] + [the most recent turns] + [the new question]
+# Recent turns are kept in a sliding window limited by a turn count and a token budget.
+# Turns that fall out of the window are folded into the summary by a background task,
+# so summarizing never delays the next answer. Until they are in the summary, those turns
+# are still sent, with their answers shortened. If summarizing keeps failing, it is retried
+# with exponential backoff and only the newest of those turns are kept, so the prompt
+# stays bounded either way.
+import asyncio
+import time
+
+MAX_RETRY_SECONDS = 60
+
+
+def estimate_tokens(text):
+    """
+    Rough token count (about four characters per token for English text).
+
+    Args:
+        text (str): Any text
+
+    Returns:
+        int: Estimated number of tokens
+    """
+    return max(1, len(text) // 4)
+
+
+class SessionMemory:
+    """
+    Sliding window of recent turns plus a rolling summary of older ones.
+    """
+
+    def __init__(self, summarize, max_turns=4, token_budget=1500, summary_budget=300):
+        """
+        Args:
+            summarize: async function (previous summary, list of (question, answer) turns)
+                returning the new summary text
+            max_turns (int): Most recent turns sent with every question, and most turns
+                waiting to be summarized
+            token_budget (int): Maximum estimated tokens of history (summary + recent turns),
+                and of the turns waiting to be summarized
+            summary_budget (int): Maximum estimated tokens of the summary itself
+        """
+        self.summarize = summarize
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.turns = []  # (question, answer) pairs in the window, oldest first
+        self.summary = ""
+        self.pending = []  # turns that left the window and are not summarized yet
+        self.summary_task = None
+        self.failures = 0  # summarize errors in a row
+        self.retry_at = 0.0  # time.monotonic() before which summarizing is not retried
+        self.last_prompt_tokens = 0
+
+    def has_context(self):
+        return bool(self.turns or self.summary or self.pending)
+
+    def build_input(self, question):
+        """
+        Build the model input for a new question.
+
+        Args:
+            question (str): The user's new question
+
+        Returns:
+            str or list: The question itself when there is no history yet,
+            otherwise a list of input messages ending with the question
+        """
+        if not self.has_context():
+            self.last_prompt_tokens = estimate_tokens(question)
+            return question
+        items = []
+        if self.summary:
+            items.append({"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"})
+        # Turns still waiting to be summarized, cut to the size of the summary
+        for previous_question, answer in self.pending:
+            items.append({"role": "user", "content": previous_question})
+            items.append({"role": "assistant", "content": self.shorten(answer)})
+        for previous_question, answer in self.turns:
+            items.append({"role": "user", "content": previous_question})
+            items.append({"role": "assistant", "content": answer})
+        items.append({"role": "user", "content": question})
+        self.last_prompt_tokens = sum(estimate_tokens(item["content"]) for item in items)
+        return items
+
+    def shorten(self, answer):
+        return answer[:self.summary_budget * 4]
+
+    def pending_tokens(self):
+        return sum(estimate_tokens(question) + estimate_tokens(self.shorten(answer))
+                   for question, answer in self.pending)
+
+    def history_tokens(self):
+        total = estimate_tokens(self.summary) if self.summary else 0
+        for question, answer in self.turns:
+            total += estimate_tokens(question) + estimate_tokens(answer)
+        return total
+
+    def add_turn(self, question, answer):
+        """
+        Record a finished turn and move old turns out of the window if needed.
+
+        Args:
+            question (str): The user's question
+            answer (str): The final answer
+        """
+        self.turns.append((question, answer))
+        # Always keep the newest turn, even if it alone is over budget
+        while len(self.turns) > 1 and (len(self.turns) > self.max_turns
+                                       or self.history_tokens() > self.token_budget):
+            self.pending.append(self.turns.pop(0))
+        # While summarizing fails, drop the oldest waiting turns rather than grow the prompt
+        while len(self.pending) > 1 and (len(self.pending) > self.max_turns
+                                         or self.pending_tokens() > self.token_budget):
+            self.pending.pop(0)
+        if (self.pending and (self.summary_task is None or self.summary_task.done())
+                and time.monotonic() >= self.retry_at):
+            self.summary_task = asyncio.create_task(self.update_summary())
+
+    async def update_summary(self):
+        # Keep folding pending turns into the summary until none are left. They stay in
+        # pending (and so in the prompt) until the summary that covers them is stored
+        while self.pending:
+            turns = list(self.pending)
+            try:
+                summary = await self.summarize(self.summary, turns)
+            except Exception:
+                # Try again after a later turn, waiting longer after every failure
+                self.failures += 1
+                self.retry_at = time.monotonic() + min(2 ** self.failures, MAX_RETRY_SECONDS)
+                return
+            self.failures = 0
+            # Hard cap so the summary cannot grow without bound
+            self.summary = summary[:self.summary_budget * 4]
+            # Old turns may have been dropped from pending meanwhile
+            self.pending = [turn for turn in self.pending if turn not in turns]
+
+    async def close(self):
+        """Stop any summarization still running in the background."""
+        if self.summary_task is not None and not self.summary_task.done():
+            self.summary_task.cancel()
+            await asyncio.gather(self.summary_task, return_exceptions=True)
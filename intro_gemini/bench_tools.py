@@ -0,0 +1,79 @@
+# Benchmark of the tutorial08 tool calls against the local stub APIs (no network or keys needed)
+# Simulates model turns that each ask for several function calls and compares:
+#   sequential - one call after another, a new connection each time, no cache (the old loop)
+#   registry   - the calls of a turn in parallel over the pooled session, with the TTL caches
+#
+# Usage: python3 -m intro_gemini.bench_tools [--turns 20] [--calls-per-turn 4] [--names 10] [--delay 0.1]
+from google.genai import types
+from intro_gemini import tutorial08
+from intro_gemini.stub_tool_server import start_stub_server
+import argparse
+import random
+import requests
+import time
+
+
+def make_turns(turns, calls_per_turn, names, seed=0):
+    """Function calls of each simulated model turn: mostly genderize over a few names, some cat facts."""
+    rng = random.Random(seed)
+    name_pool = [f"name{i}" for i in range(names)]
+    return [
+        [types.FunctionCall(name="get_cat_fact", args={}) if rng.random() < 0.25
+         else types.FunctionCall(name="get_gender", args={"name": rng.choice(name_pool)})
+         for _ in range(calls_per_turn)]
+        for _ in range(turns)
+    ]
+
+
+def sequential_call(urls, call):
+    if call.name == "get_cat_fact":
+        return requests.get(urls["cat_fact"], timeout=10).json()["fact"]
+    return requests.get(urls["genderize"], params={"name": call.args["name"]}, timeout=10).json()
+
+
+def run_sequential(turns, urls):
+    latencies = []
+    for calls in turns:
+        start = time.perf_counter()
+        for call in calls:
+            sequential_call(urls, call)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def run_registry(turns):
+    latencies = []
+    for calls in turns:
+        start = time.perf_counter()
+        tutorial08.registry.function_responses(calls)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tutorial08 tool calls against stub APIs")
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--calls-per-turn", type=int, default=4)
+    parser.add_argument("--names", type=int, default=10, help="distinct names asked about")
+    parser.add_argument("--delay", type=float, default=0.1, help="seconds each stub API request takes")
+    args = parser.parse_args()
+
+    server = start_stub_server(delay=args.delay)
+    urls = server.urls()
+    tutorial08.use_api_urls(urls)
+    turns = make_turns(args.turns, args.calls_per_turn, args.names)
+
+    print(f">>> {args.turns} turns x {args.calls_per_turn} function calls, stub API delay {args.delay:.2f}s")
+    for name, run in [("sequential", lambda: run_sequential(turns, urls)), ("registry", lambda: run_registry(turns))]:
+        before = sum(server.requests.values())
+        latencies = sorted(run())
+        requests_made = sum(server.requests.values()) - before
+        print(f"    {name:<11} total {sum(latencies):6.2f}s  p50/turn {latencies[len(latencies) // 2] * 1000:6.0f}ms  "
+              f"max/turn {latencies[-1] * 1000:6.0f}ms  HTTP requests {requests_made}")
+    print()
+    print(tutorial08.registry.report())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+# Shared chat loop for the Gemini tutorials
+# Answers are streamed, so text is printed as soon as the model produces it instead of
+# after the whole answer. The runner keeps the conversation history itself, and keeps
+# it small: when the prompt grows past a token budget, the older turns are summarized
+# (on a background thread, while the user types the next question) and the summary is
+# sent in the system instruction instead of those turns. After every answer the time
+# to first token, total time and prompt size are shown.
+from concurrent.futures import ThreadPoolExecutor
+from google.genai import types
+import time
+
+TOKEN_BUDGET = 8000  # prompt tokens a turn may use before older turns are summarized
+KEEP_TURNS = 4       # most recent question/answer pairs that are never summarized
+SUMMARY_PROMPT = """Summarize the conversation below for the assistant that will continue it.
+Keep names, facts, numbers, decisions and open questions; leave out pleasantries.
+Answer with the summary only, in at most 200 words."""
+
+
+def text_of(parts):
+    """Text of the parts of a response, without code, images or thoughts."""
+    return "".join(part.text for part in parts or [] if part.text and not part.thought)
+
+
+def format_stats(first_token_seconds, seconds, prompt_tokens, extra=""):
+    first = f"first token {first_token_seconds:.2f}s, " if first_token_seconds is not None else ""
+    return f"    ({first}total {seconds:.2f}s, prompt {prompt_tokens:,} tokens{extra})"
+
+
+class Turn:
+    """One answered message with its timing and token counts."""
+
+    def __init__(self, text, parts, first_token_seconds, seconds, prompt_tokens, output_tokens):
+        self.text = text
+        self.parts = parts  # every part of the answer, including code execution parts
+        self.first_token_seconds = first_token_seconds
+        self.seconds = seconds
+        self.prompt_tokens = prompt_tokens
+        self.output_tokens = output_tokens
+
+
+class ChatRunner:
+    """Streaming chat with a history that is compacted to a token budget."""
+
+    def __init__(self, client, model='gemini-2.0-flash', config=None, memory=True, token_budget=TOKEN_BUDGET,
+                 keep_turns=KEEP_TURNS, pinned_turns=0, summary_model=None):
+        """
+        config: GenerateContentConfig for every turn (system instruction, tools, ...)
+        memory: False to send every message on its own, without history
+        pinned_turns: first question/answer pairs that are never summarized (e.g. a persona message)
+        summary_model: model that writes the summaries (the chat model if None)
+        """
+        self.client = client
+        self.model = model
+        self.config = config or types.GenerateContentConfig()
+        self.memory = memory
+        self.token_budget = token_budget
+        self.keep_turns = keep_turns
+        self.pinned_turns = pinned_turns
+        self.summary_model = summary_model or model
+        self.history = []  # types.Content, a user and a model entry per turn
+        self.summary = None  # summary of the turns removed from history
+        self.compactor = ThreadPoolExecutor(max_workers=1)
+        self.compaction = None  # future of a running summarization
+        self.compaction_range = None  # (first, last) history entries being summarized
+        self.turns = []
+
+    def turn_config(self):
+        if not self.summary:
+            return self.config
+        system = self.config.system_instruction or ""
+        if not isinstance(system, str):
+            system = text_of(system.parts) if isinstance(system, types.Content) else str(system)
+        summary = f"Summary of the earlier conversation:\n{self.summary}"
+        return self.config.model_copy(update={"system_instruction": f"{system}\n\n{summary}".strip()})
+
+    def send(self, message, on_text=None):
+        """Send a message and stream the answer to on_text. Returns the Turn."""
+        self.wait_for_compaction()
+        user = types.Content(role='user', parts=[types.Part(text=message)])
+        contents = self.history + [user] if self.memory else [user]
+
+        start = time.perf_counter()
+        first_token_seconds = None
+        parts, usage = [], None
+        for chunk in self.client.models.generate_content_stream(model=self.model, contents=contents,
+                                                                config=self.turn_config()):
+            usage = chunk.usage_metadata or usage
+            if not chunk.candidates or not chunk.candidates[0].content:
+                continue
+            chunk_parts = chunk.candidates[0].content.parts or []
+            parts += chunk_parts
+            text = text_of(chunk_parts)
+            if text:
+                if first_token_seconds is None:
+                    first_token_seconds = time.perf_counter() - start
+                if on_text is not None:
+                    on_text(text)
+        seconds = time.perf_counter() - start
+
+        prompt_tokens = (usage.prompt_token_count or 0) if usage else 0
+        output_tokens = (usage.candidates_token_count or 0) if usage else 0
+        turn = Turn(text_of(parts), parts, first_token_seconds, seconds, prompt_tokens, output_tokens)
+        self.turns.append(turn)
+        if self.memory:
+            self.history += [user, types.Content(role='model', parts=parts)]
+            if prompt_tokens + output_tokens > self.token_budget:
+                self.start_compaction()
+        return turn
+
+    def ask(self, message, prefix='[GenAI]: ', show=True):
+        """Send a message, printing the answer as it arrives and then the turn's timing."""
+        if not show:
+            return self.send(message)
+        print(prefix, end='', flush=True)
+        turn = self.send(message, on_text=lambda text: print(text, end='', flush=True))
+        print()
+        extra = f", {len(self.history) // 2} turns in history" if self.memory else ""
+        if self.summary:
+            extra += " + summary"
+        print(format_stats(turn.first_token_seconds, turn.seconds, turn.prompt_tokens, extra))
+        return turn
+
+    def start_compaction(self):
+        # Summarize everything except the pinned and the most recent turns
+        first = 2 * self.pinned_turns
+        last = len(self.history) - 2 * self.keep_turns
+        if last <= first or self.compaction is not None:
+            return
+        self.compaction = self.compactor.submit(self.summarize, self.history[first:last], self.summary)
+        self.compaction_range = (first, last)
+
+    def summarize(self, contents, previous_summary):
+        transcript = "\n".join(f"{'User' if content.role == 'user' else 'Assistant'}: {text_of(content.parts)}"
+                               for content in contents)
+        if previous_summary:
+            transcript = f"Earlier summary: {previous_summary}\n{transcript}"
+        response = self.client.models.generate_content(
+            model=self.summary_model,
+            contents=f"{SUMMARY_PROMPT}\n\n{transcript}",
+            config=types.GenerateContentConfig(max_output_tokens=400),
+        )
+        return response.text
+
+    def wait_for_compaction(self):
+        if self.compaction is None:
+            return
+        try:
+            summary = self.compaction.result()
+        except Exception as e:
+            print(f">>> Could not summarize the history, keeping it as it is: {e}")
+            summary = None
+        if summary:
+            first, last = self.compaction_range
+            self.summary = summary.strip()
+            del self.history[first:last]
+        self.compaction = None
+
+    def get_history(self):
+        self.wait_for_compaction()
+        return list(self.history)
+
+    def run(self, prompt='[User]: '):
+        """Read questions until 'exit' or 'quit' and stream the answers."""
+        while True:
+            question = input(prompt)
+            if question == 'exit' or question == 'quit':
+                break
+            self.ask(question)
+        self.report()
+
+    def report(self):
+        if not self.turns:
+            return
+        firsts = [turn.first_token_seconds for turn in self.turns if turn.first_token_seconds is not None]
+        first = f"avg first token {sum(firsts) / len(firsts):.2f}s, " if firsts else ""
+        print(f">>> {len(self.turns)} turns, {first}avg total {sum(t.seconds for t in self.turns) / len(self.turns):.2f}s, "
+              f"avg prompt {sum(t.prompt_tokens for t in self.turns) // len(self.turns):,} tokens")
+
+    def close(self):
+        self.compactor.shutdown(wait=False, cancel_futures=True)
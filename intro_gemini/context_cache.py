@@ -0,0 +1,123 @@
+# Explicit context caching for repeated questions about one document
+# The document and the instructions are stored once as a Gemini cached content object;
+# every question then refers to the cache by name, so the model does not reprocess the
+# whole document each turn. The cache lives for a TTL, which is extended shortly before
+# it runs out, and its name is kept in the upload manifest so the next run can reuse it.
+# When caching is not supported (model without caching support, document below the
+# minimum size) questions are sent with the document as before. Rate limits and server
+# errors only skip the cache for the current question; it is tried again after a backoff.
+from datetime import datetime, timedelta, timezone
+from google.genai import errors, types
+
+CACHE_TTL = timedelta(minutes=10)
+REFRESH_MARGIN = timedelta(minutes=2)  # extend the TTL when less than this is left
+RETRY_DELAY = timedelta(seconds=30)  # first wait after a transient error, doubled each time
+MAX_RETRY_DELAY = timedelta(minutes=10)
+
+
+def is_transient(error):
+    """Rate limits and server errors pass; any other error means caching will not work."""
+    return error.code == 429 or (error.code or 0) >= 500
+
+
+class DocumentCache:
+    """Context cache of one uploaded document, created on first use."""
+
+    def __init__(self, client, model, pdf_file, instructions, manifest=None, digest=None, ttl=CACHE_TTL):
+        """
+        manifest, digest: UploadManifest and file hash used to reuse the cache between runs
+        """
+        self.client = client
+        self.model = model
+        self.pdf_file = pdf_file
+        self.instructions = instructions
+        self.manifest = manifest
+        self.digest = digest
+        self.ttl = ttl
+        self.name = None
+        self.expire_time = None
+        self.available = True  # False once caching turned out to be unsupported
+        self.failures = 0  # transient errors in a row
+        self.retry_at = None  # no cache calls before this time after a transient error
+        if manifest is not None and digest is not None:
+            cached = manifest.lookup_cache(digest, model)
+            if cached is not None:
+                self.name, self.expire_time = cached
+
+    def ttl_text(self):
+        return f"{int(self.ttl.total_seconds())}s"
+
+    def remember(self):
+        if self.manifest is not None and self.digest is not None:
+            self.manifest.remember_cache(self.digest, self.model, self.name, self.expire_time)
+
+    def create(self):
+        cache = self.client.caches.create(
+            model=self.model,
+            config=types.CreateCachedContentConfig(
+                contents=[self.pdf_file],
+                system_instruction=self.instructions,
+                display_name=getattr(self.pdf_file, "display_name", None) or "document",
+                ttl=self.ttl_text(),
+            ),
+        )
+        self.name, self.expire_time = cache.name, cache.expire_time
+        self.remember()
+
+    def refresh(self):
+        cache = self.client.caches.update(
+            name=self.name, config=types.UpdateCachedContentConfig(ttl=self.ttl_text()))
+        self.expire_time = cache.expire_time
+        self.remember()
+
+    def ensure(self):
+        """
+        Name of a live cache for the document, creating or extending it when needed.
+        Returns None when caching is not available.
+        """
+        if not self.available:
+            return None
+        now = datetime.now(timezone.utc)
+        if self.name is not None and self.expire_time is not None and self.expire_time - now > REFRESH_MARGIN:
+            return self.name
+        if self.retry_at is not None and now < self.retry_at:
+            return self.live_name(now)
+        try:
+            if self.name is not None:
+                try:
+                    self.refresh()
+                    self.failures = 0
+                    return self.name
+                except errors.ClientError as e:
+                    if is_transient(e):
+                        raise
+                    self.name = None  # expired or deleted on the server - make a new one
+            self.create()
+            self.failures = 0
+            return self.name
+        except errors.APIError as e:
+            if is_transient(e):
+                # Skip the cache for now and try again later
+                self.failures += 1
+                self.retry_at = now + min(RETRY_DELAY * 2 ** (self.failures - 1), MAX_RETRY_DELAY)
+                print(f">>> Context cache temporarily unavailable ({e.code}: {e.message}); "
+                      "sending the document with this question.")
+                return self.live_name(now)
+            print(f">>> Context caching is not available ({e.code}: {e.message}); "
+                  "sending the document with every question instead.")
+            self.available = False
+            self.name = None
+            self.remember()
+            return None
+
+    def live_name(self, now):
+        """The cache name while it has not expired yet (it could not be extended), else None."""
+        if self.name is not None and self.expire_time is not None and self.expire_time > now:
+            return self.name
+        return None
+
+    def invalidate(self):
+        """Forget the cache after the server said it no longer exists."""
+        self.name = None
+        self.expire_time = None
+        self.remember()
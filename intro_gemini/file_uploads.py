@@ -0,0 +1,170 @@
+# Reuse of Gemini File API uploads between runs
+# A local manifest maps the SHA-256 of each uploaded file to its remote file handle and
+# expiry time, so an unchanged file is not uploaded again until its remote copy expires
+# (the File API keeps files for 48 hours). Large files are uploaded with the resumable
+# upload protocol in chunks; the upload URL and offset are kept in the manifest, so an
+# upload interrupted by a crash or a dropped connection continues where it stopped.
+from datetime import datetime, timedelta, timezone
+from google.genai import types
+from intro_gemini.pdf_extract import file_hash
+import json
+import mimetypes
+import os
+import requests
+
+MANIFEST_PATH = ".gemini_uploads.json"
+UPLOAD_URL = "https://generativelanguage.googleapis.com/upload/v1beta/files"
+CHUNK_SIZE = 8 * 1024 * 1024  # a multiple of 256 KB, as the upload protocol requires
+RESUMABLE_MIN_SIZE = 20 * 1024 * 1024  # smaller files go up in a single request
+EXPIRY_MARGIN = timedelta(hours=1)  # do not reuse a file that is about to expire
+
+
+class UploadManifest:
+    """Content hash -> remote file handle, saved as JSON."""
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except ValueError:
+                self.entries = {}  # damaged manifest - start again
+        self.prune()
+
+    def save(self):
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(temporary_path, self.path)
+
+    def prune(self):
+        """Forget uploads whose remote copy has expired."""
+        now = datetime.now(timezone.utc)
+        for digest, entry in list(self.entries.items()):
+            expiration = entry.get("expiration_time")
+            if expiration and datetime.fromisoformat(expiration) <= now:
+                del self.entries[digest]
+
+    def lookup(self, digest):
+        """The remote file for a content hash if it is still valid, else None."""
+        entry = self.entries.get(digest)
+        if not entry or "uri" not in entry:
+            return None
+        expiration = entry.get("expiration_time")
+        if expiration and datetime.fromisoformat(expiration) - EXPIRY_MARGIN <= datetime.now(timezone.utc):
+            return None
+        return types.File(name=entry["name"], uri=entry["uri"], mime_type=entry["mime_type"])
+
+    def remember(self, digest, path, remote_file):
+        expiration = remote_file.expiration_time
+        if expiration is None:
+            expiration = datetime.now(timezone.utc) + timedelta(hours=48)
+        self.entries[digest] = {
+            "path": os.path.abspath(path),
+            "name": remote_file.name,
+            "uri": remote_file.uri,
+            "mime_type": remote_file.mime_type,
+            "expiration_time": expiration.isoformat(),
+        }
+        self.save()
+
+    def lookup_cache(self, digest, model):
+        """(cache name, expire time) of a context cache made for this file and model, or None."""
+        cache = self.entries.get(digest, {}).get("cache")
+        if not cache or cache["model"] != model:
+            return None
+        expire_time = datetime.fromisoformat(cache["expire_time"])
+        if expire_time <= datetime.now(timezone.utc):
+            return None
+        return cache["name"], expire_time
+
+    def remember_cache(self, digest, model, name, expire_time):
+        entry = self.entries.get(digest)
+        if entry is None:
+            return
+        if name is None:
+            entry.pop("cache", None)
+        else:
+            entry["cache"] = {"name": name, "model": model, "expire_time": expire_time.isoformat()}
+        self.save()
+
+    def forget(self, digest):
+        if self.entries.pop(digest, None) is not None:
+            self.save()
+
+
+def resumable_upload(api_key, path, manifest, digest, progress=None):
+    """
+    Upload a file in CHUNK_SIZE pieces with the resumable upload protocol, continuing an
+    earlier interrupted upload of the same content when the manifest has one.
+    Returns the uploaded file as a types.File.
+    """
+    size = os.path.getsize(path)
+    mime_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    pending = manifest.entries.get(digest, {}).get("upload_url")
+    offset = 0
+    if pending:
+        # Ask the server how much of the earlier upload arrived
+        response = requests.post(pending, headers={"X-Goog-Upload-Command": "query"}, timeout=60)
+        if response.ok and response.headers.get("X-Goog-Upload-Status") == "active":
+            offset = int(response.headers.get("X-Goog-Upload-Size-Received", 0))
+        else:
+            pending = None  # the upload session is gone - start a new one
+    if not pending:
+        response = requests.post(
+            UPLOAD_URL,
+            headers={
+                "x-goog-api-key": api_key,
+                "X-Goog-Upload-Protocol": "resumable",
+                "X-Goog-Upload-Command": "start",
+                "X-Goog-Upload-Header-Content-Length": str(size),
+                "X-Goog-Upload-Header-Content-Type": mime_type,
+            },
+            json={"file": {"display_name": os.path.basename(path)}},
+            timeout=60,
+        )
+        response.raise_for_status()
+        pending = response.headers["X-Goog-Upload-URL"]
+        manifest.entries[digest] = {"path": os.path.abspath(path), "upload_url": pending}
+        manifest.save()
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            command = "upload, finalize" if offset + len(chunk) >= size else "upload"
+            response = requests.post(
+                pending,
+                headers={"X-Goog-Upload-Command": command, "X-Goog-Upload-Offset": str(offset)},
+                data=chunk,
+                timeout=300,
+            )
+            response.raise_for_status()
+            offset += len(chunk)
+            if progress is not None:
+                progress(offset, size)
+            if command == "upload, finalize":
+                break
+
+    remote_file = types.File.model_validate(response.json()["file"])
+    manifest.remember(digest, path, remote_file)
+    return remote_file
+
+
+def upload_file(client, api_key, path, manifest=None, progress=None):
+    """
+    Return a remote handle for a local file, uploading it only when needed.
+    Returns (types.File, True if it was uploaded now / False if reused).
+    """
+    manifest = manifest or UploadManifest()
+    digest = file_hash(path)
+    remote_file = manifest.lookup(digest)
+    if remote_file is not None:
+        return remote_file, False
+    if os.path.getsize(path) >= RESUMABLE_MIN_SIZE:
+        return resumable_upload(api_key, path, manifest, digest, progress), True
+    remote_file = client.files.upload(file=path)
+    manifest.remember(digest, path, remote_file)
+    return remote_file, True
@@ -0,0 +1,152 @@
+# On-disk store of generated images and an in-memory cache of their thumbnails
+# Images are saved under the SHA-256 of their bytes, so the same image is stored once.
+# An index maps each request (prompt, model and generation settings) to its image, so a
+# repeated prompt is answered from disk without calling the API. The store is bounded in
+# bytes: when it grows past the limit the least recently used images are deleted.
+# ThumbnailCache keeps decoded, downscaled PhotoImages in an LRU so browsing past images
+# does not decode the same file again.
+from collections import OrderedDict
+from datetime import datetime, timezone
+from PIL import Image, ImageTk
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+
+STORE_DIR = ".image_store"
+MAX_BYTES = 200 * 1024 * 1024
+
+
+def request_key(prompt, model, settings=None):
+    """Hash of everything that decides the generated image."""
+    text = json.dumps({"prompt": prompt, "model": model, "settings": settings or {}}, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ImageStore:
+    """Generated images on disk with an index by request, safe to use from several threads."""
+
+    def __init__(self, directory=STORE_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, "index.json")
+        self.lock = threading.Lock()
+        self.entries = {}  # request key -> {"file", "prompt", "model", "bytes", "created", "last_used"}
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+        # Drop entries whose file was deleted by hand
+        for key, entry in list(self.entries.items()):
+            if not os.path.exists(self.path_of(entry)):
+                del self.entries[key]
+
+    def path_of(self, entry):
+        return os.path.join(self.directory, entry["file"])
+
+    def save(self):
+        temporary_path = self.index_path + ".tmp"
+        with open(temporary_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(temporary_path, self.index_path)
+
+    def get(self, prompt, model, settings=None):
+        """Path of the stored image for this request, or None."""
+        with self.lock:
+            entry = self.entries.get(request_key(prompt, model, settings))
+            if entry is None:
+                return None
+            entry["last_used"] = datetime.now(timezone.utc).isoformat()
+            self.save()
+            return self.path_of(entry)
+
+    def put(self, prompt, model, settings, data, mime_type="image/png"):
+        """Store the image bytes generated for a request and return their path."""
+        extension = mimetypes.guess_extension(mime_type) or ".png"
+        file_name = hashlib.sha256(data).hexdigest() + extension
+        path = os.path.join(self.directory, file_name)
+        with self.lock:
+            if not os.path.exists(path):
+                temporary_path = path + ".tmp"
+                with open(temporary_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temporary_path, path)
+            now = datetime.now(timezone.utc).isoformat()
+            self.entries[request_key(prompt, model, settings)] = {
+                "file": file_name, "prompt": prompt, "model": model,
+                "bytes": len(data), "created": now, "last_used": now,
+            }
+            self.evict()
+            self.save()
+        return path
+
+    def evict(self):
+        """Delete least recently used images until the store fits in max_bytes (lock held)."""
+        sizes = {entry["file"]: entry["bytes"] for entry in self.entries.values()}
+        total = sum(sizes.values())
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            del self.entries[key]
+            # The file may be shared with another request that produced the same image
+            if not any(other["file"] == entry["file"] for other in self.entries.values()):
+                total -= sizes[entry["file"]]
+                try:
+                    os.remove(self.path_of(entry))
+                except FileNotFoundError:
+                    pass
+
+    def recent(self, limit=None):
+        """(prompt, path) of the stored images, newest first."""
+        with self.lock:
+            entries = sorted(self.entries.values(), key=lambda entry: entry["created"], reverse=True)
+        return [(entry["prompt"], self.path_of(entry)) for entry in entries[:limit]]
+
+
+def decode_thumbnail(path, size):
+    """Open an image file and scale it to fit in size; safe to run on a worker thread."""
+    with Image.open(path) as image:
+        image.draft('RGB', size)  # lets JPEG decode at a reduced scale
+        image.thumbnail(size)
+        return image.copy()
+
+
+class ThumbnailCache:
+    """
+    Least recently used PhotoImages of one size, keyed by file path.
+    PhotoImages belong to Tk, so this must only be used from the main thread.
+    """
+
+    def __init__(self, size, capacity):
+        self.size = size
+        self.capacity = capacity
+        self.items = OrderedDict()
+
+    def __contains__(self, path):
+        return path in self.items
+
+    def get(self, path):
+        """The cached PhotoImage, or None."""
+        photo = self.items.get(path)
+        if photo is not None:
+            self.items.move_to_end(path)
+        return photo
+
+    def put(self, path, image):
+        """Cache a PIL image (already decoded, e.g. by decode_thumbnail) and return its PhotoImage."""
+        photo = ImageTk.PhotoImage(image)
+        self.items[path] = photo
+        self.items.move_to_end(path)
+        while len(self.items) > self.capacity:
+            self.items.popitem(last=False)
+        return photo
+
+    def load(self, path):
+        """The PhotoImage for a file, decoding it now if it is not cached."""
+        photo = self.get(path)
+        if photo is None:
+            photo = self.put(path, decode_thumbnail(path, self.size))
+        return photo
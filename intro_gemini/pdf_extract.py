@@ -0,0 +1,128 @@
+# Page-parallel PDF text extraction with an on-disk page cache
+# Pages are extracted by a process pool (PyPDF2 is pure Python, so threads would not help)
+# in chunks of consecutive pages, and every page's text is cached on disk under
+# <cache_dir>/<sha256 of the file>/<page>.txt, so opening the same PDF again is near-instant.
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PyPDF2 import PdfReader
+import hashlib
+import math
+import os
+import sys
+
+CACHE_DIR = ".pdf_cache"
+CHUNK_SIZE = 25  # minimum pages per pool task - every task has to open and parse the PDF again
+CHUNKS_PER_WORKER = 4  # a few tasks per worker so a slow chunk does not hold up the end
+
+
+def file_hash(path):
+    """SHA-256 of a file, read in 1 MB blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_path(cache_dir, digest, page_number):
+    return os.path.join(cache_dir, digest, f"{page_number}.txt")
+
+
+def read_cached(cache_dir, digest, page_number):
+    """Cached text of a page, or None if the page has not been extracted before."""
+    try:
+        with open(cache_path(cache_dir, digest, page_number), encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_cached(cache_dir, digest, page_number, text):
+    path = cache_path(cache_dir, digest, page_number)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temporary_path, path)  # never leave a half-written page behind
+
+
+def iter_chunk(pdf_path, page_numbers):
+    """Yield (page number, text, error message or None) for each page, opening the PDF once."""
+    with open(pdf_path, 'rb') as file:
+        reader = PdfReader(file)
+        for page_number in page_numbers:
+            try:
+                yield page_number, reader.pages[page_number].extract_text() or "", None
+            except Exception as page_error:
+                yield page_number, None, str(page_error)
+
+
+def extract_chunk(pdf_path, page_numbers):
+    """Extract a chunk of pages in a worker process."""
+    return list(iter_chunk(pdf_path, page_numbers))
+
+
+def count_pages(pdf_path):
+    """Number of pages (raises FileNotFoundError or PdfReadError like PdfReader)."""
+    with open(pdf_path, 'rb') as file:
+        return len(PdfReader(file).pages)
+
+
+def iter_pages(pdf_path, workers=None, cache_dir=CACHE_DIR, chunk_size=CHUNK_SIZE, num_pages=None):
+    """
+    Yield (page number, text) for every page of a PDF as soon as it is ready.
+    Cached pages come first, the rest in the order the workers finish them.
+    Pages that fail to extract are reported on stderr and yielded with text None.
+    """
+    if num_pages is None:
+        num_pages = count_pages(pdf_path)
+    digest = file_hash(pdf_path)
+    missing = []
+    for page_number in range(num_pages):
+        text = read_cached(cache_dir, digest, page_number)
+        if text is None:
+            missing.append(page_number)
+        else:
+            yield page_number, text
+    if not missing:
+        return
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(missing) <= chunk_size:
+        # Not worth starting worker processes
+        yield from store_results(iter_chunk(pdf_path, missing), cache_dir, digest)
+        return
+
+    chunk_size = max(chunk_size, math.ceil(len(missing) / (workers * CHUNKS_PER_WORKER)))
+    chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(extract_chunk, pdf_path, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from store_results(future.result(), cache_dir, digest)
+
+
+def store_results(results, cache_dir, digest):
+    for page_number, text, error in results:
+        if error is not None:
+            print(f"\nError processing page {page_number + 1}: {error}", file=sys.stderr)
+        else:
+            write_cached(cache_dir, digest, page_number, text)
+        yield page_number, text
+
+
+def extract_pages(pdf_path, workers=None, cache_dir=CACHE_DIR, progress=None):
+    """
+    Extract every page in parallel and return the texts in page order.
+
+    Args:
+        progress: optional function (pages done, total pages) called as pages finish
+
+    Returns:
+        list: the text of each page (None for pages that failed)
+    """
+    pages = [None] * count_pages(pdf_path)
+    finished = iter_pages(pdf_path, workers, cache_dir, num_pages=len(pages))
+    for done, (page_number, text) in enumerate(finished, start=1):
+        pages[page_number] = text
+        if progress is not None:
+            progress(done, len(pages))
+    return pages
@@ -0,0 +1,184 @@
+# Local retrieval over a PDF, so each question is sent with a few relevant chunks
+# instead of the whole document.
+#   1. pages are split into overlapping chunks of words
+#   2. chunks are embedded (Gemini embeddings, or a local hashing embedder without network)
+#   3. vectors are kept in a per-document index on disk: NumPy brute force, plus an
+#      approximate nearest-neighbour (HNSW) index when hnswlib is installed and the document is big
+#   4. a question is embedded and the top-k chunks are put in the prompt
+import json
+import os
+import zlib
+
+import numpy as np
+
+try:
+    import hnswlib  # optional: approximate nearest-neighbour search for large documents
+except ImportError:
+    hnswlib = None
+
+EMBEDDING_MODEL = "text-embedding-004"
+INDEX_DIR = ".pdf_index"
+ANN_MIN_CHUNKS = 5000  # below this brute force is just as fast
+
+
+def chunk_pages(pages, chunk_words=250, overlap_words=50):
+    """
+    Split page texts into chunks of about `chunk_words` words. Neighbouring chunks share
+    `overlap_words` words, so a sentence cut at a chunk edge is whole in one of them.
+    Returns a list of {"page": first page (1-based), "text": chunk text}.
+    """
+    words = []  # (word, page number)
+    for page_number, text in enumerate(pages, start=1):
+        if text:
+            words += [(word, page_number) for word in text.split()]
+    step = max(1, chunk_words - overlap_words)
+    chunks = []
+    for start in range(0, len(words), step):
+        window = words[start:start + chunk_words]
+        chunks.append({"page": window[0][1], "text": " ".join(word for word, _ in window)})
+        if start + chunk_words >= len(words):
+            break
+    return chunks
+
+
+class GeminiEmbedder:
+    """Embeddings from the Gemini API, requested in batches."""
+
+    def __init__(self, client, model=EMBEDDING_MODEL, batch_size=100):
+        self.client = client
+        self.model = model
+        self.name = model
+        self.batch_size = batch_size
+
+    def embed(self, texts, task_type):
+        from google.genai import types
+
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            response = self.client.models.embed_content(
+                model=self.model,
+                contents=texts[start:start + self.batch_size],
+                config=types.EmbedContentConfig(task_type=task_type),
+            )
+            vectors += [embedding.values for embedding in response.embeddings]
+        return np.array(vectors, dtype=np.float32)
+
+    def embed_documents(self, texts):
+        return self.embed(texts, "RETRIEVAL_DOCUMENT")
+
+    def embed_query(self, text):
+        return self.embed([text], "RETRIEVAL_QUERY")[0]
+
+
+class HashingEmbedder:
+    """Local embeddings from hashed words and word pairs: no network, lower quality."""
+
+    def __init__(self, dimensions=1024):
+        self.dimensions = dimensions
+        self.name = f"hashing-{dimensions}"
+
+    def embed_one(self, text):
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        words = [word.strip(".,;:!?()[]\"'").lower() for word in text.split()]
+        words = [word for word in words if word]
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            vector[zlib.crc32(feature.encode("utf-8")) % self.dimensions] += 1.0
+        return vector
+
+    def embed_documents(self, texts):
+        return np.array([self.embed_one(text) for text in texts], dtype=np.float32).reshape(-1, self.dimensions)
+
+    def embed_query(self, text):
+        return self.embed_one(text)
+
+
+def normalize_rows(vectors):
+    lengths = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(lengths, 1e-12)
+
+
+class VectorIndex:
+    """Cosine-similarity search over normalized vectors."""
+
+    def __init__(self, vectors, use_ann=None):
+        """
+        use_ann: True/False to force the HNSW index on or off, None to use it for large
+        documents when hnswlib is installed
+        """
+        self.vectors = normalize_rows(np.asarray(vectors, dtype=np.float32))
+        if use_ann is None:
+            use_ann = len(self.vectors) >= ANN_MIN_CHUNKS
+        self.ann = None
+        if use_ann and hnswlib is not None and len(self.vectors):
+            self.ann = hnswlib.Index(space="ip", dim=self.vectors.shape[1])
+            self.ann.init_index(max_elements=len(self.vectors), ef_construction=200, M=16)
+            self.ann.add_items(self.vectors, np.arange(len(self.vectors)))
+            self.ann.set_ef(100)
+
+    def search(self, query, k=5):
+        """Return [(row, similarity)] of the k most similar vectors, best first."""
+        k = min(k, len(self.vectors))
+        if k == 0:
+            return []
+        query = normalize_rows(np.asarray(query, dtype=np.float32))
+        if self.ann is not None:
+            labels, distances = self.ann.knn_query(query, k=k)
+            return [(int(row), 1.0 - float(distance)) for row, distance in zip(labels[0], distances[0])]
+        scores = self.vectors @ query
+        top = np.argpartition(-scores, k - 1)[:k]  # the k best in any order, without a full sort
+        top = top[np.argsort(-scores[top])]
+        return [(int(row), float(scores[row])) for row in top]
+
+
+class DocumentRetriever:
+    """
+    Chunks, embeddings and index of one PDF, saved to disk so they are built only once
+    per document, embedder and chunk size.
+    """
+
+    def __init__(self, pages, digest, embedder, index_dir=INDEX_DIR, chunk_words=250, overlap_words=50,
+                 use_ann=None):
+        """
+        pages: text of each page, digest: hash of the PDF file (pdf_extract.file_hash)
+        """
+        self.embedder = embedder
+        self.directory = os.path.join(index_dir, f"{digest}-{embedder.name}-{chunk_words}-{overlap_words}")
+        self.built = not self.load()
+        if self.built:
+            self.chunks = chunk_pages(pages, chunk_words, overlap_words)
+            vectors = embedder.embed_documents([chunk["text"] for chunk in self.chunks])
+            self.save(vectors)
+        else:
+            vectors = np.load(os.path.join(self.directory, "vectors.npy"))
+        self.index = VectorIndex(vectors, use_ann)
+
+    def load(self):
+        try:
+            with open(os.path.join(self.directory, "chunks.json"), encoding="utf-8") as f:
+                self.chunks = json.load(f)
+            return os.path.exists(os.path.join(self.directory, "vectors.npy"))
+        except (FileNotFoundError, ValueError):
+            return False
+
+    def save(self, vectors):
+        os.makedirs(self.directory, exist_ok=True)
+        np.save(os.path.join(self.directory, "vectors.npy"), vectors)
+        # chunks.json is written last: it marks the index as complete
+        temporary_path = os.path.join(self.directory, "chunks.json.tmp")
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(self.chunks, f)
+        os.replace(temporary_path, os.path.join(self.directory, "chunks.json"))
+
+    def retrieve(self, question, k=5):
+        """The k chunks most similar to the question, each with a "score"."""
+        query = self.embedder.embed_query(question)
+        return [dict(self.chunks[row], score=score) for row, score in self.index.search(query, k)]
+
+
+def build_prompt(question, chunks):
+    """The question together with the retrieved excerpts, labelled with their pages."""
+    excerpts = "\n\n".join(f"[Page {chunk['page']}]\n{chunk['text']}" for chunk in chunks)
+    return f"""Document excerpts:
+{excerpts}
+
+Question: {question}"""
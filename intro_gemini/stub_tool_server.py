@@ -0,0 +1,86 @@
+# Local stand-in for the HTTP APIs used by the tutorial08 tools (catfact.ninja and
+# genderize.io), so the tools can be run and benchmarked without network access.
+# Answers are deterministic and each request waits `delay` seconds to imitate a real API.
+#
+# Usage: python3 -m intro_gemini.stub_tool_server [--port 8765] [--delay 0.2]
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import argparse
+import json
+import threading
+import time
+import zlib
+
+CAT_FACTS = [
+    "Cats sleep for around 13 to 16 hours a day.",
+    "A group of cats is called a clowder.",
+    "Cats have five toes on their front paws but only four on the back ones.",
+    "A cat's nose print is unique, like a human fingerprint.",
+]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled sessions can reuse connections
+
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        url = urlparse(self.path)
+        self.server.count_request(url.path)
+        if url.path == "/fact":
+            body = {"fact": CAT_FACTS[self.server.requests["/fact"] % len(CAT_FACTS)], "length": 0}
+        elif url.path == "/genderize":
+            name = parse_qs(url.query).get("name", [""])[0]
+            checksum = zlib.crc32(name.lower().encode("utf-8"))
+            body = {"name": name, "gender": "female" if checksum % 2 else "male",
+                    "probability": round(0.5 + (checksum % 50) / 100, 2), "count": checksum % 10000}
+        else:
+            self.send_error(404)
+            return
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # keep the console quiet
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, delay=0.0):
+        super().__init__(address, StubHandler)
+        self.delay = delay
+        self.requests = {}  # path -> number of requests
+        self.lock = threading.Lock()
+
+    def count_request(self, path):
+        with self.lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def urls(self):
+        """URLs to use instead of the real APIs (see tutorial08.use_api_urls)."""
+        base = f"http://127.0.0.1:{self.server_address[1]}"
+        return {"cat_fact": base + "/fact", "genderize": base + "/genderize"}
+
+
+def start_stub_server(port=0, delay=0.0):
+    """Start the stub server on a background thread (port 0: any free port) and return it."""
+    server = StubServer(("127.0.0.1", port), delay)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the tutorial08 tool APIs")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.2, help="seconds each request takes")
+    args = parser.parse_args()
+    server = StubServer(("127.0.0.1", args.port), args.delay)
+    print(f">>> Stub APIs: {server.urls()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
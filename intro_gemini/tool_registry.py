@@ -0,0 +1,227 @@
+# Registry of Python functions the model can call
+# A function is registered with @registry.tool(...). Its declaration for the model is
+# derived from the signature and type hints (argument types) and the docstring (tool
+# description, and argument descriptions from an "Args:" section), so there is no
+# hand-written JSON schema to keep in sync. Each tool has its own timeout and,
+# for deterministic tools, a TTL cache of results by arguments. Every call is counted:
+# calls, cache hits, errors, timeouts and latency.
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from google.genai import types
+import inspect
+import json
+import threading
+import time
+import typing
+
+# Python type -> schema type of the argument
+SCHEMA_TYPES = {
+    str: types.Type.STRING,
+    int: types.Type.INTEGER,
+    float: types.Type.NUMBER,
+    bool: types.Type.BOOLEAN,
+    list: types.Type.ARRAY,
+    dict: types.Type.OBJECT,
+}
+
+
+def parse_docstring(docstring):
+    """(description, {argument: description}) from a Google style docstring."""
+    description, arguments = [], {}
+    in_args = False
+    for line in inspect.cleandoc(docstring or "").splitlines():
+        stripped = line.strip()
+        if stripped in ("Args:", "Arguments:"):
+            in_args = True
+        elif in_args and ":" in stripped and line.startswith(" "):
+            name, text = stripped.split(":", 1)
+            arguments[name.split(" ")[0]] = text.strip()
+        elif in_args and stripped and not line.startswith(" "):
+            in_args = False  # another section (Returns: ...)
+        elif not in_args and stripped and not stripped.endswith(":"):
+            description.append(stripped)
+    return " ".join(description), arguments
+
+
+def schema_for(annotation, description=None):
+    origin = typing.get_origin(annotation) or annotation
+    schema = types.Schema(type=SCHEMA_TYPES.get(origin, types.Type.STRING), description=description)
+    if origin is list:
+        item_types = typing.get_args(annotation)
+        schema.items = schema_for(item_types[0] if item_types else str)
+    return schema
+
+
+def declaration_for(function):
+    """FunctionDeclaration built from the function's signature, type hints and docstring."""
+    description, argument_descriptions = parse_docstring(function.__doc__)
+    hints = typing.get_type_hints(function)
+    properties, required = {}, []
+    for name, parameter in inspect.signature(function).parameters.items():
+        properties[name] = schema_for(hints.get(name, str), argument_descriptions.get(name))
+        if parameter.default is inspect.Parameter.empty:
+            required.append(name)
+    parameters = None
+    if properties:
+        parameters = types.Schema(type=types.Type.OBJECT, properties=properties, required=required)
+    return types.FunctionDeclaration(name=function.__name__, description=description, parameters=parameters)
+
+
+class Tool:
+    """One registered function with its result cache and counters."""
+
+    def __init__(self, function, ttl=None, timeout=10.0, max_cached=1024):
+        """
+        ttl: seconds a result is reused for the same arguments (None: never cached)
+        timeout: seconds to wait for the function before answering with an error
+        """
+        self.function = function
+        self.name = function.__name__
+        self.declaration = declaration_for(function)
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_cached = max_cached
+        self.cache = OrderedDict()  # arguments key -> (expiry time, result)
+        self.lock = threading.Lock()  # guards the cache and the counters
+        self.calls = self.hits = self.errors = self.timeouts = 0
+        self.latencies = []  # seconds of the calls that ran the function
+
+    def lookup(self, key):
+        if self.ttl is None:
+            return None
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached is None or cached[0] <= time.monotonic():
+                return None
+            self.cache.move_to_end(key)
+            self.calls += 1
+            self.hits += 1
+            return cached
+
+    def record_hit(self):
+        """Count a call answered by another identical call of the same turn."""
+        with self.lock:
+            self.calls += 1
+            self.hits += 1
+
+    def finish(self, key, result, seconds, timed_out=False):
+        with self.lock:
+            self.calls += 1
+            self.latencies.append(seconds)
+            if timed_out:
+                self.timeouts += 1
+            elif isinstance(result, dict) and "error" in result:
+                self.errors += 1
+            elif self.ttl is not None:
+                # Only good results are cached, so a failed call is tried again next time
+                self.cache[key] = (time.monotonic() + self.ttl, result)
+                self.cache.move_to_end(key)
+                while len(self.cache) > self.max_cached:
+                    self.cache.popitem(last=False)
+
+    def stats(self):
+        with self.lock:
+            latencies = sorted(self.latencies)
+        return {
+            "calls": self.calls,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.calls if self.calls else 0.0,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_seconds": sum(latencies) / len(latencies) if latencies else 0.0,
+            "max_seconds": latencies[-1] if latencies else 0.0,
+        }
+
+
+class ToolRegistry:
+    """Tools by name; runs the function calls of a model turn in parallel."""
+
+    def __init__(self, max_workers=8):
+        self.tools = {}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def tool(self, ttl=None, timeout=10.0):
+        """Decorator registering a function as a tool."""
+        def register(function):
+            self.tools[function.__name__] = Tool(function, ttl, timeout)
+            return function
+        return register
+
+    def declarations(self):
+        """The Tool to put in GenerateContentConfig(tools=[...])."""
+        return types.Tool(function_declarations=[tool.declaration for tool in self.tools.values()])
+
+    def run_calls(self, function_calls):
+        """
+        Run function calls at the same time (answering from the caches where possible)
+        and return their results in call order.
+        """
+        started = []  # (tool, key, cached result or future, start time)
+        running = {}  # (tool name, key) -> future, so a cacheable call repeated in one turn runs once
+        for call in function_calls:
+            tool = self.tools.get(call.name)
+            if tool is None:
+                started.append((None, None, {"error": f"Unknown function {call.name}"}, None))
+                continue
+            args = dict(call.args or {})
+            key = json.dumps(args, sort_keys=True, default=str)
+            cached = tool.lookup(key)
+            if cached is not None:
+                started.append((tool, key, cached[1], None))
+                continue
+            future = running.get((tool.name, key)) if tool.ttl is not None else None
+            if future is None:
+                future = running[tool.name, key] = self.executor.submit(self.invoke, tool, args)
+            started.append((tool, key, future, time.perf_counter()))
+
+        results = []
+        finished = {}  # future -> result, so a shared call is counted (and timed) once
+        for tool, key, pending, start in started:
+            if start is None:
+                results.append(pending)
+                continue
+            if pending in finished:
+                tool.record_hit()  # a repeat of a call earlier in this turn
+                results.append(finished[pending])
+                continue
+            # Each future gets the rest of its tool's timeout; a timed-out function keeps
+            # running on its worker, but the model gets an error right away
+            remaining = max(0.0, tool.timeout - (time.perf_counter() - start))
+            try:
+                result = pending.result(timeout=remaining)
+                tool.finish(key, result, time.perf_counter() - start)
+            except FutureTimeout:
+                result = {"error": f"{tool.name} timed out after {tool.timeout}s"}
+                tool.finish(key, result, time.perf_counter() - start, timed_out=True)
+            finished[pending] = result
+            results.append(result)
+        return results
+
+    def invoke(self, tool, args):
+        try:
+            return tool.function(**args)
+        except Exception as e:
+            return {"error": str(e)}
+
+    def call(self, name, **args):
+        """Run one tool outside the model loop (same cache and counters)."""
+        return self.run_calls([types.FunctionCall(name=name, args=args)])[0]
+
+    def function_responses(self, function_calls):
+        """run_calls, wrapped as the function response parts to send back to the model."""
+        results = self.run_calls(function_calls)
+        return [
+            types.Part.from_function_response(name=call.name, response={"result": result})
+            for call, result in zip(function_calls, results)
+        ]
+
+    def stats(self):
+        return {name: tool.stats() for name, tool in self.tools.items()}
+
+    def report(self):
+        lines = [f"{'tool':<16}{'calls':>7}{'hits':>7}{'hit rate':>10}{'errors':>8}{'timeouts':>10}{'avg':>9}{'max':>9}"]
+        for name, stats in self.stats().items():
+            lines.append(f"{name:<16}{stats['calls']:>7}{stats['hits']:>7}{stats['hit_rate']:>10.0%}"
+                         f"{stats['errors']:>8}{stats['timeouts']:>10}"
+                         f"{stats['avg_seconds'] * 1000:>7.0f}ms{stats['max_seconds'] * 1000:>7.0f}ms")
+        return "\n".join(lines)
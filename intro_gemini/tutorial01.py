@@ -1,20 +1,27 @@
-from intro_gemini.utils import get_key
-# Simple example of using the GenAI client
+from llm_client import get_client
+from intro_gemini.chat_runner import format_stats
+# Simple example of using the GenAI client through the shared async client (llm_client),
+# which reuses connections and adds rate limiting and retries
+# The answer is streamed: printed as it arrives instead of when it is complete
 # AI has no memory, so it will not remember the context of the conversation
-from google import genai
+import asyncio
 # create a client
-client = genai.Client(api_key=get_key())
-while True:
-    try:
-        question = input('[User]: ')
-        if question == 'exit' or question == 'quit':
+client = get_client('gemini', model='gemini-2.0-flash')
+
+async def main():
+    while True:
+        try:
+            question = await asyncio.to_thread(input, '[User]: ')
+            if question == 'exit' or question == 'quit':
+                break
+            # generate a response
+            print('[GenAI]: ', end='', flush=True)
+            response = await client.stream(question, on_text=lambda text: print(text, end='', flush=True))
+            print()
+            print(format_stats(response.first_token_seconds, response.seconds, response.input_tokens))
+        except Exception as e:
+            print(e)
             break
-        # generate a response
-        response = client.models.generate_content(
-            model='gemini-2.0-flash',
-            contents=[question]
-        )
-        print('[GenAI]:', response.text)
-    except Exception as e:
-        print(e)
-        break
\ No newline at end of file
+    await client.close()
+
+asyncio.run(main())
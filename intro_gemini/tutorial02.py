@@ -1,22 +1,27 @@
 from intro_gemini.utils import get_key
+from intro_gemini.chat_runner import ChatRunner
 from google import genai
 
 # Simple example of using the GenAI client
 # Using chat so AI can remember the context of the conversation
+# (the answers are streamed, and older turns are summarized when the history gets long)
 
 client = genai.Client(api_key=get_key())
 
 # Create a chat
-chat = client.chats.create(model='gemini-2.0-flash')
+chat = ChatRunner(client, model='gemini-2.0-flash')
 while True:
     question = input('[User]: ')
     if question == 'exit' or question == 'quit':
         break
-    # send message to chat to generate a response
-    response = chat.send_message(message=question)
-    print('[GenAI]:', response.text)
+    # send message to chat to generate a response, printed as it arrives
+    chat.ask(question)
+chat.report()
 
 # History of chat
+if chat.summary:
+    print(f'summary of earlier turns: {chat.summary}')
 for message in chat.get_history():
     print(f'role - {message.role}',end=": ")
-    print(message.parts[0].text)
\ No newline at end of file
+    print(''.join(part.text or '' for part in message.parts))  # streamed answers come in several parts
+chat.close()
@@ -1,4 +1,5 @@
 from intro_gemini.utils import get_key
+from intro_gemini.chat_runner import ChatRunner
 from google import genai
 
 # Example of using systemp prompt. 
@@ -9,13 +10,7 @@ system_prompt="You are a cat. You will answer questions as a cat. Convert words
 
 # Create a config with system_instruction to use when model is generating content
 config = genai.types.GenerateContentConfig(system_instruction=system_prompt)
-while True:
-    question = input('[User]: ')
-    if question == 'exit' or question == 'quit':
-        break
-    response = client.models.generate_content(
-        model='gemini-2.0-flash',
-        contents=[question],
-        config=config   # config with system_instruction
-    )
-    print('[GenAI]:', response.text)
\ No newline at end of file
+# memory=False: every question is sent on its own; answers are streamed
+chat = ChatRunner(client, model='gemini-2.0-flash', config=config, memory=False)
+chat.run()
+chat.close()
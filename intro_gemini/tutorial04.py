@@ -1,14 +1,12 @@
 from intro_gemini.utils import get_key
+from intro_gemini.chat_runner import ChatRunner
 from google import genai
 
 # Simulate system prompt using chat
+# The first message is pinned, so it is never summarized away when the history is compacted
 
 client = genai.Client(api_key=get_key())
-chat = client.chats.create(model='gemini-2.0-flash')
-chat.send_message(message="You are a cat. You will answer questions as a cat. Convert words to meow, meoow, meooww, etc. based on the length of the word. ONLY MEOWS ALLOWED. No matter what the question is, you must respond with meows only.")
-while True:
-    question = input('[User]: ')
-    if question == 'exit' or question == 'quit':
-        break
-    response = chat.send_message(message=question)
-    print('[GenAI]:', response.text)
\ No newline at end of file
+chat = ChatRunner(client, model='gemini-2.0-flash', pinned_turns=1)
+chat.ask("You are a cat. You will answer questions as a cat. Convert words to meow, meoow, meooww, etc. based on the length of the word. ONLY MEOWS ALLOWED. No matter what the question is, you must respond with meows only.", show=False)
+chat.run()
+chat.close()
@@ -1,88 +1,298 @@
 from google import genai
 from google.genai import types
-from PIL import Image
-from io import BytesIO
 import tkinter as tk
 from tkinter import ttk
-from PIL import ImageTk
+from intro_gemini.image_store import ImageStore, ThumbnailCache, decode_thumbnail
 from intro_gemini.utils import get_key
-from tkinter import messagebox
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
+import time
 
+MODEL = "gemini-2.0-flash-exp-image-generation"  # Use the image generation model
+SETTINGS = {"response_modalities": ['Text', 'Image']}  # Request image in response
+MAX_WORKERS = 3  # prompts generated at the same time
+THUMBNAIL_WORKERS = 2  # gallery thumbnails decoded at the same time
+POLL_MS = 100
+PREVIEW_SIZE = (512, 512)
+THUMBNAIL_SIZE = (96, 96)
+GALLERY_SIZE = 48  # newest images shown in the gallery
+GALLERY_COLUMNS = 6
+
+# Generation runs on a pool of worker threads so the window never freezes. Workers only
+# call the API and decode the image; results are handed to the UI through a queue that
+# the window drains with after(), because Tk widgets must only be used from the main thread.
 class ImageGeneratorApp:
     def __init__(self, root):
         self.root = root
         self.root.title("Gemini Image Generator")
         self.root.resizable(False, False)
-        self.root.geometry("800x600")
-        
+        self.root.geometry("800x780")
+
         self.client = genai.Client(api_key=get_key())
-        
+        self.executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+        # Thumbnails get their own workers, so opening the gallery never delays a generation
+        self.thumbnail_executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS)
+        self.results = queue.Queue()
+        self.requests = {}  # request id -> {"prompt", "future", "start"} while in flight
+        self.cancelled = set()  # ids whose result is dropped when it arrives
+        self.lock = threading.Lock()  # guards cancelled
+        self.next_id = 1
+
+        # Generated images are kept on disk; repeated prompts are answered from there
+        self.store = ImageStore()
+        self.previews = ThumbnailCache(PREVIEW_SIZE, capacity=8)
+        self.thumbnails = ThumbnailCache(THUMBNAIL_SIZE, capacity=GALLERY_SIZE + 16)
+        self.gallery = None
+        self.gallery_labels = {}  # path -> thumbnail label while the gallery is open
+        self.gallery_order = []  # paths of the gallery labels, newest first
+
         # Create main frame
         my_frame = ttk.Frame(root)
         my_frame.pack(padx=20, pady=20)
-        
+
         # Create and pack widgets
         self.prompt_label = ttk.Label(my_frame, text="Enter your prompt:")
         self.prompt_label.pack(pady=5)
-        
+
         self.prompt_entry = ttk.Entry(my_frame, width=50)
         self.prompt_entry.pack(pady=5)
-        
-        self.generate_btn = ttk.Button(my_frame, text="Generate Image", command=self.generate_image)
-        self.generate_btn.pack(pady=5)
-        
+        self.prompt_entry.bind('<Return>', lambda event: self.generate_image())
+
+        # The button stays enabled: every click queues another prompt
+        buttons = ttk.Frame(my_frame)
+        buttons.pack(pady=5)
+        self.generate_btn = ttk.Button(buttons, text="Generate Image", command=self.generate_image)
+        self.generate_btn.pack(side=tk.LEFT, padx=5)
+        self.cancel_btn = ttk.Button(buttons, text="Cancel Selected", command=self.cancel_selected)
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+        self.gallery_btn = ttk.Button(buttons, text="Gallery", command=self.open_gallery)
+        self.gallery_btn.pack(side=tk.LEFT, padx=5)
+
+        # One row per request with its status and latency
+        self.request_list = ttk.Treeview(my_frame, columns=('prompt', 'status', 'time'), show='headings', height=4)
+        self.request_list.heading('prompt', text="Prompt")
+        self.request_list.heading('status', text="Status")
+        self.request_list.heading('time', text="Time")
+        self.request_list.column('prompt', width=430)
+        self.request_list.column('status', width=120)
+        self.request_list.column('time', width=80, anchor=tk.E)
+        self.request_list.pack(pady=5)
+
+        self.progress = ttk.Progressbar(my_frame, mode='indeterminate', length=630)
+        self.progress.pack(pady=5)
+        self.progress_label = ttk.Label(my_frame)
+        self.progress_label.pack()
+        self.animating = False
+
         # Create fixed size frame for image
-        self.image_frame = ttk.Frame(my_frame, width=512, height=512)
+        self.image_frame = ttk.Frame(my_frame, width=PREVIEW_SIZE[0], height=PREVIEW_SIZE[1])
         self.image_frame.pack_propagate(False)
         self.image_frame.pack(pady=10)
-        
+
         self.image_label = ttk.Label(self.image_frame)
         self.image_label.pack(expand=True)
-    
+
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.root.after(POLL_MS, self.poll_results)
+
     def generate_image(self):
-        prompt = self.prompt_entry.get()
+        prompt = self.prompt_entry.get().strip()
         if not prompt:
             return
-        
-        self.generate_btn.config(state='disabled')
-        
-        def process_image():
+
+        request_id = self.next_id
+        self.next_id += 1
+        self.prompt_entry.delete(0, tk.END)
+
+        # The same prompt and settings were generated before - show the stored image
+        start = time.perf_counter()
+        path = self.store.get(prompt, MODEL, SETTINGS)
+        if path is not None:
+            self.show_image(path)
+            self.request_list.insert('', 0, iid=str(request_id),
+                                     values=(prompt, "from cache", f"{time.perf_counter() - start:.1f}s"))
+            return
+
+        self.request_list.insert('', 0, iid=str(request_id), values=(prompt, "queued", ""))
+        future = self.executor.submit(self.process_image, request_id, prompt)
+        self.requests[request_id] = {"prompt": prompt, "future": future, "start": start}
+        self.update_progress()
+
+    def process_image(self, request_id, prompt):
+        """Runs on a worker thread: no Tk calls here, only the queue."""
+        self.results.put(("running", request_id, None))
+        try:
+            response = self.client.models.generate_content(
+                model=MODEL,
+                contents=prompt,
+                config=types.GenerateContentConfig(**SETTINGS)
+            )
+
+            for part in response.candidates[0].content.parts:
+                if part.inline_data is not None:
+                    # Store the image even if the request was cancelled: the next identical prompt is free
+                    path = self.store.put(prompt, MODEL, SETTINGS, part.inline_data.data, part.inline_data.mime_type)
+                    with self.lock:
+                        if request_id in self.cancelled:
+                            self.cancelled.discard(request_id)
+                            return  # nobody is waiting for it - skip decoding it
+
+                    # Decode and resize the image to fit the frame here, off the main thread
+                    self.results.put(("done", request_id, (path, decode_thumbnail(path, PREVIEW_SIZE))))
+                    return
+            self.results.put(("error", request_id, "No image in the response"))
+        except Exception as e:
+            self.results.put(("error", request_id, str(e)))
+
+    def poll_results(self):
+        # Apply everything the workers finished since the last poll
+        while True:
             try:
-                response = self.client.models.generate_content(
-                    model="gemini-2.0-flash-exp-image-generation", # Use the image generation model
-                    contents=prompt,
-                    config=types.GenerateContentConfig(
-                        response_modalities=['Text', 'Image']       # Request image in response
-                    )
-                )
-                
-                for part in response.candidates[0].content.parts:
-                    if part.inline_data is not None:
-                        # Convert to PIL Image
-                        image = Image.open(BytesIO((part.inline_data.data)))
-                        
-                        # Resize image to fit the frame
-                        image.thumbnail((512, 512))
-                        
-                        # Convert PIL image to PhotoImage
-                        photo = ImageTk.PhotoImage(image)
-                        
-                        # Update label with new image
-                        self.image_label.config(image=photo)
-                        self.image_label.image = photo
-                        
-                        # Save image
-                        image.save('gemini-native-image.png')
-            except Exception:
-                messagebox.showerror('Error creating image')
-            finally:
-                self.generate_btn.config(state='normal')
-        
-        # Schedule the image processing to run after GUI updates
-        self.root.after(100, process_image)
+                status, request_id, payload = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if status == "thumbnail":
+                self.show_thumbnail(request_id, payload)  # request_id is the image path here
+                continue
+            request = self.requests.get(request_id)
+            if request is None:
+                continue  # cancelled
+            seconds = time.perf_counter() - request["start"]
+            if status == "running":
+                self.set_status(request_id, "generating")
+                continue
+            del self.requests[request_id]
+            if status == "done":
+                # Convert PIL image to PhotoImage (on the main thread) and show it
+                path, image = payload
+                self.previews.put(path, image)
+                self.show_image(path)
+                self.set_status(request_id, "done", seconds)
+                if self.gallery is not None:
+                    self.add_to_gallery(request["prompt"], path)
+            else:
+                self.set_status(request_id, f"error: {payload}", seconds)
+        self.update_progress()
+        self.root.after(POLL_MS, self.poll_results)
+
+    def show_image(self, path):
+        try:
+            photo = self.previews.load(path)
+        except OSError:
+            return  # evicted from the store meanwhile
+        self.image_label.config(image=photo)
+        self.image_label.image = photo
+
+    def open_gallery(self):
+        if self.gallery is not None:
+            self.gallery.lift()
+            return
+        self.gallery = tk.Toplevel(self.root)
+        self.gallery.title("Generated Images")
+        self.gallery.protocol("WM_DELETE_WINDOW", self.close_gallery)
+
+        # Scrollable grid of thumbnails
+        canvas = tk.Canvas(self.gallery, width=GALLERY_COLUMNS * (THUMBNAIL_SIZE[0] + 10), height=400)
+        scrollbar = ttk.Scrollbar(self.gallery, orient=tk.VERTICAL, command=canvas.yview)
+        canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.gallery_grid = ttk.Frame(canvas)
+        canvas.create_window((0, 0), window=self.gallery_grid, anchor=tk.NW)
+        self.gallery_grid.bind('<Configure>', lambda event: canvas.configure(scrollregion=canvas.bbox('all')))
+        self.fill_gallery()
+
+    def fill_gallery(self):
+        for prompt, path in self.store.recent(GALLERY_SIZE):
+            if path in self.gallery_labels:
+                continue  # the same image was generated for another prompt
+            self.gallery_order.append(path)
+            self.create_gallery_label(prompt, path)
+        self.place_gallery_labels()
+
+    def add_to_gallery(self, prompt, path):
+        # Only the new image gets a label; the others keep theirs and just move along
+        if path in self.gallery_labels:
+            self.gallery_order.remove(path)
+        else:
+            self.create_gallery_label(prompt, path)
+        self.gallery_order.insert(0, path)
+        for old_path in self.gallery_order[GALLERY_SIZE:]:
+            self.gallery_labels.pop(old_path).destroy()
+        del self.gallery_order[GALLERY_SIZE:]
+        self.place_gallery_labels()
+
+    def create_gallery_label(self, prompt, path):
+        label = ttk.Label(self.gallery_grid, text=prompt[:12], compound=tk.TOP, cursor='hand2')
+        label.bind('<Button-1>', lambda event, path=path: self.show_image(path))
+        self.gallery_labels[path] = label
+        photo = self.thumbnails.get(path)
+        if photo is not None:
+            label.config(image=photo)
+        else:
+            # Decode on a worker; the thumbnail is filled in when it arrives
+            self.thumbnail_executor.submit(self.load_thumbnail, path)
+
+    def place_gallery_labels(self):
+        for position, path in enumerate(self.gallery_order):
+            self.gallery_labels[path].grid(row=position // GALLERY_COLUMNS, column=position % GALLERY_COLUMNS,
+                                           padx=5, pady=5)
+
+    def load_thumbnail(self, path):
+        """Runs on a worker thread."""
+        try:
+            self.results.put(("thumbnail", path, decode_thumbnail(path, THUMBNAIL_SIZE)))
+        except OSError:
+            pass  # the file was evicted meanwhile
+
+    def show_thumbnail(self, path, image):
+        photo = self.thumbnails.put(path, image)
+        label = self.gallery_labels.get(path)
+        if label is not None:
+            label.config(image=photo)
+
+    def close_gallery(self):
+        self.gallery.destroy()
+        self.gallery = None
+        self.gallery_labels = {}
+        self.gallery_order = []
+
+    def cancel_selected(self):
+        for iid in self.request_list.selection():
+            request = self.requests.pop(int(iid), None)
+            if request is None:
+                continue  # already finished
+            # A queued request never starts; a running one cannot be interrupted, so its result is dropped
+            if not request["future"].cancel():
+                with self.lock:
+                    self.cancelled.add(int(iid))
+            self.set_status(int(iid), "cancelled", time.perf_counter() - request["start"])
+        self.update_progress()
+
+    def set_status(self, request_id, status, seconds=None):
+        self.request_list.set(str(request_id), 'status', status)
+        if seconds is not None:
+            self.request_list.set(str(request_id), 'time', f"{seconds:.1f}s")
+
+    def update_progress(self):
+        # Animated while anything is in flight
+        in_flight = len(self.requests)
+        if in_flight and not self.animating:
+            self.progress.start(10)
+        elif not in_flight and self.animating:
+            self.progress.stop()
+        self.animating = bool(in_flight)
+        self.progress_label.config(text=f"{in_flight} in progress" if in_flight else "")
+
+    def close(self):
+        # Drop queued prompts and do not wait for the running ones
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.thumbnail_executor.shutdown(wait=False, cancel_futures=True)
+        self.root.destroy()
 
 if __name__ == "__main__":
     # Create the main window
     root = tk.Tk()
     app = ImageGeneratorApp(root)
-    root.mainloop()
\ No newline at end of file
+    root.mainloop()
@@ -1,6 +1,19 @@
 from google import genai
+from google.genai import errors, types
+from intro_gemini.context_cache import DocumentCache
+from intro_gemini.file_uploads import UploadManifest, upload_file
+from intro_gemini.pdf_extract import file_hash
 from intro_gemini.utils import get_key
+import argparse
 import sys
+import time
+
+# Sent as the system instruction with every question instead of in a separate warm-up call
+INSTRUCTIONS = """You are an AI assistant. Your task is to answer questions based ONLY on the content of the provided PDF document.
+    Do not use any external knowledge. If information is not in the document, say so clearly."""
+
+# Context caching needs an explicit model version
+MODEL = "gemini-1.5-flash-002"
 
 def initialize_client():
     """Initialize and return the Gemini client."""
@@ -21,37 +34,71 @@ def get_pdf_path():
         sys.exit(1)
     return pdf_path
 
-def upload_pdf(client, pdf_path):
-    """Upload PDF file using the File API."""
-    print(">>> Uploading PDF file...")
-    pdf_file = client.files.upload(file=pdf_path)
-    print(">>> PDF uploaded successfully!")
-    return pdf_file
+def print_upload_progress(sent, total):
+    print(f"\r>>> Uploaded {sent / total:.0%}", end="" if sent < total else "\n")
 
-def get_initial_response(client, pdf_file):
-    """Get initial response from Gemini with the PDF."""
-    initial_prompt = """You are an AI assistant. Your task is to answer questions based ONLY on the content of the provided PDF document.
-    Do not use any external knowledge. If information is not in the document, say so clearly.
-    Please confirm you understand and are ready to answer questions about this document."""
+def upload_pdf(client, pdf_path, manifest):
+    """Upload PDF file using the File API, reusing an earlier upload of the same content."""
+    print(">>> Uploading PDF file (unless it was uploaded recently)...")
+    pdf_file, uploaded = upload_file(client, get_key(), pdf_path, manifest, progress=print_upload_progress)
+    if uploaded:
+        print(">>> PDF uploaded successfully!")
+    else:
+        print(f">>> PDF unchanged since the last upload, reusing {pdf_file.name}")
+    return pdf_file
 
-    response = client.models.generate_content(
-        model="gemini-1.5-flash",
-        contents=[pdf_file, initial_prompt]
-    )
-    return response
+def create_cache(client, pdf_file, pdf_path, manifest):
+    """Cache the PDF and the instructions once, so questions do not resend the document."""
+    cache = DocumentCache(client, MODEL, pdf_file, INSTRUCTIONS, manifest, file_hash(pdf_path))
+    reused = cache.name is not None
+    start = time.perf_counter()
+    if cache.ensure() is not None:
+        if reused:
+            print(f">>> Reusing the context cache {cache.name}")
+        else:
+            print(f">>> Created the context cache {cache.name} in {time.perf_counter() - start:.2f}s")
+    return cache
 
-def ask_question(client, pdf_file, question):
+def ask_question(client, pdf_file, question, cache=None):
     """Ask a question about the PDF and get Gemini's response."""
+    cache_name = cache.ensure() if cache is not None else None
+    if cache_name is not None:
+        try:
+            # The document and the instructions are already in the cache
+            return client.models.generate_content(
+                model=MODEL,
+                contents=[question],
+                config=types.GenerateContentConfig(cached_content=cache_name)
+            )
+        except errors.ClientError as e:
+            if e.code not in (403, 404):
+                raise
+            # The cache expired or was deleted on the server - make a new one and retry once
+            cache.invalidate()
+            if cache.ensure() is not None:
+                return client.models.generate_content(
+                    model=MODEL,
+                    contents=[question],
+                    config=types.GenerateContentConfig(cached_content=cache.name)
+                )
     response = client.models.generate_content(
-        model="gemini-1.5-flash",
-        contents=[pdf_file, question]
+        model=MODEL,
+        contents=[pdf_file, question],
+        config=types.GenerateContentConfig(system_instruction=INSTRUCTIONS)
     )
     return response
 
-def run_qa_loop(client, pdf_file):
+def print_timing(response, seconds):
+    usage = response.usage_metadata
+    prompt_tokens = (usage.prompt_token_count or 0) if usage else 0
+    cached_tokens = (usage.cached_content_token_count or 0) if usage else 0
+    print(f"    ({seconds:.2f}s, {prompt_tokens:,} prompt tokens, {cached_tokens:,} from the cache)")
+
+def run_qa_loop(client, pdf_file, pdf_path, manifest, cache=None):
     """Run the question-answering loop."""
     print(">>> Gemini is ready! Start asking questions.")
     print("--- (Type 'quit' or 'exit' to stop) ---")
+    timings = []
 
     while True:
         try:
@@ -59,27 +106,51 @@ def run_qa_loop(client, pdf_file):
             if question.lower() in ['quit', 'exit']:
                 break
                 
-            response = ask_question(client, pdf_file, question)
+            start = time.perf_counter()
+            try:
+                response = ask_question(client, pdf_file, question, cache)
+            except errors.ClientError as e:
+                if e.code not in (403, 404):
+                    raise
+                # The reused remote file was deleted or expired early - upload it again
+                print(">>> The uploaded PDF is no longer available, uploading it again...")
+                manifest.forget(file_hash(pdf_path))
+                pdf_file = upload_pdf(client, pdf_path, manifest)
+                if cache is not None:
+                    cache = create_cache(client, pdf_file, pdf_path, manifest)
+                response = ask_question(client, pdf_file, question, cache)
+            seconds = time.perf_counter() - start
+            timings.append(seconds)
             print(f"Gemini: {response.text}")
+            print_timing(response, seconds)
             
         except Exception as e:
             print(f"Error: {e}")
             print("Please try again or type 'quit' to exit.")
 
+    if timings:
+        print(f">>> {len(timings)} questions, avg {sum(timings) / len(timings):.2f}s per question")
+
 def main():
+    parser = argparse.ArgumentParser(description="Ask Gemini questions about an uploaded PDF")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="send the whole document with every question (to compare latency)")
+    args = parser.parse_args()
+
     try:
         # Initialize client
         client = initialize_client()
         
-        # Get and upload PDF
+        # Get and upload PDF (skipped when the same file was uploaded recently)
+        manifest = UploadManifest()
         pdf_path = get_pdf_path()
-        pdf_file = upload_pdf(client, pdf_path)
-        
-        # Get initial response
-        get_initial_response(client, pdf_file)
+        pdf_file = upload_pdf(client, pdf_path, manifest)
+
+        # Cache the document for the following questions (unless disabled or not available)
+        cache = None if args.no_cache else create_cache(client, pdf_file, pdf_path, manifest)
         
         # Run Q&A loop
-        run_qa_loop(client, pdf_file)
+        run_qa_loop(client, pdf_file, pdf_path, manifest, cache)
 
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -1,37 +1,34 @@
 from google import genai
-from PyPDF2 import PdfReader, errors as pypdf_errors
+from PyPDF2 import errors as pypdf_errors
 import os
 from intro_gemini.utils import get_key
 import sys
-from google.genai.types import GenerateContentConfig
+from google.genai.types import Content, GenerateContentConfig, Part
+from intro_gemini.pdf_extract import count_pages, file_hash, iter_pages
+from intro_gemini.pdf_retrieval import DocumentRetriever, GeminiEmbedder, HashingEmbedder, build_prompt
+import argparse
+import time
 
-def extract_text(pdf_path):
+def read_pages(pdf_path):
     print(f">>> Reading PDF file: '{pdf_path}'...")
-    extracted_text = ""
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PdfReader(file)
-            num_pages = len(reader.pages)
-
-            if num_pages == 0:
-                print(f"Warning: PDF file '{pdf_path}' contains no pages.")
-                return ""
-
-            print(f">>> Total pages found: {num_pages}")
-            for i, page in enumerate(reader.pages):
-                try:
-                    page_text = page.extract_text()
-                    if page_text:
-                        extracted_text += page_text + "\n"
-                    print(f"\r>>> Processed page {i + 1}/{num_pages}", end="")
-                except Exception as page_error:
-                    print(f"\nError processing page {i + 1}: {page_error}", file=sys.stderr)
-                    continue
-            print("\n>>> PDF text extraction complete (using PyPDF2).")
-
-        if not extracted_text.strip():
+        num_pages = count_pages(pdf_path)
+        if num_pages == 0:
+            print(f"Warning: PDF file '{pdf_path}' contains no pages.")
+            return []
+
+        print(f">>> Total pages found: {num_pages}")
+        # Pages are extracted in parallel (and read from the page cache when seen before)
+        # and put back in page order
+        pages = [None] * num_pages
+        for done, (page_number, page_text) in enumerate(iter_pages(pdf_path, num_pages=num_pages), start=1):
+            pages[page_number] = page_text
+            print(f"\r>>> Processed page {done}/{num_pages}", end="")
+        print("\n>>> PDF text extraction complete (using PyPDF2).")
+
+        if not any(page_text and page_text.strip() for page_text in pages):
             print(f"Warning: No text could be extracted from '{pdf_path}' using PyPDF2. The file might be image-based or use an unsupported format.")
-        return extracted_text
+        return pages
 
     except FileNotFoundError:
         print(f"Error: PDF file not found at path '{pdf_path}'", file=sys.stderr)
@@ -43,7 +40,7 @@ def extract_text(pdf_path):
         print(f"Error reading or processing PDF file '{pdf_path}' with PyPDF2: {e}", file=sys.stderr)
         return None
 
-def init_chat():
+def init_client():
     # Initialize Gemini client
     api_key = get_key()
     if not api_key:
@@ -52,17 +49,17 @@ def init_chat():
 
     client = genai.Client(api_key=api_key)
     print(">>> Successfully initialized the Google Gemini client.")
+    return client
 
-    # Get PDF path and extract text
+def get_pdf_path():
     pdf_path = input(">>> Please enter the path to the PDF file: ").strip()
     if not pdf_path:
         print("Error: PDF path cannot be empty.", file=sys.stderr)
         sys.exit(1)
+    return pdf_path
 
-    pdf_text = extract_text(pdf_path)
-    if pdf_text is None:
-        sys.exit(1)
-
+def full_document_chat(client, pdf_text):
+    """Chat with the whole document in the system prompt (resent with every question)."""
     # Create a system prompt
     system_prompt = f"""You are an AI assistant. Your task is to answer questions based ONLY on the following document content. 
     Do not use any external knowledge. If information is not in the document, say so clearly.
@@ -74,11 +71,78 @@ def init_chat():
 
     # Create chat session with a system prompt
     config = GenerateContentConfig(system_instruction=system_prompt)
-    chat = client.chats.create(model='gemini-2.0-flash', config=config)
-    return chat
+    return client.chats.create(model='gemini-2.0-flash', config=config)
+
+class RetrievalChat:
+    """Chat that gets only the relevant excerpts of the document with each question."""
+
+    def __init__(self, client):
+        system_prompt = """You are an AI assistant. Your task is to answer questions based ONLY on the document excerpts sent with the latest question.
+        Do not use any external knowledge. If information is not in the excerpts, say so clearly.
+        Mention the page numbers of the excerpts you used."""
+        self.client = client
+        self.config = GenerateContentConfig(system_instruction=system_prompt)
+        # Only the questions and answers are kept: the excerpts of earlier questions are not resent
+        self.history = []
+
+    def send_message(self, question, excerpts):
+        prompt = Content(role='user', parts=[Part.from_text(text=build_prompt(question, excerpts))])
+        response = self.client.models.generate_content(
+            model='gemini-2.0-flash', contents=self.history + [prompt], config=self.config)
+        self.history.append(Content(role='user', parts=[Part.from_text(text=question)]))
+        self.history.append(Content(role='model', parts=[Part.from_text(text=response.text or "")]))
+        return response
+
+def init_chat(client, pages, pdf_path, mode, local_embeddings=False):
+    """Create the chats for the mode: {"full document": chat} and/or {"retrieval": (chat, retriever)}."""
+    chats = {}
+    if mode in ('full', 'compare'):
+        chats['full document'] = full_document_chat(client, "".join(page_text + "\n" for page_text in pages if page_text))
+    if mode in ('retrieval', 'compare'):
+        embedder = HashingEmbedder() if local_embeddings else GeminiEmbedder(client)
+        start = time.perf_counter()
+        retriever = DocumentRetriever(pages, file_hash(pdf_path), embedder)
+        action = "Built" if retriever.built else "Loaded"
+        print(f">>> {action} the retrieval index ({len(retriever.chunks)} chunks) in {time.perf_counter() - start:.2f}s")
+        chats['retrieval'] = (RetrievalChat(client), retriever)
+    return chats
+
+def ask(chats, name, question, top_k):
+    """Send a question to one chat; returns (answer, prompt tokens, seconds)."""
+    start = time.perf_counter()
+    if name == 'retrieval':
+        chat, retriever = chats[name]
+        response = chat.send_message(question, retriever.retrieve(question, top_k))
+    else:
+        response = chats[name].send_message(message=question)
+    seconds = time.perf_counter() - start
+    usage = response.usage_metadata
+    return response.text, (usage.prompt_token_count or 0) if usage else 0, seconds
+
+def print_report(stats):
+    print("\n>>> Prompt tokens and latency per question:")
+    for name, runs in stats.items():
+        if runs:
+            tokens = sum(run[0] for run in runs) / len(runs)
+            seconds = sum(run[1] for run in runs) / len(runs)
+            print(f"    {name:<14} {len(runs)} questions, avg {tokens:,.0f} prompt tokens, avg {seconds:.2f}s")
 
 def main():
-    chat = init_chat()
+    parser = argparse.ArgumentParser(description="Ask Gemini questions about a PDF")
+    parser.add_argument("--mode", choices=['retrieval', 'full', 'compare'], default='retrieval',
+                        help="send the top-k chunks (retrieval), the whole document (full) or both and compare")
+    parser.add_argument("--top-k", type=int, default=5, help="chunks sent with each question")
+    parser.add_argument("--local-embeddings", action="store_true",
+                        help="embed chunks locally instead of with the Gemini embedding model")
+    args = parser.parse_args()
+
+    client = init_client()
+    pdf_path = get_pdf_path()
+    pages = read_pages(pdf_path)
+    if pages is None:
+        sys.exit(1)
+    chats = init_chat(client, pages, pdf_path, args.mode, args.local_embeddings)
+    stats = {name: [] for name in chats}
     
     print(">>> Gemini is ready! Start asking questions.")
     print("--- (Type 'quit' or 'exit' to stop) ---")
@@ -89,13 +153,21 @@ def main():
             question = input("You: ").strip()
             if question.lower() in ['quit', 'exit']:
                 break
-                
-            response = chat.send_message(message=question)
-            print(f"Gemini: {response.text}")
+
+            for name in chats:
+                answer, tokens, seconds = ask(chats, name, question, args.top_k)
+                stats[name].append((tokens, seconds))
+                if args.mode == 'compare':
+                    print(f"Gemini ({name}, {tokens:,} prompt tokens, {seconds:.2f}s): {answer}")
+                else:
+                    print(f"Gemini: {answer}")
             
         except Exception as e:
             print(f"Error: {e}")
             print("Please try again or type 'quit' to exit.")
 
+    if args.mode == 'compare':
+        print_report(stats)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
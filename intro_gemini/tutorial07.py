@@ -1,10 +1,11 @@
 from intro_gemini.utils import get_key
+from intro_gemini.chat_runner import ChatRunner
 from google import genai
 from google.genai import types
 
 
-def display_code_execution_result(response):
-    for part in response.candidates[0].content.parts:
+def display_code_execution_result(parts):
+    for part in parts:
         if part.text is not None:
             print(part.text)
         if part.executable_code is not None:
@@ -26,7 +27,8 @@ def init_chat():
             tools=[types.Tool(
                 code_execution=types.ToolCodeExecution
             )])
-    chat = client.chats.create(model='gemini-2.0-flash', config=code_config)
+    # Streams the answers and summarizes older turns when the history gets long
+    chat = ChatRunner(client, model='gemini-2.0-flash', config=code_config)
     
     return chat
 
@@ -36,14 +38,11 @@ def main():
         question = input('[User]: ')
         if question == 'exit' or question == 'quit':
             break
-        response = chat.send_message(message=question)
-        # Only show the text response without warnings
-        if hasattr(response, 'candidates') and len(response.candidates) > 0:
-            text_parts = [part.text for part in response.candidates[0].content.parts if hasattr(part, 'text') and part.text is not None]
-            print('[GenAI]:', ' '.join(text_parts))
-        else:
-            print('[GenAI]:', response.text)
-        #display_code_execution_result(response)
+        # Only the text of the answer is shown (printed as it arrives), not the code parts
+        chat.ask(question)
+        #display_code_execution_result(chat.turns[-1].parts)
+    chat.report()
+    chat.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,108 +1,104 @@
 from intro_gemini.utils import get_key
+from intro_gemini.stub_tool_server import start_stub_server
+from intro_gemini.tool_registry import ToolRegistry
 from google import genai
 from google.genai.types import GenerateContentConfig
-from google.genai import types
+from requests.adapters import HTTPAdapter
+import argparse
 import requests
 
-client = genai.Client(api_key=get_key())
+MAX_TOOL_WORKERS = 8  # function calls of one turn run at the same time
+MAX_TOOL_STEPS = 5    # model turns that may call tools before we stop
+HTTP_TIMEOUT = 10
 
-# Function declarations for APIs
-cat_function = {
-    "name": "get_cat_fact",
-    "description": "Retrieves a random fact about cats from the catfact.ninja API",
-    "parameters": {
-        "type": "object",
-        "properties": {},    # No arguments are required for this function
-        "required": []       
-    }
+# Where the tools get their data (use_api_urls points them at the local stub server)
+API_URLS = {
+    "cat_fact": "https://catfact.ninja/fact",
+    "genderize": "https://api.genderize.io/",
 }
 
-gender_function = {
-    "name": "get_gender",
-    "description": "Predicts the gender of a given name using the genderize.io API",
-    "parameters": {
-        "type": "object",
-        "properties": {
-            "name": {
-                "type": "string",
-                "description": "The name to predict gender for"
-            }
-        },
-        "required": ["name"]
+# One pooled HTTP session for all tool calls, so connections (and TLS handshakes) are reused
+session = requests.Session()
+adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_TOOL_WORKERS)
+session.mount("https://", adapter)
+session.mount("http://", adapter)
+
+# Tools are registered with their cache TTL and timeout; their declarations for the
+# model come from the type hints and docstrings
+registry = ToolRegistry(max_workers=MAX_TOOL_WORKERS)
+
+def use_api_urls(urls):
+    API_URLS.update(urls)
+
+# Function to get a random cat fact from a cat facts API (random, so never cached)
+@registry.tool(ttl=None, timeout=HTTP_TIMEOUT)
+def get_cat_fact() -> str:
+    """Retrieves a random fact about cats from the catfact.ninja API"""
+    response = session.get(API_URLS["cat_fact"], timeout=HTTP_TIMEOUT)
+    return response.json()["fact"]
+
+# Function to predict gender from a name (the same name gives the same answer, so cached for a day)
+@registry.tool(ttl=24 * 3600, timeout=HTTP_TIMEOUT)
+def get_gender(name: str) -> dict:
+    """
+    Predicts the gender of a given name using the genderize.io API
+
+    Args:
+        name: The name to predict gender for
+    """
+    response = session.get(API_URLS["genderize"], params={"name": name}, timeout=HTTP_TIMEOUT)
+    data = response.json()
+    return {
+        "name": data["name"],
+        "gender": data["gender"],
+        "probability": data["probability"],
+        "count": data["count"]
     }
-}
 
 # Generation Config
 config = GenerateContentConfig(
     system_instruction="You are a helpful assistant, you can answer everything. However, when user asks about cats or cat facts, use the get_cat_fact function. When user asks about gender prediction for a name, use the get_gender function. Otherwise, provide a general response from your general knowledge.",
-    tools=[{"function_declarations": [cat_function, gender_function]}]
+    tools=[registry.declarations()]
 )
 
-# Function to get a random cat fact from a cat facts API
-def get_cat_fact():
-    try:
-        response = requests.get("https://catfact.ninja/fact")
-        data = response.json()
-        return data["fact"]
-    except Exception as e:
-        return {"error": str(e)}
-
-# Function to predict gender from a name
-def get_gender(name):
-    try:
-        response = requests.get(f"https://api.genderize.io/?name={name}")
-        data = response.json()
-        return {
-            "name": data["name"],
-            "gender": data["gender"],
-            "probability": data["probability"],
-            "count": data["count"]
-        }
-    except Exception as e:
-        return {"error": str(e)}
-
-# Function dictionary to map the function name to the function
-functions = {
-    "get_cat_fact": get_cat_fact,
-    "get_gender": get_gender
-}
-
-# Helper function to call the function
-def call_function(function_name, **kwargs):
-    return functions[function_name](**kwargs)
-
-# Agentic loop to handle the function call
-def answer_with_function_call(chat, prompt):
+# Agentic loop to handle the function calls
+def answer_with_function_call(chat, prompt, max_steps=MAX_TOOL_STEPS):
     # Send the message to the existing chat session
     response = chat.send_message(message=prompt)
-    
-    # Process the response and handle function calls if needed
-    for part in response.candidates[0].content.parts:
-        if part.function_call:
-            function_call = part.function_call
-            # Call the tool with arguments
-            tool_result = call_function(function_call.name, **function_call.args)
-            # Build the function response
-            function_response_part = types.Part.from_function_response(
-                name=function_call.name,
-                response={"result": tool_result},
-            )
-            # Send the function result back to the model, the model will use the function result to generate a response
-            response = chat.send_message(function_response_part)
-    
+    model_calls = 1
+
+    # While the model asks for tools: run them all at the same time, then send every result
+    # back in one message (one model round trip per step instead of one per function call)
+    steps = 0
+    while response.function_calls and steps < max_steps:
+        function_response_parts = registry.function_responses(response.function_calls)
+        response = chat.send_message(function_response_parts)
+        model_calls += 1
+        steps += 1
+
     # Return the final response
-    if response and response.candidates and response.candidates[0].content.parts:
-        return response.candidates[0].content.parts[0].text.strip()
-    return "Sorry, I couldn't generate a response."
+    if response.text:
+        return response.text.strip(), model_calls
+    return "Sorry, I couldn't generate a response.", model_calls
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chat with Gemini using function calling")
+    parser.add_argument("--stub", action="store_true", help="answer tool calls from a local stub server")
+    args = parser.parse_args()
+    if args.stub:
+        use_api_urls(start_stub_server().urls())
 
-# Main chat loop
-# Create a chat session
-chat = client.chats.create(model='gemini-2.0-flash', config=config)
-print("Welcome to the AI Chat! Type 'exit' to quit.")
-while True:
-    user_input = input("You: ")
-    if user_input.lower() in ['exit', 'quit']:
-        print("Goodbye!")
-        break
-    response = answer_with_function_call(chat, user_input)
-    print("AI:", response)
\ No newline at end of file
+    # Main chat loop
+    # Create a chat session
+    client = genai.Client(api_key=get_key())
+    chat = client.chats.create(model='gemini-2.0-flash', config=config)
+    print("Welcome to the AI Chat! Type 'exit' to quit.")
+    while True:
+        user_input = input("You: ")
+        if user_input.lower() in ['exit', 'quit']:
+            print("Goodbye!")
+            print(registry.report())
+            break
+        response, model_calls = answer_with_function_call(chat, user_input)
+        print("AI:", response)
+        print(f"    ({model_calls} model calls)")
@@ -1,6 +1,6 @@
 # Utility functions for the intro_gemini package
-# read keys.txt to get the key
+from llm_client import get_key as read_key
+
+# read keys.txt to get the key (read once and shared with the other tutorials)
 def get_key(model='gemini'):
-    with open('keys.txt') as f:
-        key = f.readline().strip().split(':')[-1] # keyname:key
-    return key
\ No newline at end of file
+    return read_key(model) # keyname:key
\ No newline at end of file
@@ -1,23 +1,30 @@
-from openai import OpenAI
-from utils import get_key
+import asyncio
+import os
+import sys
+
+# The shared llm_client package lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_client import get_client
 
 # This is a simple example of how to use the OpenAI API to chat with a model.
-# It uses the OpenAI Python client library to send a message to the model and receive a response.
+# It uses the shared async client (llm_client), which wraps the OpenAI Python client library
+# with connection reuse, rate limiting and retries, to send a message and receive a response.
 # In this example, model cannot remember the previous conversation.
 
-client = OpenAI(api_key=get_key())
+client = get_client('openai', model='gpt-4.1')
 
-while True:
-    try:
-        question = input('[User]: ')
-        if question == 'exit' or question == 'quit':
+async def main():
+    while True:
+        try:
+            question = await asyncio.to_thread(input, '[User]: ')
+            if question == 'exit' or question == 'quit':
+                break
+            # generate a response
+            response = await client.complete(question)
+            print('[AI]:', response.text)
+        except Exception as e:
+            print(e)
             break
-        # generate a response
-        response = client.chat.completions.create(
-            model='gpt-4.1',
-            messages=[{'role': 'user', 'content': question}]
-        )
-        print('[AI]:', response.choices[0].message.content)
-    except Exception as e:
-        print(e)
-        break
\ No newline at end of file
+    await client.close()
+
+asyncio.run(main())
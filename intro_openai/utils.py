@@ -1,9 +1,14 @@
 # Utility functions for the intro_gemini package
-# read keys.txt to get the key
+import os
+import sys
+
+# The shared llm_client package lives in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_client import get_key as read_key
+
+# read keys.txt to get the key (read once and shared with the other tutorials)
 def get_key():
-    with open('keys.txt') as f:
-        key = f.readline().strip().split(':')[-1] # keyname:key
-    return key
+    return read_key('openai') # keyname:key
 
 def print_message_content(content):
     full_response = []
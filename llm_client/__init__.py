@@ -0,0 +1,13 @@
+# Shared async LLM client for the tutorials
+# Usage:
+#   from llm_client import get_client
+#   client = get_client("gemini")
+#   answer = await client.complete("What is 1 + 1?")
+from llm_client.client import Completion, LLMClient, build_messages, get_client
+from llm_client.keys import get_key
+from llm_client.limits import RateLimiter, TokenBucket, backoff_delay, is_retryable
+
+__all__ = [
+    "Completion", "LLMClient", "build_messages", "get_client", "get_key",
+    "RateLimiter", "TokenBucket", "backoff_delay", "is_retryable",
+]
@@ -0,0 +1,115 @@
+# Provider backends: turn one chat request into one API call
+# Each backend creates its SDK client once and reuses it, so HTTP connections stay
+# open between calls. Provider packages are imported only when their backend is used.
+# Messages use the OpenAI chat format: {"role": "system" | "user" | "assistant", "content": str}
+
+
+class OpenAIBackend:
+    default_model = "gpt-4.1"
+
+    def __init__(self, api_key, base_url=None, max_connections=20, timeout=60.0):
+        from openai import DEFAULT_CONNECTION_LIMITS, AsyncOpenAI, DefaultAsyncHttpxClient
+
+        # Limits class of whichever HTTP library this openai version is built on
+        limits = type(DEFAULT_CONNECTION_LIMITS)(max_connections=max_connections,
+                                                 max_keepalive_connections=max_connections)
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            timeout=timeout,
+            max_retries=0,  # retries are done by LLMClient so they share its rate limiter
+            http_client=DefaultAsyncHttpxClient(limits=limits),
+        )
+
+    async def complete(self, model, messages, max_tokens=None, temperature=None):
+        """
+        Returns:
+            tuple: (text, input tokens, output tokens)
+        """
+        options = {"max_tokens": max_tokens, "temperature": temperature}
+        response = await self.client.chat.completions.create(
+            model=model, messages=messages,
+            **{name: value for name, value in options.items() if value is not None},
+        )
+        usage = response.usage
+        return (response.choices[0].message.content or "",
+                usage.prompt_tokens if usage else 0, usage.completion_tokens if usage else 0)
+
+    async def stream(self, model, messages, max_tokens=None, temperature=None):
+        """
+        Yields:
+            tuple: (text delta, input tokens, output tokens); the token counts are 0 until
+            the last chunk
+        """
+        options = {"max_tokens": max_tokens, "temperature": temperature}
+        chunks = await self.client.chat.completions.create(
+            model=model, messages=messages, stream=True, stream_options={"include_usage": True},
+            **{name: value for name, value in options.items() if value is not None},
+        )
+        async for chunk in chunks:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            usage = chunk.usage
+            if text or usage:
+                yield (text or "", usage.prompt_tokens if usage else 0, usage.completion_tokens if usage else 0)
+
+    async def close(self):
+        await self.client.close()
+
+
+class GeminiBackend:
+    default_model = "gemini-2.0-flash"
+
+    def __init__(self, api_key, base_url=None, max_connections=20, timeout=60.0):
+        from google import genai
+        from google.genai import types
+
+        # The async client keeps its own connection pool, which is reused for every call
+        # (google-genai does not expose its size, so max_connections is not used here)
+        http_options = types.HttpOptions(base_url=base_url, timeout=int(timeout * 1000))
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
+
+    def request(self, messages, max_tokens, temperature):
+        """(contents, config) of the Gemini call for OpenAI-style messages."""
+        system = "\n".join(message["content"] for message in messages if message["role"] == "system")
+        contents = [{"role": "model" if message["role"] == "assistant" else "user",
+                     "parts": [{"text": message["content"]}]}
+                    for message in messages if message["role"] != "system"]
+        config = {"system_instruction": system or None, "max_output_tokens": max_tokens,
+                  "temperature": temperature}
+        return contents, {name: value for name, value in config.items() if value is not None}
+
+    async def complete(self, model, messages, max_tokens=None, temperature=None):
+        """
+        Returns:
+            tuple: (text, input tokens, output tokens)
+        """
+        contents, config = self.request(messages, max_tokens, temperature)
+        response = await self.client.aio.models.generate_content(model=model, contents=contents, config=config)
+        usage = response.usage_metadata
+        return (response.text or "",
+                (usage.prompt_token_count or 0) if usage else 0,
+                (usage.candidates_token_count or 0) if usage else 0)
+
+    async def stream(self, model, messages, max_tokens=None, temperature=None):
+        """
+        Yields:
+            tuple: (text delta, input tokens, output tokens); every chunk carries the
+            token counts so far
+        """
+        contents, config = self.request(messages, max_tokens, temperature)
+        chunks = await self.client.aio.models.generate_content_stream(model=model, contents=contents, config=config)
+        async for chunk in chunks:
+            usage = chunk.usage_metadata
+            text = "".join(part.text for part in (chunk.candidates[0].content.parts or [])
+                           if part.text) if chunk.candidates and chunk.candidates[0].content else ""
+            yield (text,
+                   (usage.prompt_token_count or 0) if usage else 0,
+                   (usage.candidates_token_count or 0) if usage else 0)
+
+    async def close(self):
+        close = getattr(self.client.aio, "aclose", None)
+        if close is not None:
+            await close()
+
+
+BACKENDS = {"openai": OpenAIBackend, "gemini": GeminiBackend}
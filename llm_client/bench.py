@@ -0,0 +1,383 @@
+# Latency and throughput benchmark of the Gemini and OpenAI chat APIs
+# Runs a prompt set through the call patterns of the tutorials, at several concurrency
+# levels, against each provider/model given, and reports per combination:
+#   p50 / p95 latency, p50 / p95 time to first token (TTFT: first text of the answer),
+#   output tokens per second (all requests together, and per request while generating)
+#   and the error rate.
+# Scenarios (the tutorial call patterns):
+#   generate          one prompt, no history (intro_gemini tutorial01, intro_openai tutorial_01)
+#   chat              the prompt after two earlier turns (tutorial02)
+#   system            the prompt with a system instruction (tutorial03)
+#   code_execution    with the code execution tool (tutorial07, Gemini only)
+#   function_calling  a function declaration, the function result sent back, then the answer (tutorial08)
+# Every request is streamed, so TTFT can be measured, and nothing is retried, so errors show.
+# With --mock the requests go to a local mock server (llm_client/mock_server.py) and no keys are needed.
+#
+# Usage: python3 -m llm_client.bench [--targets gemini:gemini-2.0-flash openai:gpt-4.1]
+#                                    [--scenarios generate,chat] [--concurrency 1,4,16]
+#                                    [--prompts prompts.txt] [--repeat 1] [--mock] [--json bench.json]
+import argparse
+import asyncio
+import json
+import math
+import time
+
+from llm_client.backends import BACKENDS
+from llm_client.keys import get_key
+from llm_client.limits import status_code
+from llm_client.mock_server import start_mock_server
+
+DEFAULT_TARGETS = ["gemini:gemini-2.0-flash", "openai:gpt-4.1"]
+SCENARIOS = ["generate", "chat", "system", "code_execution", "function_calling"]
+DEFAULT_PROMPTS = [
+    "Explain in two sentences what a token bucket rate limiter does.",
+    "What is the difference between latency and throughput?",
+    "Give three tips for writing clear commit messages.",
+    "Why do HTTP clients keep connections open between requests?",
+    "Summarize the idea of exponential backoff with jitter.",
+    "What does time to first token measure for a language model?",
+    "Name two ways to make a chat history use fewer tokens.",
+    "When is streaming a response worth the extra complexity?",
+]
+CHAT_HISTORY = [
+    ("user", "Hi! I'm preparing a short talk about web performance."),
+    ("assistant", "Great topic. What should the talk cover?"),
+    ("user", "Mostly how to measure and reduce response times of an API."),
+    ("assistant", "Then percentiles, caching and connection reuse are good places to start."),
+]
+SYSTEM_PROMPT = "You are a concise assistant. Answer in at most three sentences."
+CODE_PROMPT = ("You are an AI assistant. Use code execution to answer questions that need calculation, "
+               "for example counting the characters of a word.")
+FUNCTION_PROMPT = "Use the get_gender function to predict the gender of Alex, then answer: "
+GENDER_FUNCTION = {
+    "name": "get_gender",
+    "description": "Predicts the gender of a given name",
+    "parameters": {"type": "object", "properties": {"name": {"type": "string", "description": "The name"}},
+                   "required": ["name"]},
+}
+
+
+def get_gender(name):
+    """Local stand-in for the tutorial08 tool, so only model calls are measured."""
+    return {"name": name, "gender": "unknown", "probability": 0.5, "count": 0}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list (None if empty)."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+class Measurement:
+    """Timing and token counts of one benchmark request."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.first_token_seconds = None
+        self.seconds = None
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def text_arrived(self):
+        if self.first_token_seconds is None:
+            self.first_token_seconds = time.perf_counter() - self.start
+
+    def add_usage(self, input_tokens, output_tokens):
+        self.input_tokens += input_tokens or 0
+        self.output_tokens += output_tokens or 0
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.start
+        return self
+
+
+# --- Gemini ----------------------------------------------------------------------------
+
+async def gemini_call(client, model, contents, config, measurement):
+    """One streamed call; returns all parts of the answer."""
+    parts, usage = [], None
+    async for chunk in await client.aio.models.generate_content_stream(model=model, contents=contents, config=config):
+        usage = chunk.usage_metadata or usage
+        if chunk.candidates and chunk.candidates[0].content:
+            for part in chunk.candidates[0].content.parts or []:
+                parts.append(part)
+                if part.text:
+                    measurement.text_arrived()
+    if usage:
+        measurement.add_usage(usage.prompt_token_count, usage.candidates_token_count)
+    return parts
+
+
+async def gemini_request(client, model, scenario, prompt, max_tokens):
+    from google.genai import types
+
+    measurement = Measurement()
+    config = {"max_output_tokens": max_tokens}
+    contents = [types.Content(role="user", parts=[types.Part(text=prompt)])]
+    if scenario == "chat":
+        history = [types.Content(role="model" if role == "assistant" else "user", parts=[types.Part(text=text)])
+                   for role, text in CHAT_HISTORY]
+        contents = history + contents
+    elif scenario == "system":
+        config["system_instruction"] = SYSTEM_PROMPT
+    elif scenario == "code_execution":
+        config["system_instruction"] = CODE_PROMPT
+        config["tools"] = [types.Tool(code_execution=types.ToolCodeExecution())]
+    elif scenario == "function_calling":
+        contents = [types.Content(role="user", parts=[types.Part(text=FUNCTION_PROMPT + prompt)])]
+        config["tools"] = [types.Tool(function_declarations=[types.FunctionDeclaration(**GENDER_FUNCTION)])]
+    config = types.GenerateContentConfig(**config)
+
+    parts = await gemini_call(client, model, contents, config, measurement)
+    calls = [part.function_call for part in parts if part.function_call]
+    if calls:
+        # All function results go back in one message, then the model answers
+        contents += [types.Content(role="model", parts=parts),
+                     types.Content(role="user", parts=[
+                         types.Part.from_function_response(name=call.name, response={"result": get_gender(**(call.args or {}))})
+                         for call in calls])]
+        await gemini_call(client, model, contents, config, measurement)
+    return measurement.finish()
+
+
+# --- OpenAI ----------------------------------------------------------------------------
+
+async def openai_call(client, model, messages, options, measurement):
+    """One streamed call; returns (text, tool calls)."""
+    stream = await client.chat.completions.create(model=model, messages=messages, stream=True,
+                                                  stream_options={"include_usage": True}, **options)
+    text, calls = [], {}
+    async for chunk in stream:
+        if chunk.usage:
+            measurement.add_usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            measurement.text_arrived()
+            text.append(delta.content)
+        # Tool calls arrive in pieces, keyed by their index
+        for piece in delta.tool_calls or []:
+            call = calls.setdefault(piece.index, {"id": None, "name": "", "arguments": ""})
+            call["id"] = piece.id or call["id"]
+            if piece.function:
+                call["name"] += piece.function.name or ""
+                call["arguments"] += piece.function.arguments or ""
+    return "".join(text), [calls[index] for index in sorted(calls)]
+
+
+async def openai_request(client, model, scenario, prompt, max_tokens):
+    measurement = Measurement()
+    options = {"max_tokens": max_tokens}
+    messages = [{"role": "user", "content": prompt}]
+    if scenario == "chat":
+        messages = [{"role": role, "content": text} for role, text in CHAT_HISTORY] + messages
+    elif scenario == "system":
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}] + messages
+    elif scenario == "function_calling":
+        messages = [{"role": "user", "content": FUNCTION_PROMPT + prompt}]
+        options["tools"] = [{"type": "function", "function": GENDER_FUNCTION}]
+
+    text, calls = await openai_call(client, model, messages, options, measurement)
+    if calls:
+        messages.append({"role": "assistant", "content": text or None, "tool_calls": [
+            {"id": call["id"], "type": "function", "function": {"name": call["name"], "arguments": call["arguments"]}}
+            for call in calls]})
+        for call in calls:
+            result = get_gender(**json.loads(call["arguments"] or "{}"))
+            messages.append({"role": "tool", "tool_call_id": call["id"], "content": json.dumps(result)})
+        await openai_call(client, model, messages, options, measurement)
+    return measurement.finish()
+
+
+REQUESTS = {"gemini": gemini_request, "openai": openai_request}
+UNSUPPORTED = {("openai", "code_execution")}  # chat completions have no code execution tool
+
+
+# --- Runner ----------------------------------------------------------------------------
+
+async def run_one(request, client, model, scenario, prompt, max_tokens, timeout, semaphore):
+    async with semaphore:
+        try:
+            return await asyncio.wait_for(request(client, model, scenario, prompt, max_tokens), timeout)
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                return "timeout"
+            return str(status_code(e) or type(e).__name__)
+
+
+def summarize(results, wall_seconds):
+    measurements = [result for result in results if isinstance(result, Measurement)]
+    errors = {}
+    for result in results:
+        if not isinstance(result, Measurement):
+            errors[result] = errors.get(result, 0) + 1
+    latencies = sorted(m.seconds for m in measurements)
+    first_tokens = sorted(m.first_token_seconds for m in measurements if m.first_token_seconds is not None)
+    # Generation speed of each request: output tokens over the time after the first token
+    decode_speeds = sorted(m.output_tokens / (m.seconds - m.first_token_seconds) for m in measurements
+                           if m.first_token_seconds is not None and m.seconds > m.first_token_seconds)
+    output_tokens = sum(m.output_tokens for m in measurements)
+    return {
+        "requests": len(results),
+        "errors": len(results) - len(measurements),
+        "error_rate": (len(results) - len(measurements)) / len(results) if results else 0.0,
+        "error_kinds": errors,
+        "latency_p50": percentile(latencies, 0.5),
+        "latency_p95": percentile(latencies, 0.95),
+        "ttft_p50": percentile(first_tokens, 0.5),
+        "ttft_p95": percentile(first_tokens, 0.95),
+        "input_tokens": sum(m.input_tokens for m in measurements),
+        "output_tokens": output_tokens,
+        "tokens_per_second": output_tokens / wall_seconds if wall_seconds else 0.0,
+        "request_tokens_per_second_p50": percentile(decode_speeds, 0.5),
+        "wall_seconds": wall_seconds,
+    }
+
+
+async def run_benchmark(targets, scenarios, concurrency_levels, prompts, repeat=1, max_tokens=256, timeout=60.0,
+                        base_urls=None, api_keys=None):
+    """
+    Run every target x scenario x concurrency combination.
+
+    Args:
+        targets (list): (provider, model) pairs
+        scenarios (list): Scenario names from SCENARIOS
+        concurrency_levels (list): Requests in flight at the same time
+        prompts (list): Prompt texts, each sent `repeat` times per combination
+        base_urls (dict): provider -> API base URL (e.g. the mock server)
+        api_keys (dict): provider -> key to use instead of keys.txt
+
+    Returns:
+        list: One result dict per combination
+    """
+    base_urls = base_urls or {}
+    api_keys = api_keys or {}
+    backends = {}
+    rows = []
+    try:
+        for provider, model in targets:
+            if provider not in backends:
+                # The backend's SDK client (with its connection pool) is shared by all requests
+                backends[provider] = BACKENDS[provider](api_keys.get(provider) or get_key(provider),
+                                                        base_url=base_urls.get(provider),
+                                                        max_connections=max(concurrency_levels), timeout=timeout)
+            client = backends[provider].client
+            for scenario in scenarios:
+                if (provider, scenario) in UNSUPPORTED:
+                    continue
+                for concurrency in concurrency_levels:
+                    semaphore = asyncio.Semaphore(concurrency)
+                    start = time.perf_counter()
+                    results = await asyncio.gather(*[
+                        run_one(REQUESTS[provider], client, model, scenario, prompt, max_tokens, timeout, semaphore)
+                        for prompt in prompts * repeat])
+                    row = {"provider": provider, "model": model, "scenario": scenario, "concurrency": concurrency}
+                    row.update(summarize(results, time.perf_counter() - start))
+                    rows.append(row)
+                    print_row(row)
+    finally:
+        for backend in backends.values():
+            await backend.close()
+    return rows
+
+
+# --- Output ----------------------------------------------------------------------------
+
+COLUMNS = [("provider", "provider", 9, "s"), ("model", "model", 22, "s"), ("scenario", "scenario", 17, "s"),
+           ("concurrency", "conc", 5, "d"), ("requests", "reqs", 5, "d"), ("error_rate", "errors", 7, ".0%"),
+           ("latency_p50", "p50", 7, "s"), ("latency_p95", "p95", 7, "s"), ("ttft_p50", "ttft50", 7, "s"),
+           ("ttft_p95", "ttft95", 7, "s"), ("tokens_per_second", "tok/s", 7, ".0f"),
+           ("request_tokens_per_second_p50", "req tok/s", 10, ".0f")]
+SECONDS_COLUMNS = {"latency_p50", "latency_p95", "ttft_p50", "ttft_p95"}
+
+
+def format_cell(row, key, width, spec):
+    value = row[key]
+    if value is None:
+        text = "-"
+    elif key in SECONDS_COLUMNS:
+        text = f"{value:.2f}s"
+    else:
+        text = format(value, spec)
+    return text.ljust(width) if spec == "s" and key not in SECONDS_COLUMNS else text.rjust(width)
+
+
+def print_header():
+    print(" ".join(title.ljust(width) if spec == "s" and key not in SECONDS_COLUMNS else title.rjust(width)
+                   for key, title, width, spec in COLUMNS))
+
+
+def print_row(row):
+    print(" ".join(format_cell(row, key, width, spec) for key, title, width, spec in COLUMNS))
+
+
+def load_prompts(path):
+    """Prompts from a text file (one per line) or a JSONL file ({"prompt": ...} per line)."""
+    with open(path, encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if path.endswith(".jsonl"):
+        return [json.loads(line)["prompt"] for line in lines]
+    return lines
+
+
+def parse_targets(values):
+    targets = []
+    for value in values:
+        provider, _, model = value.partition(":")
+        if provider not in BACKENDS:
+            raise SystemExit(f"Unknown provider '{provider}' (use {', '.join(BACKENDS)})")
+        targets.append((provider, model or BACKENDS[provider].default_model))
+    return targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency and throughput benchmark of the Gemini and OpenAI APIs")
+    parser.add_argument("--targets", nargs="+", default=DEFAULT_TARGETS, help="provider:model pairs to compare")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated tutorial call patterns")
+    parser.add_argument("--concurrency", default="1,4", help="comma-separated requests in flight")
+    parser.add_argument("--prompts", help="prompt file: one prompt per line, or JSONL with a 'prompt' field")
+    parser.add_argument("--repeat", type=int, default=1, help="times each prompt is sent per combination")
+    parser.add_argument("--max-tokens", type=int, default=256)
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds before a request counts as an error")
+    parser.add_argument("--base-url", action="append", default=[], metavar="PROVIDER=URL",
+                        help="send a provider's requests to another endpoint, e.g. a mock server")
+    parser.add_argument("--mock", action="store_true", help="start the local mock server and use it for every provider")
+    parser.add_argument("--mock-first-token-latency", type=float, default=0.3)
+    parser.add_argument("--mock-token-latency", type=float, default=0.01)
+    parser.add_argument("--mock-error-rate", type=float, default=0.0)
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    targets = parse_targets(args.targets)
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))} (use {', '.join(SCENARIOS)})")
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+    prompts = load_prompts(args.prompts) if args.prompts else DEFAULT_PROMPTS
+    base_urls = dict(value.split("=", 1) for value in args.base_url)
+    api_keys = {}
+    server = None
+    if args.mock:
+        server = start_mock_server(first_token_latency=args.mock_first_token_latency,
+                                   token_latency=args.mock_token_latency, error_rate=args.mock_error_rate)
+        base_urls = server.base_urls()
+        api_keys = {provider: "mock-key" for provider in BACKENDS}
+
+    print(f">>> {len(prompts) * args.repeat} requests per row{' (mock server)' if server else ''}")
+    print_header()
+    rows = asyncio.run(run_benchmark(targets, scenarios, concurrency_levels, prompts, args.repeat,
+                                     args.max_tokens, args.timeout, base_urls, api_keys))
+    if server is not None:
+        server.shutdown()
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"targets": args.targets, "scenarios": scenarios, "concurrency": concurrency_levels,
+                       "prompts": len(prompts), "repeat": args.repeat, "mock": args.mock, "results": rows}, f, indent=2)
+        print(f">>> Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# Provider-agnostic async LLM client
+# One LLMClient per provider is shared by everything in the process (see get_client):
+#   - the API key is read once and the SDK client is reused, so connections stay open
+#   - a token bucket limits requests and tokens per minute across all callers
+#   - rate limits (429), server errors (5xx) and dropped connections are retried with
+#     jittered exponential backoff, honouring Retry-After
+#   - identical requests that are in flight at the same time share one API call
+import asyncio
+import json
+import time
+
+from llm_client.backends import BACKENDS
+from llm_client.keys import get_key
+from llm_client.limits import RateLimiter, backoff_delay, is_retryable
+
+# Output tokens reserved for a request that does not set max_tokens
+DEFAULT_OUTPUT_ESTIMATE = 500
+
+
+def estimate_tokens(messages):
+    """Rough prompt size: about four characters per token."""
+    return sum(len(message["content"]) for message in messages) // 4 + 1
+
+
+def build_messages(prompt=None, messages=None, system=None):
+    """
+    Build a chat message list from a prompt and/or earlier messages.
+
+    Args:
+        prompt (str): The new user message (optional if messages are given)
+        messages (list): Earlier {"role", "content"} messages
+        system (str): Optional system instruction put in front
+
+    Returns:
+        list: Messages in the OpenAI chat format
+    """
+    result = [{"role": "system", "content": system}] if system else []
+    result += list(messages or [])
+    if prompt is not None:
+        result.append({"role": "user", "content": prompt})
+    return result
+
+
+class Completion:
+    """Result of one request."""
+
+    def __init__(self, text, model, input_tokens, output_tokens, seconds, attempts, first_token_seconds=None):
+        self.text = text
+        self.model = model
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.seconds = seconds  # from the first attempt to the answer, including retries
+        self.attempts = attempts
+        self.first_token_seconds = first_token_seconds  # streamed requests only
+
+    def __str__(self):
+        return self.text
+
+
+class LLMClient:
+    """
+    Async chat client with connection reuse, rate limiting, retries and request coalescing.
+    Use one instance inside one event loop.
+    """
+
+    def __init__(self, provider="openai", model=None, requests_per_minute=60, tokens_per_minute=None,
+                 max_attempts=5, base_delay=1.0, max_delay=30.0, max_connections=20, timeout=60.0,
+                 base_url=None, api_key=None):
+        """
+        Args:
+            provider (str): "openai" or "gemini"
+            model (str): Default model (the provider's default if None)
+            requests_per_minute (float): Maximum requests per minute across all callers
+            tokens_per_minute (float): Maximum prompt + output tokens per minute (None for no limit)
+            max_attempts (int): Attempts per request before the error is raised
+            base_delay (float): First retry delay in seconds, doubled on every retry
+            max_delay (float): Longest wait between two attempts
+            max_connections (int): Size of the HTTP connection pool
+            timeout (float): Seconds before a single attempt is abandoned
+            base_url (str): Alternative API endpoint, e.g. a local mock server
+            api_key (str): Key to use instead of the one in the environment or keys.txt
+        """
+        backend_class = BACKENDS[provider]
+        self.provider = provider
+        self.model = model or backend_class.default_model
+        self.backend = backend_class(api_key or get_key(provider), base_url=base_url,
+                                     max_connections=max_connections, timeout=timeout)
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.in_flight = {}  # request key -> task shared by identical concurrent requests
+        self.stats = {"requests": 0, "coalesced": 0, "retries": 0, "failures": 0,
+                      "input_tokens": 0, "output_tokens": 0, "seconds": 0.0}
+
+    async def complete(self, prompt=None, messages=None, system=None, model=None, max_tokens=None,
+                       temperature=None):
+        """
+        Send a chat request.
+
+        Args:
+            prompt (str): The new user message
+            messages (list): Earlier {"role", "content"} messages of the conversation
+            system (str): Optional system instruction
+            model (str): Model for this request (the client's default if None)
+            max_tokens (int): Maximum output tokens
+            temperature (float): Sampling temperature
+
+        Returns:
+            Completion: The answer text with token counts and timing
+        """
+        messages = build_messages(prompt, messages, system)
+        model = model or self.model
+        key = json.dumps([model, messages, max_tokens, temperature], sort_keys=True)
+        task = self.in_flight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(self.request(model, messages, max_tokens, temperature))
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _task: self.in_flight.pop(key, None))
+        # shield: a caller that gives up must not cancel the call for the others sharing it
+        return await asyncio.shield(task)
+
+    async def request(self, model, messages, max_tokens, temperature):
+        estimate = estimate_tokens(messages) + (max_tokens or DEFAULT_OUTPUT_ESTIMATE)
+        start = time.perf_counter()
+        for attempt in range(1, self.max_attempts + 1):
+            await self.limiter.acquire(estimate)
+            self.stats["requests"] += 1
+            try:
+                text, input_tokens, output_tokens = await self.backend.complete(
+                    model, messages, max_tokens=max_tokens, temperature=temperature)
+            except Exception as e:
+                if attempt == self.max_attempts or not is_retryable(e):
+                    self.stats["failures"] += 1
+                    raise
+                self.stats["retries"] += 1
+                await asyncio.sleep(backoff_delay(attempt, self.base_delay, self.max_delay, e))
+                continue
+            self.limiter.adjust(input_tokens + output_tokens - estimate)
+            seconds = time.perf_counter() - start
+            self.stats["input_tokens"] += input_tokens
+            self.stats["output_tokens"] += output_tokens
+            self.stats["seconds"] += seconds
+            return Completion(text, model, input_tokens, output_tokens, seconds, attempt)
+
+    async def stream(self, prompt=None, messages=None, system=None, model=None, max_tokens=None,
+                     temperature=None, on_text=None):
+        """
+        Send a chat request and receive the answer as it is generated. Streamed requests
+        are rate limited like the others but never shared, and are retried only until
+        the first text has arrived.
+
+        Args:
+            prompt, messages, system, model, max_tokens, temperature: As for complete()
+            on_text (callable): Called with each piece of text as it arrives
+
+        Returns:
+            Completion: The whole answer, with first_token_seconds set
+        """
+        messages = build_messages(prompt, messages, system)
+        model = model or self.model
+        estimate = estimate_tokens(messages) + (max_tokens or DEFAULT_OUTPUT_ESTIMATE)
+        start = time.perf_counter()
+        for attempt in range(1, self.max_attempts + 1):
+            await self.limiter.acquire(estimate)
+            self.stats["requests"] += 1
+            pieces, first_token_seconds = [], None
+            input_tokens = output_tokens = 0
+            try:
+                async for text, chunk_input, chunk_output in self.backend.stream(
+                        model, messages, max_tokens=max_tokens, temperature=temperature):
+                    input_tokens = chunk_input or input_tokens
+                    output_tokens = chunk_output or output_tokens
+                    if text:
+                        if first_token_seconds is None:
+                            first_token_seconds = time.perf_counter() - start
+                        pieces.append(text)
+                        if on_text is not None:
+                            on_text(text)
+            except Exception as e:
+                # Text already handed to on_text cannot be taken back, so no retry after it
+                if pieces or attempt == self.max_attempts or not is_retryable(e):
+                    self.stats["failures"] += 1
+                    raise
+                self.stats["retries"] += 1
+                await asyncio.sleep(backoff_delay(attempt, self.base_delay, self.max_delay, e))
+                continue
+            self.limiter.adjust(input_tokens + output_tokens - estimate)
+            seconds = time.perf_counter() - start
+            self.stats["input_tokens"] += input_tokens
+            self.stats["output_tokens"] += output_tokens
+            self.stats["seconds"] += seconds
+            return Completion("".join(pieces), model, input_tokens, output_tokens, seconds, attempt,
+                              first_token_seconds)
+
+    async def close(self):
+        """Close the HTTP connections."""
+        await self.backend.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def report(self):
+        """
+        Summarize the client's traffic.
+
+        Returns:
+            str: Requests, coalesced requests, retries, tokens and rate-limit waiting
+        """
+        stats = self.stats
+        answered = stats["requests"] - stats["retries"] - stats["failures"]
+        average = stats["seconds"] / answered if answered else 0.0
+        return (f"LLM client ({self.provider}): {stats['requests']} API calls, "
+                f"{stats['coalesced']} duplicate requests shared a call, {stats['retries']} retries, "
+                f"{stats['failures']} failures, {stats['input_tokens']} input / {stats['output_tokens']} "
+                f"output tokens, avg {average:.2f}s per answer, {self.limiter.waited:.1f}s rate-limited")
+
+
+_clients = {}
+
+
+def get_client(provider="openai", **options):
+    """
+    The process-wide client for a provider, created on first use.
+
+    Args:
+        provider (str): "openai" or "gemini"
+        **options: LLMClient arguments, used only when the client is created
+
+    Returns:
+        LLMClient: The shared client
+    """
+    if provider not in _clients:
+        _clients[provider] = LLMClient(provider, **options)
+    return _clients[provider]
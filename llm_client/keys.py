@@ -0,0 +1,65 @@
+# API keys for every tutorial, read once per process
+# keys.txt holds one "label:key" line per provider, e.g.
+#   openai:sk-...
+#   gemini:AIza...
+# A key set in the environment (OPENAI_API_KEY, GEMINI_API_KEY) takes precedence.
+# Files with a single line keep working: that key is used for every provider.
+import os
+import threading
+
+KEY_FILE = "keys.txt"
+ENVIRONMENT_VARIABLES = {"openai": "OPENAI_API_KEY", "gemini": "GEMINI_API_KEY"}
+
+# keys.txt is looked up in the working directory first, then in the repository root
+SEARCH_DIRECTORIES = [".", os.path.dirname(os.path.dirname(os.path.abspath(__file__)))]
+
+_keys = None
+_lock = threading.Lock()
+
+
+def read_keys():
+    """
+    Read keys.txt once and keep the result.
+
+    Returns:
+        list: (label, key) pairs in file order
+
+    Raises:
+        FileNotFoundError: If no keys.txt is found
+    """
+    global _keys
+    with _lock:
+        if _keys is None:
+            for directory in SEARCH_DIRECTORIES:
+                path = os.path.join(directory, KEY_FILE)
+                if os.path.exists(path):
+                    with open(path) as f:
+                        lines = [line.strip() for line in f if line.strip()]
+                    # keyname:key - the label is everything before the last colon
+                    _keys = [(line.rsplit(":", 1)[0].lower() if ":" in line else "", line.split(":")[-1])
+                             for line in lines]
+                    break
+            else:
+                raise FileNotFoundError(f"{KEY_FILE} not found in {', '.join(SEARCH_DIRECTORIES)}")
+    return _keys
+
+
+def get_key(provider="openai"):
+    """
+    API key for a provider.
+
+    Args:
+        provider (str): "openai" or "gemini"
+
+    Returns:
+        str: The key from the environment, the keys.txt line labelled with the
+        provider name, or else the first line of keys.txt
+    """
+    variable = ENVIRONMENT_VARIABLES.get(provider)
+    if variable and os.environ.get(variable):
+        return os.environ[variable]
+    keys = read_keys()
+    for label, key in keys:
+        if provider in label:
+            return key
+    return keys[0][1]
@@ -0,0 +1,120 @@
+# Rate limiting and retry policy shared by every LLM call
+import asyncio
+import random
+import time
+
+# HTTP statuses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+# Network failures raised by httpx / the provider SDKs, matched by class name so
+# no provider package has to be installed to check them
+RETRY_ERRORS = {"APIConnectionError", "APITimeoutError", "ConnectError", "ConnectTimeout",
+                "ReadTimeout", "RemoteProtocolError", "ServerError"}
+
+
+class TokenBucket:
+    """
+    Refills at `per_minute` units per minute up to `capacity` units.
+    The level may go below zero when a call used more than was reserved for it.
+    """
+
+    def __init__(self, per_minute, capacity=None):
+        self.rate = per_minute / 60
+        self.capacity = capacity or per_minute
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount):
+        """Seconds until `amount` units are available (amounts above capacity wait for a full bucket)."""
+        self.refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate)
+
+
+class RateLimiter:
+    """
+    Token buckets for requests per minute and (optionally) tokens per minute,
+    shared by every caller of a client. Callers are served in arrival order.
+    """
+
+    def __init__(self, requests_per_minute=60, tokens_per_minute=None, burst=None):
+        """
+        Args:
+            requests_per_minute (float): Average requests allowed per minute
+            tokens_per_minute (float): Average prompt + output tokens allowed per minute (None for no limit)
+            burst (int): Requests allowed back to back (defaults to one minute's worth)
+        """
+        self.requests = TokenBucket(requests_per_minute, burst)
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.lock = asyncio.Lock()
+        self.waited = 0.0  # total seconds callers were held back
+
+    async def acquire(self, tokens=0):
+        """
+        Wait until one request using about `tokens` tokens is allowed, then reserve it.
+
+        Args:
+            tokens (int): Estimated prompt + output tokens of the request
+        """
+        async with self.lock:
+            while True:
+                wait = self.requests.wait_time(1)
+                if self.tokens is not None:
+                    wait = max(wait, self.tokens.wait_time(tokens))
+                if wait == 0:
+                    self.requests.level -= 1
+                    if self.tokens is not None:
+                        self.tokens.level -= tokens
+                    return
+                self.waited += wait
+                await asyncio.sleep(wait)
+
+    def adjust(self, tokens):
+        """
+        Correct the token reservation once the real usage is known.
+
+        Args:
+            tokens (int): Real usage minus the estimate (negative gives tokens back)
+        """
+        if self.tokens is not None:
+            self.tokens.refill()
+            self.tokens.level -= tokens
+
+
+def status_code(error):
+    """HTTP status of a provider error (openai: status_code, google-genai: code), or None."""
+    for attribute in ("status_code", "code", "status"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_retryable(error):
+    """True for rate limits, server errors, timeouts and dropped connections."""
+    if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    return status_code(error) in RETRY_STATUSES or type(error).__name__ in RETRY_ERRORS
+
+
+def backoff_delay(attempt, base_delay=1.0, max_delay=30.0, error=None):
+    """
+    Seconds to wait before retry number `attempt` (1 for the first retry).
+
+    Uses the server's Retry-After header when the error carries one, otherwise
+    exponential backoff with jitter so concurrent callers do not retry in lockstep.
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        retry_after = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        retry_after = None
+    if retry_after is not None:
+        return min(retry_after, max_delay)
+    delay = min(max_delay, base_delay * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.5)
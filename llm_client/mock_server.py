@@ -0,0 +1,257 @@
+# Local mock of the Gemini and OpenAI chat APIs for benchmarks without network or keys
+# Serves the endpoints the SDKs call:
+#   POST /v1beta/models/<model>:generateContent and :streamGenerateContent (Gemini)
+#   POST /v1/chat/completions, streamed or not (OpenAI)
+# Answers are made-up words sent after a configurable time to first token and time per
+# token, with token counts in the usage fields. Requests with function declarations get
+# a function call first and an answer once the function result is sent back; Gemini
+# requests with code execution get code, its result and an answer. A share of requests
+# can fail with 429 / 500 to exercise error handling.
+#
+# Usage: python3 -m llm_client.mock_server [--port 8766] [--first-token-latency 0.3]
+#                                         [--token-latency 0.01] [--answer-words 60] [--error-rate 0]
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+
+WORDS = ("the model answers every question with a short and plausible sentence about "
+         "latency throughput tokens streaming caches prompts and benchmarks").split()
+WORDS_PER_CHUNK = 5
+
+
+def count_text(value):
+    """Characters of text anywhere in a request body."""
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(count_text(item) for item in value.values())
+    if isinstance(value, list):
+        return sum(count_text(item) for item in value)
+    return 0
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients reuse connections
+
+    def log_message(self, format, *args):
+        pass  # keep the console quiet
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self.server.count_request()
+        status = self.server.pick_error()
+        if status:
+            self.send_json({"error": {"code": status, "message": "mock error", "status": "UNAVAILABLE"}}, status)
+            return
+        gemini = re.match(r"/v1beta/models/([^:/]+):(generateContent|streamGenerateContent)", self.path)
+        if gemini:
+            self.gemini(body, gemini.group(1), gemini.group(2) == "streamGenerateContent")
+        elif self.path.rstrip("/").endswith("/chat/completions"):
+            self.openai(body)
+        else:
+            self.send_json({"error": {"code": 404, "message": f"no mock for {self.path}"}}, 404)
+
+    # --- responses -----------------------------------------------------------------------
+
+    def send_json(self, data, status=200):
+        payload = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def start_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def send_event(self, data):
+        payload = f"data: {data if isinstance(data, str) else json.dumps(data)}\r\n\r\n".encode("utf-8")
+        self.wfile.write(f"{len(payload):x}\r\n".encode("ascii") + payload + b"\r\n")
+        self.wfile.flush()
+
+    def end_events(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def answer_chunks(self):
+        """Yield the answer a few words at a time, waiting like a model generating them."""
+        words = [WORDS[i % len(WORDS)] for i in range(self.server.answer_words)]
+        time.sleep(self.server.first_token_latency)
+        for start in range(0, len(words), WORDS_PER_CHUNK):
+            chunk = words[start:start + WORDS_PER_CHUNK]
+            if start:
+                time.sleep(self.server.token_latency * len(chunk))
+            yield " ".join(chunk) + " ", start + len(chunk)
+
+    # --- Gemini --------------------------------------------------------------------------
+
+    def gemini(self, body, model, stream):
+        prompt_tokens = count_text(body.get("contents")) // 4 + count_text(body.get("systemInstruction")) // 4 + 1
+        tools = body.get("tools") or []
+        last_parts = (body.get("contents") or [{}])[-1].get("parts", [])
+        answered_call = any("functionResponse" in part for part in last_parts)
+        declarations = [d for tool in tools for d in tool.get("functionDeclarations", [])]
+
+        def response(parts, output_tokens):
+            return {"candidates": [{"content": {"role": "model", "parts": parts}, "index": 0}],
+                    "usageMetadata": {"promptTokenCount": prompt_tokens, "candidatesTokenCount": output_tokens,
+                                      "totalTokenCount": prompt_tokens + output_tokens},
+                    "modelVersion": model}
+
+        if declarations and not answered_call:
+            time.sleep(self.server.first_token_latency)
+            declaration = declarations[0]
+            args = {name: "Alex" for name in declaration.get("parameters", {}).get("properties", {})}
+            data = response([{"functionCall": {"name": declaration["name"], "args": args}}], 8)
+            if stream:
+                self.start_events()
+                self.send_event(data)
+                self.end_events()
+            else:
+                self.send_json(data)
+            return
+        code_parts = []
+        if any("codeExecution" in tool for tool in tools):
+            code_parts = [{"executableCode": {"language": "PYTHON", "code": "print(len('strawberry'))"}},
+                          {"codeExecutionResult": {"outcome": "OUTCOME_OK", "output": "10\n"}}]
+
+        if not stream:
+            text, output_tokens = "", 0
+            for piece, output_tokens in self.answer_chunks():
+                text += piece
+            self.send_json(response(code_parts + [{"text": text}], output_tokens))
+            return
+        self.start_events()
+        for piece, output_tokens in self.answer_chunks():
+            self.send_event(response(code_parts + [{"text": piece}], output_tokens))
+            code_parts = []
+        self.end_events()
+
+    # --- OpenAI --------------------------------------------------------------------------
+
+    def openai(self, body):
+        model = body.get("model", "mock")
+        messages = body.get("messages", [])
+        prompt_tokens = count_text(messages) // 4 + 1
+        tools = body.get("tools") or []
+        wants_call = tools and not (messages and messages[-1].get("role") == "tool")
+        stream = body.get("stream", False)
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+        def chunk(delta, finish_reason=None):
+            return {"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+
+        def usage(output_tokens):
+            return {"prompt_tokens": prompt_tokens, "completion_tokens": output_tokens,
+                    "total_tokens": prompt_tokens + output_tokens}
+
+        if wants_call:
+            time.sleep(self.server.first_token_latency)
+            function = tools[0]["function"]
+            args = {name: "Alex" for name in function.get("parameters", {}).get("properties", {})}
+            call = {"id": "call_mock", "type": "function",
+                    "function": {"name": function["name"], "arguments": json.dumps(args)}}
+            if not stream:
+                self.send_json({"id": "chatcmpl-mock", "object": "chat.completion", "created": int(time.time()),
+                                "model": model, "usage": usage(8),
+                                "choices": [{"index": 0, "finish_reason": "tool_calls",
+                                             "message": {"role": "assistant", "content": None, "tool_calls": [call]}}]})
+                return
+            self.start_events()
+            self.send_event(chunk({"role": "assistant", "tool_calls": [dict(call, index=0)]}))
+            self.send_event(chunk({}, "tool_calls"))
+            if include_usage:
+                self.send_event(dict(chunk({}), choices=[], usage=usage(8)))
+            self.send_event("[DONE]")
+            self.end_events()
+            return
+
+        if not stream:
+            text, output_tokens = "", 0
+            for piece, output_tokens in self.answer_chunks():
+                text += piece
+            self.send_json({"id": "chatcmpl-mock", "object": "chat.completion", "created": int(time.time()),
+                            "model": model, "usage": usage(output_tokens),
+                            "choices": [{"index": 0, "finish_reason": "stop",
+                                         "message": {"role": "assistant", "content": text}}]})
+            return
+        self.start_events()
+        output_tokens = 0
+        for piece, output_tokens in self.answer_chunks():
+            self.send_event(chunk({"role": "assistant", "content": piece}))
+        self.send_event(chunk({}, "stop"))
+        if include_usage:
+            self.send_event(dict(chunk({}), choices=[], usage=usage(output_tokens)))
+        self.send_event("[DONE]")
+        self.end_events()
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, first_token_latency=0.3, token_latency=0.01, answer_words=60, error_rate=0.0,
+                 seed=0):
+        super().__init__(address, MockHandler)
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.answer_words = answer_words
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    def handle_error(self, request, client_address):
+        # A client that timed out and hung up mid-answer is normal in a benchmark
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def count_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def pick_error(self):
+        """An error status for this request (a 429 or a 500), or None."""
+        with self.lock:
+            if self.random.random() >= self.error_rate:
+                return None
+            return self.random.choice([429, 500])
+
+    def base_urls(self):
+        """base_url for each provider's SDK client."""
+        root = f"http://127.0.0.1:{self.server_address[1]}"
+        return {"gemini": root, "openai": root + "/v1"}
+
+
+def start_mock_server(port=0, **options):
+    """Start the mock server on a background thread (port 0: any free port) and return it."""
+    server = MockServer(("127.0.0.1", port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local mock of the Gemini and OpenAI chat APIs")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--first-token-latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.01)
+    parser.add_argument("--answer-words", type=int, default=60)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    server = MockServer(("127.0.0.1", args.port), args.first_token_latency, args.token_latency,
+                        args.answer_words, args.error_rate)
+    print(f">>> Mock APIs: {server.base_urls()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass